@@ -6,7 +6,8 @@ from geogen.filemanagement import FileManager
 
 
 class FileManagerGUI:
-    VIEWED_FILE_TYPES = (".pkl", ".png", ".npy")
+    MODEL_FILE_TYPES = (".pkl", ".geoz")
+    VIEWED_FILE_TYPES = (*MODEL_FILE_TYPES, ".png", ".npy")
 
     def __init__(self, parent, file_manager):
         self.parent = parent
@@ -50,8 +51,8 @@ class FileManagerGUI:
         if selected_items:
             item = selected_items[0]
             file_path = item.data(0, QtCore.Qt.UserRole)
-            # Validate the file path as being a .pkl file
-            if file_path and file_path.endswith(".pkl"):
+            # Validate the file path as being a model file
+            if file_path and file_path.endswith(self.MODEL_FILE_TYPES):
                 self.load_model(file_path)
 
     def load_model(self, file_path):
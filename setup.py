@@ -1,8 +1,14 @@
+import re
+
 from setuptools import find_packages, setup
 
+# The version is defined once, in the package
+with open("src/geogen/__init__.py") as f:
+    VERSION = re.search(r'^__version__ = "(.+)"', f.read(), re.M).group(1)
+
 setup(
     name="GeoGen",
-    version="0.0.3",
+    version=VERSION,
     description="A package for creating, visualizing, and exporting 3D structural geology models. \
     Allows either user specified, or randomized generation of models.",
     packages=find_packages(where="src"),  # Look for packages in the 'src' directory
@@ -19,8 +25,10 @@ setup(
         "trame-vuetify",
         "trame-vtk",
         "tqdm",
-        "PyDTMC",
     ],
+    extras_require={
+        "markov": ["PyDTMC"],  # Only for the pydtmc MarkovChain analysis tools
+    },
     package_data={
         "geogen.generation.markov_matrix": ["default_markov_matrix.csv"],
     },
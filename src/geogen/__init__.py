@@ -9,7 +9,7 @@ Basic usage:
 
    >>> import geogen
    >>> model = geogen.GeoModel(bounds=((0, 100), (0, 100), (0, 100)), resolution=(100, 100, 50))
-   >>> word = geogen.word.SingleDikeWarped()
+   >>> word = geogen.generation.SingleDikeWarped()
    >>> history = word.generate()
    >>> model.add_history(history)
    >>> model.compute_model(normalize=True)
@@ -25,11 +25,32 @@ You can visualize the model using PyVista or with some built-in visualization to
 """
 
 __title__ = "GeoGen"
+__version__ = "0.0.3"
+
+import importlib
+
+# Submodules are imported on first attribute access, so `import geogen.model` does not pay for
+# torch (dataset), pydtmc (generation) or pyvista and matplotlib (plot).
+_SUBMODULES = {"dataset", "filemanagement", "generation", "model", "plot", "probability"}
+# Top level shortcuts to objects of the submodules, as (module, attribute)
+_SHORTCUTS = {
+    "GeoModel": ("geogen.model", "GeoModel"),
+    "StreamingDataset": ("geogen.dataset", "GeoData3DStreamingDataset"),
+}
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f"geogen.{name}")
+    if name in _SHORTCUTS:
+        module, attribute = _SHORTCUTS[name]
+        return getattr(importlib.import_module(module), attribute)
+    raise AttributeError(f"module 'geogen' has no attribute '{name}'")
+
+
+def __dir__():
+    return sorted(set(globals()) | _SUBMODULES | set(_SHORTCUTS))
 
-import geogen.model as model
-# TODO: Update these imports into a cohesive API
-# Note, some very specific imports should be used to avoid importing the entire library
-from geogen.dataset import GeoData3DStreamingDataset as StreamingDataset
 
 # This controls the import behaviour when using `from geogen import *`
-__all__ = ["GeoData3DStreamingDataset", "model", "plot", "gen"]
+__all__ = sorted(_SUBMODULES | set(_SHORTCUTS))
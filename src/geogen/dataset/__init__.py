@@ -1 +1,7 @@
+from .boreholes import sample_well_path, surface_from_columns
+from .cache import SampleCache
 from .dataset import *
+from .producer import ProducerService, ProducerStreamDataset
+from .server import GeoDataServerDataset, SampleClient, SampleServer
+from .sections import sample_section_plane, section_points
+from .transforms import GeometricAugmentation
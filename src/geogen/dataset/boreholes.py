@@ -0,0 +1,80 @@
+"""
+Well paths through a model, for computing sparse label logs without a full volume.
+"""
+
+import numpy as np
+
+from geogen.model import empty_mask
+
+
+def sample_well_path(bounds, n_depth, rng=None, max_inclination=0.0, kickoff_range=(0.0, 0.5)):
+    """
+    Draw a random well path from the top to the bottom of the model bounds.
+
+    Wells start vertically at a random collar on the top face. A deviated well kicks off at a
+    random depth and continues in a straight line at a random inclination and azimuth. The
+    inclination is reduced where needed so the well does not leave the model through a side face.
+    Points are spaced evenly in true vertical depth, so every log has the same vertical resolution.
+
+    Parameters
+    ----------
+    bounds : tuple
+        Bounds of the model as ((xmin, xmax), (ymin, ymax), (zmin, zmax)).
+    n_depth : int
+        Number of points along the well.
+    rng : np.random.Generator, optional
+        Random number generator.
+    max_inclination : float, optional
+        Maximum inclination from vertical in degrees, 0 for vertical wells. Default is 0.
+    kickoff_range : tuple, optional
+        Range of the kickoff depth as fractions of the model depth. Default is (0.0, 0.5).
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (n_depth, 3) of points from the top to the bottom of the well.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    (x_min, x_max), (y_min, y_max), (z_min, z_max) = bounds
+    collar = np.array([rng.uniform(x_min, x_max), rng.uniform(y_min, y_max)])
+    z = np.linspace(z_max, z_min, num=n_depth)
+
+    inclination = np.radians(rng.uniform(0, max_inclination)) if max_inclination > 0 else 0.0
+    azimuth = rng.uniform(0, 2 * np.pi)
+    kickoff = z_max - rng.uniform(*kickoff_range) * (z_max - z_min)
+    direction = np.array([np.sin(azimuth), np.cos(azimuth)])
+    if inclination > 0 and kickoff > z_min:
+        # Horizontal distance from the collar to the model side along the azimuth
+        with np.errstate(divide="ignore", invalid="ignore"):
+            limits = np.where(direction > 0, (np.array([x_max, y_max]) - collar) / direction, np.inf)
+            limits = np.where(direction < 0, (np.array([x_min, y_min]) - collar) / direction, limits)
+        inclination = min(inclination, np.arctan(limits.min() / (kickoff - z_min)))
+    # Horizontal offset from the collar, measured clockwise from north (y-axis) like strikes
+    offset = np.tan(inclination) * np.clip(kickoff - z, 0, None)
+    xy = collar + offset[:, None] * direction
+    # Rounding can put the bottom of a well reaching a side face just outside of it
+    xy = np.clip(xy, [x_min, y_min], [x_max, y_max])
+    return np.column_stack((xy, z))
+
+
+def surface_from_columns(labels, z):
+    """
+    Locate the ground surface in vertical columns of labels ordered from top to bottom.
+
+    Parameters
+    ----------
+    labels : np.ndarray
+        Labels of shape (M, D), with air as NaN or EMPTY_VALUE.
+    z : np.ndarray
+        Elevations of shape (M, D).
+
+    Returns
+    -------
+    tuple of (np.ndarray, np.ndarray)
+        The surface elevation and the label just below the surface of each column. Columns of
+        rock only give the top elevation, columns of air only give the bottom elevation and air.
+    """
+    rock = ~empty_mask(labels)
+    first = np.where(rock.any(axis=1), rock.argmax(axis=1), labels.shape[1] - 1)
+    rows = np.arange(labels.shape[0])
+    return z[rows, first], labels[rows, first]
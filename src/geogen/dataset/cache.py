@@ -0,0 +1,55 @@
+"""
+On-disk cache of generated label volumes, shared between DataLoader workers.
+"""
+
+import os
+
+from geogen.model import DiskCache
+
+
+class SampleCache(DiskCache):
+    """
+    A least recently used cache of compressed label volumes on local disk.
+
+    Entries are keyed by sample index and seed, one compressed .npz file per entry. Storage,
+    atomic writes and eviction are those of `geogen.model.DiskCache`, so several DataLoader
+    workers can share one cache directory without locks.
+
+    Parameters
+    ----------
+    cache_dir : str
+        Directory holding the cache files, created if it does not exist.
+    max_bytes : int, optional
+        Disk budget for the cache. The least recently used entries are evicted once it is exceeded.
+        Default is 10 GB.
+    low_water : float, optional
+        Fraction of the budget the cache is reduced to by an eviction. Default is 0.9.
+    rescan_interval : int, optional
+        Number of writes after which the directory is scanned again for its true size. Default is 1000.
+    """
+
+    @staticmethod
+    def _name(idx, seed):
+        return f"sample_{int(idx)}_{int(seed)}"
+
+    def _path(self, idx, seed):
+        return self._entry_path(self._name(idx, seed))
+
+    def __contains__(self, key):
+        return os.path.exists(self._path(*key))
+
+    def get(self, idx, seed):
+        """
+        Load a cached label volume.
+
+        Returns
+        -------
+        np.ndarray or None
+            The cached labels, or None on a cache miss.
+        """
+        entry = self._read(self._name(idx, seed))
+        return None if entry is None else entry.get("labels")
+
+    def put(self, idx, seed, labels):
+        """Atomically store a label volume and evict old entries if over budget."""
+        self._write(self._name(idx, seed), labels=labels)
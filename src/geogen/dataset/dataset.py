@@ -2,12 +2,21 @@
 PyTorch DataLoader for streaming GeoWord geological histories. 
 """
 
+import numpy as np
 import torch
 import torch.nn.functional as F
-from torch.utils.data import Dataset
+from torch.utils.data import Dataset, IterableDataset, get_worker_info
 
+from geogen.dataset.boreholes import sample_well_path, surface_from_columns
+from geogen.dataset.cache import SampleCache
+from geogen.dataset.sections import SECTION_ORIENTATIONS, sample_section_plane, section_points
+from geogen.dataset.transforms import GeometricAugmentation
+from geogen.filemanagement.corpus import CorpusReader
 # Two types of geological model generators provided
 from geogen.generation import MarkovGeostoryGenerator
+from geogen.model import GeoModel
+from geogen.model.util import label_pyramid
+from geogen.probability import derive_seed
 
 _DEFAULT_GENERATOR_CLASS = MarkovGeostoryGenerator
 
@@ -16,6 +25,9 @@ class GeoData3DStreamingDataset(Dataset):
     """
     A PyTorch Dataset wrapper for streaming geological data from a GeostoryGenerator object.
 
+    Models are computed in int8 label mode and samples are int8 label tensors of shape (1, X, Y, Z),
+    with air as -1. Use OneHotTransform or `.float()` to get a float tensor.
+
     Parameters
     ----------
     model_bounds : tuple
@@ -28,6 +40,41 @@ class GeoData3DStreamingDataset(Dataset):
         The total number of samples in one epoch.
     device : str
         Torch device where data is loaded.
+    transform : callable, optional
+        A transform applied to each sample tensor.
+    seed : int, optional
+        Base seed of the dataset. When given, every sample is a pure function of the seed, its index
+        and the epoch. Without a seed or cache, a new random model is generated on every access.
+    cache_dir : str, optional
+        Directory of an on-disk SampleCache of label volumes, which can be shared by DataLoader workers.
+        A random base seed is drawn when caching without a seed.
+    cache_size_bytes : int, optional
+        Disk budget of the cache, least recently used samples are evicted beyond it. Default is 10 GB.
+    fresh_ratio : float, optional
+        Expected fraction of samples regenerated from a new seed in each epoch, the rest are the same
+        samples as in the previous epoch and are served from the cache. Default is 0.0.
+    augmentation : GeometricAugmentation, optional
+        Exact geometric augmentation (z-rotations, x/y flips, crops) applied to each label volume
+        before the transform. With crops, model_bounds and model_resolution describe one oversized
+        model, e.g. 512x512x128 over wider bounds, whose height is normalized over its full extent.
+        Crops are zero-copy views of the model until collation.
+    reuse_factor : int, optional
+        Number of distinct augmented samples drawn from each computed model. Consecutive sample
+        indices share a model, so generation cost is divided by the reuse factor when samples are
+        visited in order. Default is 1.
+    pyramid_levels : int, optional
+        If given, each sample is a tuple of int8 label tensors from finest to coarsest, built from the
+        one computed volume by mode pooling with a factor of 2 per level. Default is None.
+    pyramid_priority : sequence of int, optional
+        Labels that win a pooled block whenever present, e.g. dike values to keep thin dikes.
+
+    Notes
+    -----
+    Use `set_epoch` at the start of each epoch to advance the fresh samples. With persistent
+    DataLoader workers the epoch must be set before the workers are started.
+
+    The last computed model is kept in memory for reuse. Use a sequential sampler (shuffle=False)
+    so each worker gets consecutive indices; the models themselves are already random.
     """
 
     def __init__(
@@ -38,24 +85,120 @@ class GeoData3DStreamingDataset(Dataset):
         dataset_size=int(1e6),
         device="cpu",
         transform=None,  # Add the transform parameter
+        seed=None,
+        cache_dir=None,
+        cache_size_bytes=10 * 1024**3,
+        fresh_ratio=0.0,
+        augmentation=None,
+        reuse_factor=1,
+        pyramid_levels=None,
+        pyramid_priority=None,
     ):
+        if not 0.0 <= fresh_ratio <= 1.0:
+            raise ValueError(f"fresh_ratio must be in [0, 1], got {fresh_ratio}.")
+        if reuse_factor < 1:
+            raise ValueError(f"reuse_factor must be at least 1, got {reuse_factor}.")
+        if reuse_factor > 1 and augmentation is None:
+            raise ValueError("An augmentation is required to draw several distinct samples from one model.")
         self.model_generator = _DEFAULT_GENERATOR_CLASS(
             model_bounds=model_bounds,
             model_resolution=model_resolution,
             config=generator_config,
+            label_dtype=np.int8,
         )
         self.device = device
         self.size = dataset_size
         self.transform = transform  # Store the transform
 
+        self.cache = SampleCache(cache_dir, cache_size_bytes) if cache_dir is not None else None
+        if seed is None and self.cache is not None:
+            seed = np.random.SeedSequence().entropy
+        self.seed = seed
+        self.fresh_ratio = fresh_ratio
+        self.epoch = 0
+
+        self.augmentation = augmentation
+        self.reuse_factor = reuse_factor
+        self._recent_model = None  # (model_idx, epoch, labels, augmentation params)
+
+        self.pyramid_levels = pyramid_levels
+        self.pyramid_priority = pyramid_priority
+
     def __len__(self):
         return self.size
 
+    def set_epoch(self, epoch):
+        """Set the current epoch, which selects the samples that are regenerated."""
+        self.epoch = epoch
+
+    def _generation(self, model_idx, epoch):
+        """
+        Number of times model model_idx was refreshed up to the given epoch.
+
+        Each model is refreshed at a steady rate of fresh_ratio per epoch from its own random
+        phase, so a fraction fresh_ratio of the models gets a new seed in every epoch and the
+        count is computed directly, without replaying the previous epochs.
+        """
+        phase = derive_seed(self.seed, 1, model_idx) / 2**64
+        return int(np.floor(epoch * self.fresh_ratio + phase))
+
+    def _get_model_seed(self, model_idx):
+        # Models keep their seed until they are refreshed
+        return derive_seed(self.seed, 0, model_idx, self._generation(model_idx, self.epoch))
+
+    def get_sample_seed(self, idx):
+        """The seed of the model that sample idx is drawn from in the current epoch."""
+        return self._get_model_seed(idx // self.reuse_factor)
+
+    def _get_labels(self, model_idx):
+        """Get the label volume of a model, from the cache when possible."""
+        if self.seed is None:
+            model = self.model_generator.generate_model()
+            return model.get_data_grid()
+
+        model_seed = self._get_model_seed(model_idx)
+        if self.cache is not None:
+            labels = self.cache.get(model_idx, model_seed)
+            if labels is not None:
+                return labels
+
+        model = self.model_generator.generate_model(seed=model_seed)
+        labels = model.get_data_grid()
+        if self.cache is not None:
+            self.cache.put(model_idx, model_seed, labels)
+        return labels
+
+    def _get_model(self, model_idx):
+        """Get the labels and augmentation parameters of a model, reusing the last computed one."""
+        recent = self._recent_model
+        if self.reuse_factor > 1 and recent is not None and recent[:2] == (model_idx, self.epoch):
+            return recent[2], recent[3]
+
+        labels = self._get_labels(model_idx)
+        params = None
+        if self.augmentation is not None:
+            rng = np.random.default_rng(None if self.seed is None else derive_seed(self.seed, 2, model_idx, self.epoch))
+            params = self.augmentation.sample_params(self.reuse_factor, labels.shape, rng, volume=labels)
+        self._recent_model = (model_idx, self.epoch, labels, params)
+        return labels, params
+
     def __getitem__(self, idx):
-        model = self.model_generator.generate_model()
-        model.fill_nans()
-        data = model.get_data_grid()
-        data_tensor = torch.from_numpy(data).float().unsqueeze(0).to(self.device)
+        model_idx, variant = divmod(idx, self.reuse_factor)
+        data, params = self._get_model(model_idx)
+        if self.augmentation is not None:
+            data = self.augmentation.apply(data, params[variant])
+            if any(stride < 0 for stride in data.strides):
+                # Torch can not view negative strides, plain crops stay views until collation
+                data = np.ascontiguousarray(data)
+
+        if self.pyramid_levels:
+            levels = label_pyramid(data, levels=self.pyramid_levels, priority=self.pyramid_priority)
+            return tuple(self._to_tensor(level) for level in levels)
+        return self._to_tensor(data)
+
+    def _to_tensor(self, data):
+        """Wrap a label volume as a (1, X, Y, Z) tensor and apply the transform."""
+        data_tensor = torch.from_numpy(data).unsqueeze(0).to(self.device)
 
         if self.transform:
             data_tensor = self.transform(data_tensor)  # Apply the transform
@@ -63,6 +206,420 @@ class GeoData3DStreamingDataset(Dataset):
         return data_tensor
 
 
+class GeoData3DIterableDataset(IterableDataset):
+    """
+    A PyTorch IterableDataset streaming geological models, sharded over DataLoader workers and ranks.
+
+    Every epoch has its own SeedSequence, derived from the base seed and the epoch, which is
+    spawned into one independent seed stream per (rank, worker) pair. Each worker generates its
+    share of the epoch from its stream and yields samples in generation order. Streams never
+    overlap, so no two workers or ranks produce the same sample, and no worker_init_fn or sampler
+    is needed. Samples are int8 label tensors of shape (1, X, Y, Z), with air as -1.
+
+    Parameters
+    ----------
+    model_bounds : tuple
+        Bounds of the model as ((xmin, xmax), (ymin, ymax), (zmin, zmax)).
+    model_resolution : tuple
+        Resolution of the model as (x_res, y_res, z_res).
+    generator_config : str
+        A path to a configuration file for the particular generator class.
+    samples_per_epoch : int
+        The total number of samples in one epoch, over all workers and ranks.
+    device : str
+        Torch device where data is loaded.
+    transform : callable, optional
+        A transform applied to each sample tensor.
+    seed : int, optional
+        Base seed shared by all workers and ranks. Fresh entropy is drawn if not provided, in which
+        case ranks are not reproducible but still never overlap.
+    rank : int, optional
+        Rank of this process. Default is the torch.distributed rank, or 0 when not distributed.
+    world_size : int, optional
+        Number of ranks. Default is the torch.distributed world size, or 1 when not distributed.
+
+    Notes
+    -----
+    Call `set_epoch` before iterating to get a new set of samples in each epoch. With persistent
+    DataLoader workers the epoch must be set before the workers are started.
+    """
+
+    def __init__(
+        self,
+        model_bounds=((-3840, 3840), (-3840, 3840), (-1920, 1920)),
+        model_resolution=(256, 256, 128),
+        generator_config=None,
+        samples_per_epoch=int(1e6),
+        device="cpu",
+        transform=None,
+        seed=None,
+        rank=None,
+        world_size=None,
+    ):
+        distributed = torch.distributed.is_available() and torch.distributed.is_initialized()
+        if rank is None:
+            rank = torch.distributed.get_rank() if distributed else 0
+        if world_size is None:
+            world_size = torch.distributed.get_world_size() if distributed else 1
+        if not 0 <= rank < world_size:
+            raise ValueError(f"Rank {rank} is out of range for a world size of {world_size}.")
+
+        self.model_generator = _DEFAULT_GENERATOR_CLASS(
+            model_bounds=model_bounds,
+            model_resolution=model_resolution,
+            config=generator_config,
+            label_dtype=np.int8,
+        )
+        self.samples_per_epoch = samples_per_epoch
+        self.device = device
+        self.transform = transform
+        self.seed = seed if seed is not None else np.random.SeedSequence().entropy
+        self.rank = rank
+        self.world_size = world_size
+        self.epoch = 0
+
+    def set_epoch(self, epoch):
+        """Set the current epoch, which selects the seed streams."""
+        self.epoch = epoch
+
+    def _shard_size(self, shard, n_shards):
+        """Number of samples of one shard when the epoch is split as evenly as possible."""
+        base, extra = divmod(self.samples_per_epoch, n_shards)
+        return base + (shard < extra)
+
+    def __len__(self):
+        return self._shard_size(self.rank, self.world_size)
+
+    def get_seed_stream(self, worker_id=0, num_workers=1):
+        """
+        The seeds of the samples generated by one worker of this rank in the current epoch.
+
+        Returns
+        -------
+        list of np.random.SeedSequence
+            One seed per sample, in generation order.
+        """
+        n_streams = self.world_size * num_workers
+        stream = self.rank * num_workers + worker_id
+        epoch_seq = np.random.SeedSequence(self.seed, spawn_key=(self.epoch,))
+        stream_seq = epoch_seq.spawn(n_streams)[stream]
+        # Ranks split the epoch first so len() does not depend on the number of workers
+        rank_size = len(self)
+        worker_size = rank_size // num_workers + (worker_id < rank_size % num_workers)
+        return stream_seq.spawn(worker_size)
+
+    def __iter__(self):
+        worker_info = get_worker_info()
+        worker_id, num_workers = (worker_info.id, worker_info.num_workers) if worker_info else (0, 1)
+
+        for seed in self.get_seed_stream(worker_id, num_workers):
+            model = self.model_generator.generate_model(seed=seed)
+            data_tensor = torch.from_numpy(model.get_data_grid()).unsqueeze(0).to(self.device)
+
+            if self.transform:
+                data_tensor = self.transform(data_tensor)
+
+            yield data_tensor
+
+
+class GeoData3DCorpusDataset(Dataset):
+    """
+    A PyTorch Dataset reading pre-generated label volumes from a sharded corpus.
+
+    Shards are memory-mapped, so a sample costs a page-cache hit rather than a model computation.
+    Samples are zero-copy int8 tensors of shape (1, X, Y, Z) backed by the memory map.
+
+    Parameters
+    ----------
+    corpus_dir : str
+        Directory of a corpus written by geogen.filemanagement.CorpusWriter.
+    transform : callable, optional
+        A transform applied to each sample tensor.
+    """
+
+    def __init__(self, corpus_dir, transform=None):
+        self.corpus = CorpusReader(corpus_dir, mmap_mode="c")
+        self.transform = transform
+
+    def __len__(self):
+        return len(self.corpus)
+
+    def __getitem__(self, idx):
+        data_tensor = torch.from_numpy(self.corpus[idx]).unsqueeze(0)
+
+        if self.transform:
+            data_tensor = self.transform(data_tensor)
+
+        return data_tensor
+
+
+class GeoData2DSectionDataset(Dataset):
+    """
+    A PyTorch Dataset of 2-D cross-sections through streamed geological histories.
+
+    Each sample draws a random history and n_sections random section planes, and evaluates the
+    history only on the points of those planes with `GeoModel.compute_points`. No volume is ever
+    computed, so a sample costs about as much as its number of section pixels, far less than a
+    volumetric model at the same in-plane resolution.
+
+    The labels approximate sections through the full volume. Sediment fill bases and erosion
+    peaks are taken over a coarse context lattice rather than the full mesh, which moves some
+    layer boundaries: with the default `context_resolution`, about 2% of the pixels differ from
+    the matching slice of the full volume on average, and up to about 10% for some histories. See
+    `GeoModel.compute_points`.
+
+    Samples are int8 label tensors of shape (C, H, W) with C = n_sections, air as -1 and the first
+    row at the top of each section.
+
+    Parameters
+    ----------
+    model_bounds : tuple
+        Bounds of the model as ((xmin, xmax), (ymin, ymax), (zmin, zmax)).
+    section_resolution : tuple
+        Resolution of each section as (H, W).
+    generator_config : str
+        A path to a configuration file for the particular generator class.
+    dataset_size : int
+        The total number of samples in one epoch.
+    n_sections : int, optional
+        Number of sections of the same history per sample, stacked as channels. Default is 1.
+    orientation : str or sequence of str, optional
+        The kind of section ('axis', 'vertical', 'oblique' or 'fault'), or several kinds to draw
+        from uniformly for each section. See `sample_section_plane`. Default is 'vertical'.
+    context_resolution : tuple, optional
+        Resolution of the context lattice of `GeoModel.compute_points`. Default is (8, 8, 32).
+        With the nominal volume resolution (W, W, H), labels are identical to slices of the full
+        volume, at the cost of computing a lattice of that size.
+    device : str
+        Torch device where data is loaded.
+    transform : callable, optional
+        A transform applied to each sample tensor.
+    seed : int, optional
+        Base seed of the dataset. When given, every sample is a pure function of the seed and its
+        index. Without a seed, a new random history is drawn on every access.
+    """
+
+    def __init__(
+        self,
+        model_bounds=((-3840, 3840), (-3840, 3840), (-1920, 1920)),
+        section_resolution=(128, 128),
+        generator_config=None,
+        dataset_size=int(1e6),
+        n_sections=1,
+        orientation="vertical",
+        context_resolution=(8, 8, 32),
+        device="cpu",
+        transform=None,
+        seed=None,
+    ):
+        orientations = (orientation,) if isinstance(orientation, str) else tuple(orientation)
+        for kind in orientations:
+            if kind not in SECTION_ORIENTATIONS:
+                raise ValueError(f"Unknown section orientation '{kind}', expected one of {SECTION_ORIENTATIONS}.")
+        if n_sections < 1:
+            raise ValueError(f"n_sections must be at least 1, got {n_sections}.")
+        height, width = section_resolution
+        # The nominal volume resolution only sets the generator defaults, no volume is computed
+        self.model_resolution = (width, width, height)
+        self.model_generator = _DEFAULT_GENERATOR_CLASS(
+            model_bounds=model_bounds,
+            model_resolution=self.model_resolution,
+            config=generator_config,
+            label_dtype=np.int8,
+        )
+        self.model_bounds = model_bounds
+        self.section_resolution = (height, width)
+        self.size = dataset_size
+        self.n_sections = n_sections
+        self.orientations = orientations
+        self.context_resolution = tuple(context_resolution)
+        self.device = device
+        self.transform = transform
+        self.seed = seed
+
+    def __len__(self):
+        return self.size
+
+    def get_sections(self, rng=None):
+        """
+        Draw a random history and compute its section labels.
+
+        Parameters
+        ----------
+        rng : np.random.Generator, optional
+            Random number generator for the history, the planes and the height normalization.
+
+        Returns
+        -------
+        tuple of (np.ndarray, list)
+            The int8 labels of shape (C, H, W) and the (center, u, v, extent) of each plane.
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        history = self.model_generator.build_geostory(rng)
+        planes = [
+            sample_section_plane(self.model_bounds, self.orientations[rng.integers(len(self.orientations))], rng, history)
+            for _ in range(self.n_sections)
+        ]
+        points = np.vstack([section_points(*plane, self.section_resolution) for plane in planes])
+
+        model = GeoModel(bounds=self.model_bounds, resolution=self.model_resolution, label_dtype=np.int8)
+        model.add_history(history)
+        labels = model.compute_points(points, normalize=True, context_resolution=self.context_resolution, rng=rng)
+        return labels.reshape(self.n_sections, *self.section_resolution), planes
+
+    def __getitem__(self, idx):
+        rng = np.random.default_rng(None if self.seed is None else derive_seed(self.seed, idx))
+        labels, _ = self.get_sections(rng)
+        data_tensor = torch.from_numpy(labels).to(self.device)
+
+        if self.transform:
+            data_tensor = self.transform(data_tensor)
+
+        return data_tensor
+
+
+class GeoDataBoreholeDataset(Dataset):
+    """
+    A PyTorch Dataset of sparse well logs through streamed geological histories.
+
+    Each sample draws a random history and evaluates it only along n_wells well paths and
+    n_surface vertical columns locating the ground surface, using `GeoModel.compute_points`. The
+    columns span the full model depth at n_depth points, like vertical wells.
+    A low-resolution volume of the same history can be requested for supervision; it is computed
+    in the same pass as the logs, and no full resolution grid is ever built.
+
+    Samples are dictionaries of tensors:
+
+    - 'well_xyz': float32 (n_wells, n_depth, 3) coordinates along each well, top to bottom.
+    - 'well_labels': int8 (n_wells, n_depth) label logs, with air as -1.
+    - 'surface_xyz': float32 (n_surface, 3) ground surface points.
+    - 'surface_labels': int8 (n_surface,) labels just below the surface points.
+    - 'volume': int8 (1, X, Y, Z) labels at volume_resolution, only if volume_resolution is given.
+
+    Parameters
+    ----------
+    model_bounds : tuple
+        Bounds of the model as ((xmin, xmax), (ymin, ymax), (zmin, zmax)).
+    n_wells : int, optional
+        Number of wells per sample. Default is 8.
+    n_depth : int, optional
+        Number of points along each well, spaced evenly in vertical depth. Default is 256.
+    max_inclination : float, optional
+        Maximum inclination of the wells from vertical in degrees, 0 for vertical wells. Default is 0.
+    kickoff_range : tuple, optional
+        Range of the kickoff depth of deviated wells as fractions of the model depth. Default is (0.0, 0.5).
+    n_surface : int, optional
+        Number of ground surface points per sample. Default is 16.
+    volume_resolution : tuple, optional
+        If given, also return the labels of a (X, Y, Z) volume at this (low) resolution. Default is None.
+    generator_config : str
+        A path to a configuration file for the particular generator class.
+    dataset_size : int
+        The total number of samples in one epoch.
+    device : str
+        Torch device where data is loaded.
+    seed : int, optional
+        Base seed of the dataset. When given, every sample is a pure function of the seed and its
+        index. Without a seed, a new random history is drawn on every access.
+    """
+
+    def __init__(
+        self,
+        model_bounds=((-3840, 3840), (-3840, 3840), (-1920, 1920)),
+        n_wells=8,
+        n_depth=256,
+        max_inclination=0.0,
+        kickoff_range=(0.0, 0.5),
+        n_surface=16,
+        volume_resolution=None,
+        generator_config=None,
+        dataset_size=int(1e6),
+        device="cpu",
+        seed=None,
+    ):
+        if n_wells < 1 or n_depth < 2:
+            raise ValueError(f"At least one well of two points is required, got {n_wells} wells of {n_depth}.")
+        if not 0 <= max_inclination < 90:
+            raise ValueError(f"max_inclination must be in [0, 90) degrees, got {max_inclination}.")
+        # The nominal volume resolution only sets the generator defaults, no volume is computed
+        self.model_resolution = tuple(volume_resolution) if volume_resolution is not None else (n_depth,) * 3
+        self.model_generator = _DEFAULT_GENERATOR_CLASS(
+            model_bounds=model_bounds,
+            model_resolution=self.model_resolution,
+            config=generator_config,
+            label_dtype=np.int8,
+        )
+        self.model_bounds = model_bounds
+        self.n_wells = n_wells
+        self.n_depth = n_depth
+        self.max_inclination = max_inclination
+        self.kickoff_range = kickoff_range
+        self.n_surface = n_surface
+        self.volume_resolution = self.model_resolution if volume_resolution is not None else None
+        self.size = dataset_size
+        self.device = device
+        self.seed = seed
+
+    def __len__(self):
+        return self.size
+
+    def _volume_points(self):
+        axes = [np.linspace(*bound, num=res) for bound, res in zip(self.model_bounds, self.volume_resolution)]
+        return np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, 3)
+
+    def get_logs(self, rng=None):
+        """
+        Draw a random history and compute its well logs, surface points and optional volume.
+
+        Parameters
+        ----------
+        rng : np.random.Generator, optional
+            Random number generator for the history, the wells and the height normalization.
+
+        Returns
+        -------
+        dict of np.ndarray
+            The sample arrays, see the class description.
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        history = self.model_generator.build_geostory(rng)
+
+        wells = np.stack(
+            [
+                sample_well_path(self.model_bounds, self.n_depth, rng, self.max_inclination, self.kickoff_range)
+                for _ in range(self.n_wells)
+            ]
+        )
+        columns = np.stack([sample_well_path(self.model_bounds, self.n_depth, rng) for _ in range(self.n_surface)])
+        parts = [wells.reshape(-1, 3), columns.reshape(-1, 3)]
+        if self.volume_resolution is not None:
+            parts.append(self._volume_points())
+
+        # All points are computed in a single pass of the history
+        model = GeoModel(bounds=self.model_bounds, resolution=self.model_resolution, label_dtype=np.int8)
+        model.add_history(history)
+        labels = model.compute_points(np.vstack(parts), normalize=True, rng=rng)
+
+        n_well_points, n_column_points = wells.shape[0] * self.n_depth, columns.shape[0] * self.n_depth
+        column_labels = labels[n_well_points : n_well_points + n_column_points].reshape(columns.shape[:2])
+        surface_z, surface_labels = surface_from_columns(column_labels, columns[..., 2])
+        sample = {
+            "well_xyz": wells.astype(np.float32),
+            "well_labels": labels[:n_well_points].reshape(wells.shape[:2]),
+            "surface_xyz": np.column_stack((columns[:, 0, :2], surface_z)).astype(np.float32),
+            "surface_labels": surface_labels,
+        }
+        if self.volume_resolution is not None:
+            volume = labels[n_well_points + n_column_points :]
+            sample["volume"] = volume.reshape(1, *self.volume_resolution)
+        return sample
+
+    def __getitem__(self, idx):
+        rng = np.random.default_rng(None if self.seed is None else derive_seed(self.seed, idx))
+        sample = self.get_logs(rng)
+        return {key: torch.from_numpy(value).to(self.device) for key, value in sample.items()}
+
+
 class OneHotTransform:
     def __init__(self, num_classes=15, min_val=-1):
         """
@@ -94,3 +651,75 @@ class OneHotTransform:
         one_hot = one_hot.permute(3, 0, 1, 2).contiguous().float()
 
         return one_hot
+
+
+class CompactCollate:
+    """
+    A DataLoader collate_fn that stacks int8 label samples into one compact uint8 batch.
+
+    Labels are shifted by -min_val so that air is 0 and every class is a valid index. Workers only
+    ship 1 byte per voxel to the main process, and the one-hot expansion is done once per batch with
+    BatchOneHotTransform, ideally on the training device.
+
+    Parameters
+    ----------
+    min_val : int, optional
+        The smallest label value, usually the air value -1. Default is -1.
+    pin_memory : bool, optional
+        Pin the batch for fast host to GPU copies. Only use with num_workers=0, with worker processes
+        use the DataLoader's own pin_memory option instead. Default is False.
+
+    Examples
+    --------
+    >>> loader = DataLoader(dataset, batch_size=8, num_workers=4, collate_fn=CompactCollate(), pin_memory=True)
+    >>> one_hot = BatchOneHotTransform(num_classes=15)
+    >>> for batch in loader:
+    ...     x = one_hot(batch.to("cuda", non_blocking=True))  # (B, 15, X, Y, Z) float32
+    """
+
+    def __init__(self, min_val=-1, pin_memory=False):
+        self.min_val = min_val
+        self.pin_memory = pin_memory
+
+    def __call__(self, samples):
+        """
+        Args:
+            samples (list of torch.Tensor): int8 label tensors of shape (1, X, Y, Z), or tuples of
+                them such as label pyramids, which are collated level by level.
+        Returns:
+            torch.Tensor: uint8 batch of shape (B, 1, X, Y, Z), or a tuple of batches.
+        """
+        if isinstance(samples[0], (tuple, list)):
+            return tuple(self(list(level)) for level in zip(*samples))
+
+        batch = torch.empty((len(samples), *samples[0].shape), dtype=torch.int8, pin_memory=self.pin_memory)
+        torch.stack([sample.to(torch.int8) for sample in samples], out=batch)
+        # Shift in place then reinterpret the bytes as unsigned, no extra copy
+        batch.sub_(self.min_val)
+        return batch.view(torch.uint8)
+
+
+class BatchOneHotTransform:
+    def __init__(self, num_classes=15, dtype=torch.float32):
+        """
+        Args:
+            num_classes (int): Number of classes for one-hot encoding.
+            dtype (torch.dtype): Data type of the one-hot tensor.
+        """
+        self.num_classes = num_classes
+        self.dtype = dtype
+
+    def __call__(self, batch):
+        """
+        Args:
+            batch (torch.Tensor): uint8 batch of shifted labels of shape (B, 1, X, Y, Z) from CompactCollate.
+        Returns:
+            torch.Tensor: One-hot encoded tensor of shape (B, num_classes, X, Y, Z) on the batch device.
+        """
+        if batch.shape[1] != 1:
+            raise ValueError(f"Expected channel dimension to be 1, but got {batch.shape[1]}")
+
+        index = batch.long().clamp_(0, self.num_classes - 1)  # Also usable directly as embedding indices
+        shape = (batch.shape[0], self.num_classes, *batch.shape[2:])
+        one_hot = torch.zeros(shape, dtype=self.dtype, device=batch.device)
+        return one_hot.scatter_(1, index, 1)
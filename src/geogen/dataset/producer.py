@@ -0,0 +1,295 @@
+"""
+A persistent producer service that generates label volumes into a shared-memory ring buffer.
+"""
+
+import multiprocessing as mp
+import queue
+import time
+from collections import deque
+
+import numpy as np
+import torch
+from torch.utils.data import IterableDataset
+
+from geogen.generation import MarkovGeostoryGenerator
+from geogen.probability import derive_seed
+
+_POLL_INTERVAL = 0.1  # Seconds between checks of the stop event while waiting on a queue
+
+
+def _producer_loop(
+    producer_id,
+    base_seed,
+    generator_cls,
+    generator_kwargs,
+    shared_buffer,
+    slot_shape,
+    free_slots,
+    filled_slots,
+    produced,
+    counts,
+    stop,
+):
+    """Generate models until stopped, each one into the next free slot of the ring buffer."""
+    generator = generator_cls(**generator_kwargs)  # Built once per producer, not once per sample
+    slots = np.frombuffer(shared_buffer, dtype=np.int8).reshape(slot_shape)
+
+    # Continue the stream where the previous run of this producer stopped
+    count = counts[producer_id]
+    while not stop.is_set():
+        # Blocking on a free slot is the backpressure, producers idle while the buffer is full
+        try:
+            slot = free_slots.get(timeout=_POLL_INTERVAL)
+        except queue.Empty:
+            continue
+
+        seed = derive_seed(base_seed, producer_id, count)
+        model = generator.generate_model(seed=seed)
+        model.fill_nans()
+        slots[slot] = model.get_data_grid()
+        filled_slots.put((slot, {"seed": seed, "producer": producer_id, "history": model.get_history_string()}))
+        with produced.get_lock():
+            produced.value += 1
+        count += 1
+        counts[producer_id] = count
+
+
+class ProducerService:
+    """
+    A persistent pool of producer processes filling a shared-memory ring buffer of int8 label volumes.
+
+    Each producer builds its generator once and then generates models continuously into free slots
+    of the ring buffer. A producer waits when no slot is free, so memory is bounded by `capacity`
+    volumes and generation runs at most `capacity` samples ahead of the consumer. The service is
+    independent of any DataLoader and keeps generating across epochs.
+
+    Sample k of producer p is generated from `derive_seed(seed, p, k)`, so each producer yields a
+    reproducible stream. The interleaving of the producers depends on their timing. Producers
+    continue their streams when the service is restarted after `close`, so no sample repeats.
+
+    Parameters
+    ----------
+    model_bounds : tuple
+        Bounds of the model as ((xmin, xmax), (ymin, ymax), (zmin, zmax)).
+    model_resolution : tuple
+        Resolution of the model as (x_res, y_res, z_res).
+    generator_config : str, optional
+        A path to a configuration file for the generator.
+    producers : int, optional
+        Number of producer processes. Default is 2.
+    capacity : int, optional
+        Number of volumes in the ring buffer. Default is 2 * producers + 2.
+    seed : int, optional
+        Base seed of the producer streams. Fresh entropy is used if not provided.
+    mp_context : str, optional
+        The multiprocessing start method ('fork', 'spawn', 'forkserver'). Default is the platform default.
+
+    Examples
+    --------
+    >>> with ProducerService(model_resolution=(128, 128, 64), producers=8, seed=0) as service:
+    ...     dataset = ProducerStreamDataset(service, samples_per_epoch=10000, release_lag=16)
+    ...     loader = DataLoader(dataset, batch_size=16, num_workers=0, collate_fn=CompactCollate())
+    """
+
+    def __init__(
+        self,
+        model_bounds=((-3840, 3840), (-3840, 3840), (-1920, 1920)),
+        model_resolution=(256, 256, 128),
+        generator_config=None,
+        producers=2,
+        capacity=None,
+        seed=None,
+        mp_context=None,
+    ):
+        if producers < 1:
+            raise ValueError(f"Number of producers must be at least 1, got {producers}.")
+        self.producers = producers
+        self.capacity = capacity or 2 * producers + 2
+        self.resolution = tuple(model_resolution)
+        self.seed = seed if seed is not None else np.random.SeedSequence().entropy
+        self._generator_kwargs = {
+            "model_bounds": model_bounds,
+            "model_resolution": self.resolution,
+            "config": generator_config,
+            "label_dtype": np.int8,
+        }
+
+        self._ctx = mp.get_context(mp_context)
+        slot_shape = (self.capacity, *self.resolution)
+        self._slot_shape = slot_shape
+        self._shared_buffer = self._ctx.RawArray("b", int(np.prod(slot_shape)))
+        self._slots = np.frombuffer(self._shared_buffer, dtype=np.int8).reshape(slot_shape)
+
+        self._free_slots = self._ctx.Queue()
+        self._filled_slots = self._ctx.Queue()
+        self._produced = self._ctx.Value("q", 0)
+        self._counts = self._ctx.RawArray("q", producers)  # Samples generated by each producer
+        self._stop = self._ctx.Event()
+        self._processes = []
+        self._consumed = 0
+        self._start_time = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __getstate__(self):
+        raise TypeError("ProducerService belongs to its parent process, consume it with num_workers=0.")
+
+    @property
+    def running(self):
+        return bool(self._processes)
+
+    def start(self):
+        """Start the producer processes, does nothing if they are already running."""
+        if self.running:
+            return
+        self._stop.clear()
+        for slot in range(self.capacity):
+            self._free_slots.put(slot)
+        for producer_id in range(self.producers):
+            process = self._ctx.Process(
+                target=_producer_loop,
+                args=(
+                    producer_id,
+                    self.seed,
+                    MarkovGeostoryGenerator,
+                    self._generator_kwargs,
+                    self._shared_buffer,
+                    self._slot_shape,
+                    self._free_slots,
+                    self._filled_slots,
+                    self._produced,
+                    self._counts,
+                    self._stop,
+                ),
+                daemon=True,
+            )
+            process.start()
+            self._processes.append(process)
+        self._start_time = time.monotonic()
+
+    def get(self, timeout=None):
+        """
+        Take the next generated volume from the ring buffer.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Seconds to wait for a volume, forever if None.
+
+        Returns
+        -------
+        tuple of (int, np.ndarray, dict)
+            The slot index, the int8 label volume as a view into the slot, and the sample metadata.
+            The view is only valid until the slot is given back with `release`.
+        """
+        if not self.running:
+            raise RuntimeError("ProducerService is not running, call start() first.")
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                slot, metadata = self._filled_slots.get(timeout=_POLL_INTERVAL)
+                break
+            except queue.Empty:
+                if not any(process.is_alive() for process in self._processes):
+                    raise RuntimeError("All producer processes have exited.")
+                if deadline is not None and time.monotonic() > deadline:
+                    raise TimeoutError(f"No sample was produced within {timeout} seconds.")
+        self._consumed += 1
+        return slot, self._slots[slot], metadata
+
+    def release(self, slot):
+        """Give a slot back to the producers once its volume is no longer used."""
+        self._free_slots.put(slot)
+
+    def throughput(self):
+        """Average number of samples produced per second since the service started."""
+        if self._start_time is None:
+            return 0.0
+        return self._produced.value / max(time.monotonic() - self._start_time, 1e-9)
+
+    def stats(self):
+        """A dictionary of the produced and consumed sample counts and the throughput."""
+        return {
+            "produced": self._produced.value,
+            "consumed": self._consumed,
+            "samples_per_second": self.throughput(),
+        }
+
+    def close(self, timeout=5.0):
+        """Stop the producers, terminating those still busy generating after the timeout."""
+        self._stop.set()
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        self._processes = []
+        # Drop the slot queues, they are rebuilt in full on the next start
+        for q in (self._free_slots, self._filled_slots):
+            q.cancel_join_thread()
+            q.close()
+        self._free_slots = self._ctx.Queue()
+        self._filled_slots = self._ctx.Queue()
+
+
+class ProducerStreamDataset(IterableDataset):
+    """
+    A PyTorch IterableDataset consuming label volumes from a ProducerService without copies.
+
+    Samples are int8 tensors of shape (1, X, Y, Z) that are views into the shared ring buffer. A
+    slot is given back to the producers `release_lag` samples after it was yielded, so set the lag
+    to at least the batch size: the collate function then copies each batch out of the buffer
+    before any of its slots can be overwritten. The last `release_lag` samples of an epoch are
+    copies instead, as the epoch ends before the DataLoader collates its final batch. Use the
+    DataLoader with num_workers=0, the producers already run in their own processes.
+
+    Parameters
+    ----------
+    service : ProducerService
+        The producer service, started on first iteration if not already running.
+    samples_per_epoch : int
+        Number of samples in one pass over the dataset.
+    release_lag : int, optional
+        Number of samples a slot stays reserved after it was yielded. Default is 1.
+    transform : callable, optional
+        A transform applied to each sample tensor.
+    """
+
+    def __init__(self, service, samples_per_epoch, release_lag=1, transform=None):
+        if release_lag < 1 or release_lag >= service.capacity:
+            raise ValueError(f"release_lag must be in [1, {service.capacity}), got {release_lag}.")
+        self.service = service
+        self.samples_per_epoch = samples_per_epoch
+        self.release_lag = release_lag
+        self.transform = transform
+
+    def __len__(self):
+        return self.samples_per_epoch
+
+    def __iter__(self):
+        self.service.start()
+        held = deque()
+        try:
+            for i in range(self.samples_per_epoch):
+                slot, labels, _ = self.service.get()
+                if i >= self.samples_per_epoch - self.release_lag:
+                    # No later sample of the epoch keeps this slot reserved until collation
+                    labels = labels.copy()
+                    self.service.release(slot)
+                else:
+                    held.append(slot)
+                if len(held) > self.release_lag:
+                    self.service.release(held.popleft())
+
+                data_tensor = torch.from_numpy(labels).unsqueeze(0)
+                if self.transform:
+                    data_tensor = self.transform(data_tensor)
+                yield data_tensor
+        finally:
+            while held:
+                self.service.release(held.popleft())
@@ -0,0 +1,125 @@
+"""
+Planar cross-sections through a model, for computing 2-D label images without a full volume.
+"""
+
+import numpy as np
+
+from geogen.model import CompoundProcess, Slip
+from geogen.model.deferredparameter import DeferredParameter
+from geogen.model.util import rotate
+
+SECTION_ORIENTATIONS = ("axis", "vertical", "oblique", "fault")
+
+
+def section_points(center, u, v, extent, shape):
+    """
+    Get the points of a regular grid on a section plane.
+
+    Parameters
+    ----------
+    center : array_like
+        The (x, y, z) center of the section.
+    u : array_like
+        Unit vector along the section width.
+    v : array_like
+        Unit vector along the section height.
+    extent : tuple
+        The (width, height) of the section.
+    shape : tuple
+        The (H, W) number of points along the height and width.
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (H * W, 3) of points in row-major (H, W) order, with the first row at the
+        top of the section (largest v).
+    """
+    height, width = shape
+    s = np.linspace(-0.5, 0.5, num=width) * extent[0]
+    t = np.linspace(0.5, -0.5, num=height) * extent[1]
+    T, S = np.meshgrid(t, s, indexing="ij")
+    points = np.asarray(center) + S[..., None] * np.asarray(u) + T[..., None] * np.asarray(v)
+    return points.reshape(-1, 3)
+
+
+def find_slips(history):
+    """Get all Slip processes (faults, shears) of a history, including those inside compound processes."""
+    slips = []
+    for process in history:
+        if isinstance(process, CompoundProcess):
+            slips.extend(find_slips(process.unpack()))
+        elif isinstance(process, Slip):
+            slips.append(process)
+    return slips
+
+
+def sample_section_plane(bounds, orientation="vertical", rng=None, history=None):
+    """
+    Draw a random section plane through the model bounds.
+
+    Parameters
+    ----------
+    bounds : tuple
+        Bounds of the model as ((xmin, xmax), (ymin, ymax), (zmin, zmax)).
+    orientation : str, optional
+        The kind of section:
+
+        - 'axis': a plane normal to a random x, y or z axis, at a random position.
+        - 'vertical': a vertical plane at a random azimuth through a random point.
+        - 'oblique': a plane with a uniformly random normal through a random point.
+        - 'fault': a vertical plane along the strike of a random fault or shear of the history,
+          falling back to 'vertical' when the history has none.
+
+        Default is 'vertical'.
+    rng : np.random.Generator, optional
+        Random number generator.
+    history : list of GeoProcess, optional
+        The history of the model, required for 'fault' sections.
+
+    Returns
+    -------
+    tuple
+        The (center, u, v, extent) of the plane, see `section_points`.
+    """
+    if orientation not in SECTION_ORIENTATIONS:
+        raise ValueError(f"Unknown section orientation '{orientation}', expected one of {SECTION_ORIENTATIONS}.")
+    rng = rng if rng is not None else np.random.default_rng()
+    lower, upper = np.array(bounds, dtype=float).T
+    ranges = upper - lower
+    center = (lower + upper) / 2
+    x_hat, y_hat, z_hat = np.eye(3)
+
+    if orientation == "fault":
+        slips = find_slips(history) if history is not None else []
+        if slips:
+            slip = slips[rng.integers(len(slips))]
+            origin = slip.origin.point if isinstance(slip.origin, DeferredParameter) else slip.origin
+            u = rotate(z_hat, -slip.strike) @ y_hat  # Strike is clockwise from north (y-axis)
+            center[:2] = np.clip(np.asarray(origin, dtype=float)[:2], lower[:2], upper[:2])
+            return center, u, z_hat, (ranges[:2].min(), ranges[2])
+        orientation = "vertical"
+
+    if orientation == "axis":
+        axis = rng.integers(3)
+        center[axis] = rng.uniform(lower[axis], upper[axis])
+        u, v = (y_hat, z_hat) if axis == 0 else (x_hat, z_hat) if axis == 1 else (x_hat, y_hat)
+        in_plane = [i for i in range(3) if i != axis]
+        return center, u, v, tuple(ranges[in_plane])
+
+    center = rng.uniform(lower, upper)
+    if orientation == "vertical":
+        center[2] = (lower[2] + upper[2]) / 2
+        u = rotate(z_hat, -rng.uniform(0, 2 * np.pi)) @ y_hat
+        return center, u, z_hat, (ranges[:2].min(), ranges[2])
+
+    # Oblique, uniform normal on the sphere with v pointing upward in the plane
+    normal = rng.normal(size=3)
+    normal /= np.linalg.norm(normal)
+    u = np.cross(z_hat, normal)
+    if np.linalg.norm(u) < 1e-6:
+        u = x_hat  # Horizontal plane
+    u /= np.linalg.norm(u)
+    v = np.cross(normal, u)
+    if v[2] < 0:
+        u, v = -u, -v
+    return center, u, v, (ranges[:2].min(), ranges[2])
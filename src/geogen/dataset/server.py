@@ -0,0 +1,569 @@
+"""
+A local sample server shared by several training jobs, and its client dataset.
+
+One server process owns a single pool of generation workers and an in-memory sample pool. Training
+jobs connect over a Unix domain socket, or localhost TCP where Unix sockets are unavailable, and
+request batches of label volumes by resolution, bounds and generator config. Running one pool for
+all jobs keeps every core busy, instead of N loader pools competing for the cores and idling when
+their job is busy with the model. With `reuse` > 1, a generated sample is served to several
+different clients, so one model feeds several jobs.
+
+Connections are authenticated with a shared key. A server on a Unix socket without a given key
+generates one and stores it next to the socket, readable only by the user, where clients find it.
+TCP servers require an explicit key. Requests and replies are JSON headers, and the labels follow
+as raw int8 bytes, so nothing a client sends is unpickled.
+
+Start a server and point datasets of any number of jobs at it::
+
+    python -m geogen.dataset.server --workers 16 --reuse 2
+
+    dataset = GeoDataServerDataset(model_resolution=(128, 128, 64), samples_per_epoch=10000)
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing as mp
+import os
+import socket
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.connection import Client, Listener
+
+import numpy as np
+import torch
+from torch.utils.data import IterableDataset, get_worker_info
+
+from geogen.generation import MarkovGeostoryGenerator
+from geogen.probability import derive_seed
+
+log = logging.getLogger("Geo")
+
+# Generators built in a server worker process, one per requested model configuration
+_worker_generators = {}
+
+# Largest request header accepted from a client
+_MAX_REQUEST_BYTES = 1 << 20
+
+
+def _generate_labels(key, seed):
+    """Generate the int8 labels of one model in a server worker."""
+    if key not in _worker_generators:
+        resolution, bounds, config = key
+        _worker_generators[key] = MarkovGeostoryGenerator(
+            model_bounds=bounds, model_resolution=resolution, config=config, label_dtype=np.int8
+        )
+    model = _worker_generators[key].generate_model(seed=seed)
+    model.fill_nans()
+    return model.get_data_grid(), {"seed": seed, "history": model.get_history_string()}
+
+
+def default_address():
+    """A per user Unix socket path, or a localhost TCP address on platforms without Unix sockets."""
+    if hasattr(socket, "AF_UNIX"):
+        return os.path.join(tempfile.gettempdir(), f"geogen-{os.getuid()}.sock")
+    return ("localhost", 6178)
+
+
+def key_path(address):
+    """The file holding the generated authentication key of a server on a Unix socket."""
+    return address + ".key"
+
+
+def _read_key(address):
+    """The authentication key a server on a Unix socket stored next to it."""
+    if not isinstance(address, str):
+        raise ValueError("Connecting to a TCP sample server requires an authkey.")
+    try:
+        with open(key_path(address), "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"No authentication key found for the sample server at {address}.") from None
+
+
+def _write_key(address, authkey):
+    """Store a key next to a Unix socket, readable and writable only by the user."""
+    path = key_path(address)
+    if os.path.exists(path):
+        os.remove(path)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(authkey)
+
+
+def _send(conn, header, payload=None):
+    """Send a JSON header, followed by the raw bytes of an array if given."""
+    conn.send_bytes(json.dumps(header).encode())
+    if payload is not None:
+        conn.send_bytes(memoryview(payload).cast("B"))
+
+
+def _receive(conn):
+    """Receive a JSON header."""
+    return json.loads(conn.recv_bytes())
+
+
+def _model_key(model_resolution, model_bounds=None, generator_config=None):
+    """A hashable key of a model configuration."""
+    bounds = None if model_bounds is None else tuple(tuple(float(b) for b in axis) for axis in model_bounds)
+    config = None if generator_config is None else str(generator_config)
+    return tuple(int(r) for r in model_resolution), bounds, config
+
+
+class _Sample:
+    __slots__ = ("labels", "metadata", "clients")
+
+    def __init__(self, labels, metadata):
+        self.labels = labels
+        self.metadata = metadata
+        self.clients = set()  # Clients the sample was served to
+
+
+class _ModelPool:
+    """The generated samples and the generation in flight of one model configuration."""
+
+    def __init__(self, key, key_id):
+        self.key = key
+        self.key_id = key_id
+        self.fresh = deque()  # Samples not served to any client yet
+        self.shared = deque()  # Served samples that other clients may still receive
+        self.in_flight = 0
+        self.submitted = 0
+        self.error = None  # A failed generation not reported to a request yet
+        self.attempt = 0  # Incremented when an error is reported, failures of earlier submissions are only logged
+
+
+class SampleServer:
+    """
+    A local server generating label volumes for any number of client datasets.
+
+    Each model configuration gets its own sample pool, kept topped up with `capacity` fresh samples
+    by the shared worker pool. A sample is served at most `reuse` times and never twice to the same
+    client, and the server prefers serving samples other clients already received. Sample k of the
+    i-th configuration requested is generated from `derive_seed(seed, i, k)`. A failed generation
+    fails the request waiting on it, later requests of the configuration are served again.
+
+    Parameters
+    ----------
+    address : str or tuple, optional
+        A Unix socket path or a (host, port) TCP address. Default is `default_address()`.
+    workers : int, optional
+        Number of generation processes. Default is the number of CPUs.
+    capacity : int, optional
+        Number of fresh samples generated ahead of demand per configuration. Default is 2 * workers.
+    reuse : int, optional
+        Maximum number of clients a sample is served to. Default is 1, no sharing.
+    seed : int, optional
+        Base seed of the generated samples. Fresh entropy is used if not provided.
+    authkey : bytes or str, optional
+        Key clients must present to connect. Required for a TCP address. On a Unix socket a random
+        key is generated by default and stored at `key_path(address)` for the clients of the user.
+    mp_context : str, optional
+        The multiprocessing start method of the workers. Default is the platform default.
+    """
+
+    def __init__(
+        self,
+        address=None,
+        workers=None,
+        capacity=None,
+        reuse=1,
+        seed=None,
+        authkey=None,
+        mp_context=None,
+    ):
+        if reuse < 1:
+            raise ValueError(f"reuse must be at least 1, got {reuse}.")
+        self.address = address if address is not None else default_address()
+        self.workers = workers or os.cpu_count()
+        self.capacity = capacity or 2 * self.workers
+        self.reuse = reuse
+        self.seed = seed if seed is not None else np.random.SeedSequence().entropy
+        if authkey is None and not isinstance(self.address, str):
+            raise ValueError("A TCP sample server requires an authkey.")
+        self.authkey = authkey.encode() if isinstance(authkey, str) else authkey
+        self._mp_context = mp_context
+        self._owns_key = False
+
+        self._cond = threading.Condition(threading.RLock())  # Reentrant, callbacks may run in the caller
+        self._pools = {}
+        self._executor = None
+        self._listener = None
+        self._threads = []
+        self._closed = False
+        self._n_clients = 0
+        self._generated = 0
+        self._served = 0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def start(self):
+        """Start the workers and accept clients on a background thread."""
+        if self._listener is not None:
+            return
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            self._remove_stale_socket()
+        if self.authkey is None:
+            self.authkey = os.urandom(32)
+            _write_key(self.address, self.authkey)
+            self._owns_key = True
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=mp.get_context(self._mp_context))
+        self._listener = Listener(self.address, authkey=self.authkey)
+        self.address = self._listener.address  # The bound port when TCP port 0 was requested
+        if isinstance(self.address, str):
+            os.chmod(self.address, 0o600)
+        thread = threading.Thread(target=self._accept_loop, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+        log.info(f"Sample server listening on {self.address}")
+
+    def serve_forever(self):
+        """Start the server and block until it is closed."""
+        self.start()
+        self._threads[0].join()
+
+    def _remove_stale_socket(self):
+        """Remove a socket file left behind by a server that is gone, refuse to replace a live one."""
+        probe = socket.socket(socket.AF_UNIX)
+        try:
+            probe.connect(self.address)
+        except OSError:
+            os.remove(self.address)
+        else:
+            raise OSError(f"A server is already listening on {self.address}.")
+        finally:
+            probe.close()
+
+    def _accept_loop(self):
+        while not self._closed:
+            try:
+                conn = self._listener.accept()
+            except OSError:
+                if self._closed:
+                    break  # The listener was closed
+                log.warning("Sample server dropped a connection during authentication.")
+                continue
+            except Exception as e:  # e.g. a client failing authentication
+                log.warning(f"Sample server rejected a connection: {e}")
+                continue
+            with self._cond:
+                self._n_clients += 1
+                client_id = self._n_clients
+            thread = threading.Thread(target=self._handle_client, args=(conn, client_id), daemon=True)
+            thread.start()
+
+    def _handle_client(self, conn, client_id):
+        try:
+            while not self._closed:
+                try:
+                    request = conn.recv_bytes(_MAX_REQUEST_BYTES)
+                except (EOFError, OSError):
+                    break
+                try:
+                    request = json.loads(request)
+                    command = request["command"]
+                    if command == "batch":
+                        labels, metadata = self.get_batch(
+                            int(request["n"]),
+                            request["model_resolution"],
+                            request.get("model_bounds"),
+                            request.get("generator_config"),
+                            client_id=client_id,
+                        )
+                        _send(conn, {"status": "ok", "shape": labels.shape, "metadata": metadata}, labels)
+                    elif command == "stats":
+                        _send(conn, {"status": "ok", "stats": self.stats()})
+                    else:
+                        _send(conn, {"status": "error", "message": f"Unknown request '{command}'."})
+                except (EOFError, OSError):
+                    break
+                except Exception as e:
+                    _send(conn, {"status": "error", "message": f"{type(e).__name__}: {e}"})
+        except (EOFError, OSError):
+            pass  # The client went away while an error was reported
+        finally:
+            conn.close()
+
+    def _get_pool(self, key):
+        if key not in self._pools:
+            self._pools[key] = _ModelPool(key, len(self._pools))
+        return self._pools[key]
+
+    def _refill(self, pool):
+        """Submit generation until the pool holds `capacity` fresh or in flight samples."""
+        while len(pool.fresh) + pool.in_flight < self.capacity and not self._closed:
+            seed = derive_seed(self.seed, pool.key_id, pool.submitted)
+            future = self._executor.submit(_generate_labels, pool.key, seed)
+            pool.in_flight += 1
+            pool.submitted += 1
+            future.add_done_callback(lambda f, pool=pool, attempt=pool.attempt: self._on_generated(pool, f, attempt))
+
+    def _on_generated(self, pool, future, attempt):
+        with self._cond:
+            pool.in_flight -= 1
+            if future.cancelled():
+                return
+            if future.exception() is not None:
+                log.warning(f"Generation failed for {pool.key}: {future.exception()}")
+                if attempt == pool.attempt:
+                    pool.error = future.exception()
+            else:
+                pool.fresh.append(_Sample(*future.result()))
+                self._generated += 1
+            self._cond.notify_all()
+
+    def _pop_sample(self, pool, client_id):
+        """The next sample for a client, shared samples first, or None if there is none."""
+        sample = next((s for s in pool.shared if client_id not in s.clients), None)
+        if sample is not None:
+            pool.shared.remove(sample)
+        elif pool.fresh:
+            sample = pool.fresh.popleft()
+        else:
+            return None
+
+        sample.clients.add(client_id)
+        if len(sample.clients) < self.reuse:
+            pool.shared.append(sample)
+            while len(pool.shared) > self.capacity:
+                pool.shared.popleft()  # Stop sharing the oldest samples
+        self._served += 1
+        return sample
+
+    def get_batch(self, n, model_resolution, model_bounds=None, generator_config=None, client_id=0):
+        """
+        Take a batch of samples of one model configuration, waiting for them to be generated.
+
+        Returns
+        -------
+        tuple of (np.ndarray, list of dict)
+            The (n, nx, ny, nz) int8 labels and the metadata of each sample.
+        """
+        if self._executor is None:
+            raise RuntimeError("SampleServer is not running, call start() first.")
+        key = _model_key(model_resolution, model_bounds, generator_config)
+        batch = []
+        with self._cond:
+            pool = self._get_pool(key)
+            while len(batch) < n:
+                if self._closed:
+                    raise RuntimeError("SampleServer was closed.")
+                if pool.error is not None:
+                    # Fail this request only, the next one submits new generations
+                    error, pool.error = pool.error, None
+                    pool.attempt += 1
+                    raise RuntimeError(f"Generation failed for {key}: {error}")
+                sample = self._pop_sample(pool, client_id)
+                if sample is None:
+                    self._refill(pool)
+                    self._cond.wait()
+                else:
+                    batch.append(sample)
+            self._refill(pool)
+        return np.stack([s.labels for s in batch]), [s.metadata for s in batch]
+
+    def stats(self):
+        """Counts of generated and served samples, and the pool depth of each configuration."""
+        with self._cond:
+            return {
+                "workers": self.workers,
+                "clients": self._n_clients,
+                "generated": self._generated,
+                "served": self._served,
+                "served_per_generated": self._served / max(self._generated, 1),
+                "pools": {
+                    str(key): {"fresh": len(pool.fresh), "shared": len(pool.shared), "in_flight": pool.in_flight}
+                    for key, pool in self._pools.items()
+                },
+            }
+
+    def close(self):
+        """Stop accepting clients, wake up waiting requests and shut down the workers."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._listener is not None:
+            self._listener.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+        if self._owns_key:
+            try:
+                os.remove(key_path(self.address))
+            except FileNotFoundError:
+                pass
+            self._owns_key = False
+
+
+class SampleClient:
+    """
+    A connection to a SampleServer.
+
+    Parameters
+    ----------
+    address : str or tuple, optional
+        The server address. Default is `default_address()`.
+    authkey : bytes or str, optional
+        The server's authentication key. Default is the key a server on a Unix socket generated.
+    """
+
+    def __init__(self, address=None, authkey=None):
+        address = address if address is not None else default_address()
+        if authkey is None:
+            authkey = _read_key(address)
+        authkey = authkey.encode() if isinstance(authkey, str) else authkey
+        self._conn = Client(address, authkey=authkey)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _request(self, **request):
+        _send(self._conn, request)
+        reply = _receive(self._conn)
+        if reply["status"] == "error":
+            raise RuntimeError(f"Sample server error: {reply['message']}")
+        return reply
+
+    def get_batch(self, n, model_resolution, model_bounds=None, generator_config=None):
+        """
+        Request a batch of label volumes.
+
+        Returns
+        -------
+        tuple of (np.ndarray, list of dict)
+            The (n, nx, ny, nz) int8 labels with air as -1, and the metadata of each sample.
+        """
+        reply = self._request(
+            command="batch",
+            n=int(n),
+            model_resolution=[int(r) for r in model_resolution],
+            model_bounds=None if model_bounds is None else [[float(b) for b in axis] for axis in model_bounds],
+            generator_config=None if generator_config is None else str(generator_config),
+        )
+        # The labels follow as raw bytes
+        labels = np.frombuffer(self._conn.recv_bytes(), dtype=np.int8).reshape(reply["shape"])
+        return labels, reply["metadata"]
+
+    def stats(self):
+        """The server statistics, see SampleServer.stats."""
+        return self._request(command="stats")["stats"]
+
+    def close(self):
+        self._conn.close()
+
+
+class GeoDataServerDataset(IterableDataset):
+    """
+    A PyTorch IterableDataset of int8 label volumes requested from a SampleServer.
+
+    Samples are fetched in batches of `request_size` and yielded one by one as tensors of shape
+    (1, X, Y, Z). Each DataLoader worker opens its own connection and fetches its share of the
+    epoch. The dataset is thin, generation happens in the server, so few loader workers are needed.
+
+    Parameters
+    ----------
+    address : str or tuple, optional
+        The server address. Default is `default_address()`.
+    model_resolution : tuple, optional
+        Resolution of the models as (x_res, y_res, z_res).
+    model_bounds : tuple, optional
+        Bounds of the models. Default is the generator default.
+    generator_config : str, optional
+        A path to a Markov matrix configuration for the generator.
+    samples_per_epoch : int, optional
+        Number of samples in one pass over the dataset. Default is 1000.
+    request_size : int, optional
+        Number of samples per request to the server. Default is 16.
+    authkey : bytes or str, optional
+        The server's authentication key. Default is the key a server on a Unix socket generated.
+    transform : callable, optional
+        A transform applied to each sample tensor.
+    """
+
+    def __init__(
+        self,
+        address=None,
+        model_resolution=(256, 256, 128),
+        model_bounds=None,
+        generator_config=None,
+        samples_per_epoch=1000,
+        request_size=16,
+        authkey=None,
+        transform=None,
+    ):
+        self.address = address if address is not None else default_address()
+        self.model_resolution = tuple(model_resolution)
+        self.model_bounds = model_bounds
+        self.generator_config = generator_config
+        self.samples_per_epoch = samples_per_epoch
+        self.request_size = request_size
+        self.authkey = authkey
+        self.transform = transform
+
+    def __len__(self):
+        return self.samples_per_epoch
+
+    def __iter__(self):
+        worker_info = get_worker_info()
+        worker_id, num_workers = (worker_info.id, worker_info.num_workers) if worker_info else (0, 1)
+        remaining = len(range(worker_id, self.samples_per_epoch, num_workers))
+
+        with SampleClient(self.address, authkey=self.authkey) as client:
+            while remaining > 0:
+                n = min(self.request_size, remaining)
+                labels, _ = client.get_batch(n, self.model_resolution, self.model_bounds, self.generator_config)
+                remaining -= n
+                for sample in labels:
+                    data_tensor = torch.from_numpy(sample.copy()).unsqueeze(0)
+                    if self.transform:
+                        data_tensor = self.transform(data_tensor)
+                    yield data_tensor
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve generated label volumes to local training jobs.")
+    parser.add_argument("--address", help="Unix socket path, or host:port for TCP.")
+    parser.add_argument("--workers", type=int, help="Generation processes, default is the number of CPUs.")
+    parser.add_argument("--capacity", type=int, help="Fresh samples kept ready per model configuration.")
+    parser.add_argument("--reuse", type=int, default=1, help="Clients each sample is served to.")
+    parser.add_argument("--seed", type=int, help="Base seed of the generated samples.")
+    parser.add_argument(
+        "--authkey",
+        default=os.environ.get("GEOGEN_SERVER_AUTHKEY"),
+        help="Key clients must present, required for TCP. Defaults to $GEOGEN_SERVER_AUTHKEY, or a generated key "
+        "stored next to a Unix socket.",
+    )
+    args = parser.parse_args(argv)
+
+    address = args.address
+    if address is not None and ":" in address:
+        host, port = address.rsplit(":", 1)
+        address = (host, int(port))
+    logging.basicConfig(level=logging.INFO)
+    server = SampleServer(
+        address,
+        workers=args.workers,
+        capacity=args.capacity,
+        reuse=args.reuse,
+        seed=args.seed,
+        authkey=args.authkey,
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
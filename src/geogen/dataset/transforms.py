@@ -0,0 +1,142 @@
+"""
+Exact, interpolation-free geometric augmentations of label volumes.
+"""
+
+import numpy as np
+
+from geogen.model import empty_mask
+from geogen.model.util import sample_crop_offsets
+
+# The dihedral group of the xy-plane as (quarter turns about z, flip x) pairs. Flipping y is a
+# half turn composed with an x flip, so these 8 elements cover every rotation and flip of x and y.
+# Without rotations, the flips of x and y are the elements with 0 or 2 quarter turns.
+DIHEDRAL_XY = [(k, flip) for flip in (False, True) for k in range(4)]
+
+
+class GeometricAugmentation:
+    """
+    Label-preserving augmentations that turn one computed model into several distinct samples.
+
+    Supported operations are 90 degree rotations about the z-axis, flips of the x and y axes and
+    sub-volume crops. All of them are exact voxel permutations, so no interpolation is needed and
+    labels stay categorical. The z-axis is never flipped or rotated, keeping the z-up convention.
+
+    Parameters
+    ----------
+    rotate : bool, optional
+        Use quarter turn rotations about the z-axis. Default is True.
+    flip : bool, optional
+        Use flips of the x and y axes, also without rotations. Default is True.
+    crop_size : tuple, optional
+        The (cx, cy, cz) size of sub-volume crops, taken from larger volumes. Default is None for no cropping.
+    crop_layout : str, optional
+        'random' for uniformly placed crops or 'grid' for non-overlapping crops. Default is 'random'.
+    max_air_fraction : float, optional
+        Reject crops with a larger fraction of air, to keep the crop distribution close to the one
+        of full models. Default is None for no rejection.
+
+    Notes
+    -----
+    Quarter turns swap the x and y axes, so they are only used when the output is square in xy.
+    Otherwise only half turns are used.
+    """
+
+    def __init__(self, rotate=True, flip=True, crop_size=None, crop_layout="random", max_air_fraction=None):
+        self.rotate = rotate
+        self.flip = flip
+        self.crop_size = tuple(crop_size) if crop_size is not None else None
+        self.crop_layout = crop_layout
+        self.max_air_fraction = max_air_fraction
+
+    def _output_shape(self, input_shape):
+        if self.crop_size is None:
+            return tuple(input_shape)
+        if any(c > n for c, n in zip(self.crop_size, input_shape)):
+            raise ValueError(f"Crop size {self.crop_size} is larger than the volume shape {tuple(input_shape)}.")
+        return self.crop_size
+
+    def _allowed_orientations(self, output_shape):
+        square = output_shape[0] == output_shape[1]
+        return [
+            (k, flip)
+            for k, flip in DIHEDRAL_XY
+            if (self.rotate or k == 0 or (self.flip and k == 2)) and (square or k % 2 == 0) and (self.flip or not flip)
+        ]
+
+    def sample_params(self, n, input_shape, rng=None, volume=None):
+        """
+        Draw the parameters of n augmentations of one volume.
+
+        Orientations are drawn without replacement until all of them are used, so the first n
+        samples of a volume are distinct whenever n does not exceed the number of orientations.
+
+        Parameters
+        ----------
+        n : int
+            Number of augmented samples.
+        input_shape : tuple
+            The (X, Y, Z) shape of the volume to augment.
+        rng : np.random.Generator, optional
+            Random number generator.
+        volume : np.ndarray, optional
+            The volume itself, required to reject crops by their fraction of air.
+
+        Returns
+        -------
+        list of dict
+            One parameter dictionary per sample, to be used with `apply`.
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        output_shape = self._output_shape(input_shape)
+        orientations = self._allowed_orientations(output_shape)
+
+        if self.crop_size is None:
+            offsets = [(0, 0, 0)] * n
+        else:
+            use_air = self.max_air_fraction is not None
+            offsets = sample_crop_offsets(
+                input_shape,
+                output_shape,
+                n,
+                rng=rng,
+                layout=self.crop_layout,
+                empty=empty_mask(volume) if use_air else None,
+                max_empty_fraction=self.max_air_fraction,
+            )
+
+        params = []
+        order = []
+        for offset in offsets:
+            if not order:
+                order = list(rng.permutation(len(orientations)))
+            k, flip = orientations[order.pop()]
+            params.append({"k": k, "flip": flip, "offset": offset})
+        return params
+
+    def apply(self, volume, params):
+        """
+        Apply one augmentation to a (X, Y, Z) volume.
+
+        Parameters
+        ----------
+        volume : np.ndarray
+            The label volume.
+        params : dict
+            Augmentation parameters from `sample_params`.
+
+        Returns
+        -------
+        np.ndarray
+            The augmented volume, a view into the input volume. Rotated or flipped views have
+            negative strides.
+        """
+        output_shape = self._output_shape(volume.shape)
+        slices = tuple(slice(o, o + c) for o, c in zip(params["offset"], output_shape))
+        volume = np.rot90(volume[slices], k=params["k"], axes=(0, 1))
+        if params["flip"]:
+            volume = volume[::-1]
+        return volume
+
+    def __call__(self, volume, rng=None):
+        """Apply one random augmentation to a (X, Y, Z) volume."""
+        return self.apply(volume, self.sample_params(1, volume.shape, rng, volume=volume)[0])
@@ -1 +1,4 @@
+from .corpus import CorpusReader, CorpusWriter
+from .corpus_job import CorpusJob
+from .dedupe import DuplicateIndex, LabelSketch, deduplicate_corpus, label_sketch
 from .file_manager import FileManager
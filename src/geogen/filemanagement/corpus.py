@@ -0,0 +1,271 @@
+"""
+Sharded corpus of pre-generated label volumes with memory-mapped random access.
+
+A corpus directory holds fixed-shape shards of int8 label volumes stored as raw C-ordered arrays,
+and an `index.json` file with the corpus layout and per-sample metadata::
+
+    corpus_dir/
+        index.json
+        shard_00000.bin   # (shard_size, nx, ny, nz) int8
+        shard_00001.bin   # last shard may hold fewer samples
+"""
+
+import json
+import os
+import uuid
+
+import numpy as np
+
+from geogen.model import history_fingerprint
+from geogen.probability import derive_seed
+
+CORPUS_FORMAT_VERSION = 1
+INDEX_FILENAME = "index.json"
+
+
+def _atomic_write_bytes(path, data):
+    """Write bytes to a temporary file and atomically rename it into place."""
+    # A unique temporary name, so concurrent writers of the same file never share one
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _class_counts(labels, num_classes, min_val):
+    """Voxel count of each label class of a volume."""
+    return np.bincount(labels.ravel().astype(np.int64) - min_val, minlength=num_classes)
+
+
+class CorpusWriter:
+    """
+    Writes label volumes into a sharded corpus directory.
+
+    Samples are buffered in memory until a shard is full and then written in one go. The index is
+    written on `close`, so a corpus is only readable once the writer has been closed.
+
+    Parameters
+    ----------
+    corpus_dir : str
+        Directory of the corpus, created if it does not exist. Must not already hold a corpus.
+    resolution : tuple
+        The (nx, ny, nz) shape of every label volume.
+    shard_size : int, optional
+        Number of samples per shard. Default is 256.
+    num_classes : int, optional
+        Number of label classes counted per sample. Default is 15.
+    min_val : int, optional
+        The smallest label value, usually the air value -1. Default is -1.
+
+    Examples
+    --------
+    >>> with CorpusWriter("corpus", resolution=(64, 64, 32)) as writer:
+    ...     writer.write_generated(generator, n_samples=1000, seed=0, workers=8)
+    """
+
+    def __init__(self, corpus_dir, resolution, shard_size=256, num_classes=15, min_val=-1):
+        if os.path.exists(os.path.join(corpus_dir, INDEX_FILENAME)):
+            raise FileExistsError(f"A corpus already exists in {corpus_dir}.")
+        os.makedirs(corpus_dir, exist_ok=True)
+        self.corpus_dir = corpus_dir
+        self.resolution = tuple(int(r) for r in resolution)
+        self.shard_size = shard_size
+        self.num_classes = num_classes
+        self.min_val = min_val
+
+        self._buffer = np.empty((shard_size, *self.resolution), dtype=np.int8)
+        self._n_buffered = 0
+        self._shards = []
+        self._samples = []
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+
+    def __len__(self):
+        return len(self._samples)
+
+    def add(self, labels, seed=None, history=None, fingerprint=None):
+        """
+        Add one label volume to the corpus.
+
+        Parameters
+        ----------
+        labels : np.ndarray
+            Label volume of shape `resolution`, with NaN already filled.
+        seed : int, optional
+            The seed the sample was generated from.
+        history : str, optional
+            The history string of the generating model.
+        fingerprint : str, optional
+            The history fingerprint of the generating model, see `geogen.model.history_fingerprint`.
+        """
+        if self._closed:
+            raise RuntimeError("Cannot add samples to a closed CorpusWriter.")
+        if labels.shape != self.resolution:
+            raise ValueError(f"Expected labels of shape {self.resolution}, got {labels.shape}.")
+
+        self._buffer[self._n_buffered] = labels
+        class_counts = _class_counts(self._buffer[self._n_buffered], self.num_classes, self.min_val)
+        self._samples.append(
+            {
+                "seed": None if seed is None else int(seed),
+                "history": history,
+                "fingerprint": fingerprint,
+                "class_counts": class_counts.tolist(),
+            }
+        )
+        self._n_buffered += 1
+        if self._n_buffered == self.shard_size:
+            self._flush_shard()
+
+    def write_generated(self, generator, n_samples, seed=0, workers=None):
+        """
+        Generate samples with a geostory generator and add them to the corpus.
+
+        Sample i is generated from `derive_seed(seed, i)`, so a corpus can be reproduced from its seed.
+
+        Parameters
+        ----------
+        generator : MarkovGeostoryGenerator
+            The generator, its resolution must match the corpus resolution.
+        n_samples : int
+            Number of samples to generate.
+        seed : int, optional
+            Base seed of the generated samples. Default is 0.
+        workers : int, optional
+            If given, generate on the generator's process pool with this many workers.
+        """
+        offset = len(self)
+        seeds = [derive_seed(seed, offset + i) for i in range(n_samples)]
+        if workers:
+            for labels, metadata in generator.stream_models(n_samples, workers, seeds=seeds):
+                self.add(labels, **metadata)
+        else:
+            for sample_seed in seeds:
+                model = generator.generate_model(seed=sample_seed)
+                model.fill_nans()
+                self.add(
+                    model.get_data_grid(),
+                    seed=sample_seed,
+                    history=model.get_history_string(),
+                    fingerprint=history_fingerprint(model.history),
+                )
+
+    def _flush_shard(self):
+        """Write the buffered samples as the next shard file."""
+        if self._n_buffered == 0:
+            return
+        filename = f"shard_{len(self._shards):05d}.bin"
+        _atomic_write_bytes(os.path.join(self.corpus_dir, filename), self._buffer[: self._n_buffered].tobytes())
+        self._shards.append({"file": filename, "count": self._n_buffered})
+        self._n_buffered = 0
+
+    def close(self):
+        """Write the last partial shard and the corpus index."""
+        if self._closed:
+            return
+        self._flush_shard()
+        _write_index(
+            self.corpus_dir,
+            self.resolution,
+            self.shard_size,
+            self.min_val,
+            self.num_classes,
+            self._shards,
+            self._samples,
+        )
+        self._closed = True
+
+
+def _write_index(corpus_dir, resolution, shard_size, min_val, num_classes, shards, samples):
+    """Atomically write the index of a corpus, making it readable by CorpusReader."""
+    index = {
+        "version": CORPUS_FORMAT_VERSION,
+        "resolution": list(resolution),
+        "dtype": "int8",
+        "shard_size": shard_size,
+        "min_val": min_val,
+        "num_classes": num_classes,
+        "shards": shards,
+        "samples": samples,
+    }
+    _atomic_write_bytes(os.path.join(corpus_dir, INDEX_FILENAME), json.dumps(index).encode())
+
+
+class CorpusReader:
+    """
+    Random access to the samples of a corpus written by CorpusWriter.
+
+    Shards are memory-mapped on first access, so reading a sample is a view into the page cache
+    rather than a copy. Memory maps are not pickled and are reopened in each process, which makes
+    a reader safe to hand to DataLoader workers.
+
+    Parameters
+    ----------
+    corpus_dir : str
+        Directory of the corpus.
+    mmap_mode : str, optional
+        Memory map mode of the shards. The default 'c' (copy-on-write) gives writable arrays
+        that never modify the files on disk.
+    """
+
+    def __init__(self, corpus_dir, mmap_mode="c"):
+        index_path = os.path.join(corpus_dir, INDEX_FILENAME)
+        if not os.path.exists(index_path):
+            raise FileNotFoundError(f"No corpus index found at {index_path}.")
+        with open(index_path) as f:
+            index = json.load(f)
+        if index["version"] != CORPUS_FORMAT_VERSION:
+            raise ValueError(f"Unsupported corpus format version {index['version']}.")
+
+        self.corpus_dir = corpus_dir
+        self.mmap_mode = mmap_mode
+        self.resolution = tuple(index["resolution"])
+        self.dtype = np.dtype(index["dtype"])
+        self.shard_size = index["shard_size"]
+        self.min_val = index["min_val"]
+        self.num_classes = index["num_classes"]
+        self.shards = index["shards"]
+        self.samples = index["samples"]
+        self._memmaps = {}
+
+    def __len__(self):
+        return len(self.samples)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_memmaps"] = {}  # Memory maps are reopened in the receiving process
+        return state
+
+    def _get_shard(self, shard_idx):
+        if shard_idx not in self._memmaps:
+            shard = self.shards[shard_idx]
+            self._memmaps[shard_idx] = np.memmap(
+                os.path.join(self.corpus_dir, shard["file"]),
+                dtype=self.dtype,
+                mode=self.mmap_mode,
+                shape=(shard["count"], *self.resolution),
+            )
+        return self._memmaps[shard_idx]
+
+    def __getitem__(self, idx):
+        """Get the label volume of a sample as a view into its memory-mapped shard."""
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError(f"Sample index {idx} out of range for corpus of size {len(self)}.")
+        shard_idx, offset = divmod(idx, self.shard_size)
+        return self._get_shard(shard_idx)[offset]
+
+    def get_metadata(self, idx):
+        """Get the metadata dictionary (seed, history, fingerprint, class_counts) of a sample."""
+        return self.samples[idx]
+
+    def class_counts(self):
+        """Total voxel count of each class over the whole corpus."""
+        return np.sum([sample["class_counts"] for sample in self.samples], axis=0)
@@ -0,0 +1,490 @@
+"""
+Corpus generation shared by any number of workers and machines through a common directory.
+
+The target sample count is split into work units of consecutive seeds. Workers claim units with
+lock files created atomically with O_EXCL, generate them, and commit each unit as a shard written
+to a temporary file and renamed into place. No database or message broker is needed, only a shared
+filesystem with atomic exclusive create and rename, such as a local disk or NFSv3+::
+
+    corpus_dir/
+        job.json                # the job specification, fixed by the first worker
+        progress.json           # the latest progress and throughput summary
+        leases/unit_00003.lease # claim of a unit in progress, touched as a heartbeat
+        units/unit_00000.bin    # (unit_size, nx, ny, nz) int8 shard of a completed unit
+        units/unit_00000.json   # its sample metadata, written last as the completion marker
+        index.json              # written once all units are done, see CorpusReader
+
+Sample i is generated from `derive_seed(seed, i)` as in `CorpusWriter.write_generated`, so a unit
+always produces the same files. A crashed or preempted worker leaves a lease that goes stale once
+it stops being touched, after which any worker can take the unit over. Each lease records a token
+of its owner, and workers only ever touch, release or replace a lease after checking its token or
+staleness. Should two workers ever generate the same unit, they write identical files.
+
+Run a worker on every machine with::
+
+    python -m geogen.filemanagement.corpus_job run corpus_dir --n-samples 100000 --resolution 128 128 64
+    python -m geogen.filemanagement.corpus_job status corpus_dir
+"""
+
+import argparse
+import glob
+import json
+import os
+import socket
+import time
+import uuid
+
+import numpy as np
+
+from geogen.filemanagement.corpus import INDEX_FILENAME, _atomic_write_bytes, _class_counts, _write_index
+from geogen.generation import MarkovGeostoryGenerator
+from geogen.model import history_fingerprint
+from geogen.probability import derive_seed
+
+JOB_FILENAME = "job.json"
+PROGRESS_FILENAME = "progress.json"
+
+
+class CorpusJob:
+    """
+    A corpus generation job coordinated through its directory.
+
+    The first worker to open a job directory fixes the job specification. Workers joining later
+    may omit the specification, or must give the same one.
+
+    Parameters
+    ----------
+    corpus_dir : str
+        The shared directory of the job.
+    n_samples : int, optional
+        Target number of samples. Required to create a new job.
+    unit_size : int, optional
+        Number of samples per work unit and shard. Default is 256 for a new job.
+    seed : int, optional
+        Base seed of the corpus. Default is 0 for a new job.
+    model_bounds : tuple, optional
+        Bounds of the models. Default is the generator default.
+    model_resolution : tuple, optional
+        The (nx, ny, nz) resolution of the models. Required to create a new job.
+    generator_config : str, optional
+        A path to a Markov matrix configuration for the generator.
+    num_classes : int, optional
+        Number of label classes counted per sample. Default is 15.
+    min_val : int, optional
+        The smallest label value, usually the air value -1. Default is -1.
+    lease_timeout : float, optional
+        Seconds without a heartbeat after which a claimed unit is considered abandoned. It must
+        exceed the time to generate one sample plus the clock skew between machines. Default is 600.
+    """
+
+    def __init__(
+        self,
+        corpus_dir,
+        n_samples=None,
+        unit_size=None,
+        seed=None,
+        model_bounds=None,
+        model_resolution=None,
+        generator_config=None,
+        num_classes=15,
+        min_val=-1,
+        lease_timeout=600.0,
+    ):
+        self.corpus_dir = corpus_dir
+        self.lease_timeout = lease_timeout
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self.token = uuid.uuid4().hex  # Identifies the leases of this job instance
+        self._lease_dir = os.path.join(corpus_dir, "leases")
+        self._unit_dir = os.path.join(corpus_dir, "units")
+        os.makedirs(self._lease_dir, exist_ok=True)
+        os.makedirs(self._unit_dir, exist_ok=True)
+
+        requested = {
+            "n_samples": n_samples,
+            "unit_size": unit_size,
+            "seed": seed,
+            "model_bounds": model_bounds,
+            "model_resolution": None if model_resolution is None else list(model_resolution),
+            "generator_config": None if generator_config is None else str(generator_config),
+            "num_classes": num_classes,
+            "min_val": min_val,
+        }
+        self.spec = self._open_spec(requested)
+
+    def _open_spec(self, requested):
+        """Create the job specification, or load the existing one and check it against the request."""
+        path = os.path.join(self.corpus_dir, JOB_FILENAME)
+        if not os.path.exists(path):
+            if requested["n_samples"] is None or requested["model_resolution"] is None:
+                raise ValueError(f"No job in {self.corpus_dir}, n_samples and model_resolution are required.")
+            spec = {**requested, "unit_size": requested["unit_size"] or 256, "seed": requested["seed"] or 0}
+            try:
+                # Exclusive create, if several workers start at once only one specification is written
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                pass
+            else:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(spec, f)
+                return spec
+
+        spec = self._read_json(path, retries=10)
+        mismatched = [
+            key
+            for key in ("n_samples", "model_resolution", "unit_size", "seed")
+            if requested[key] is not None and spec[key] != requested[key]
+        ]
+        if mismatched:
+            raise ValueError(f"Job in {self.corpus_dir} has a different specification for {', '.join(mismatched)}.")
+        return spec
+
+    @staticmethod
+    def _read_json(path, retries=0):
+        """Read a JSON file, retrying while another worker may still be writing it."""
+        for attempt in range(retries + 1):
+            try:
+                with open(path) as f:
+                    return json.load(f)
+            except json.JSONDecodeError:
+                if attempt == retries:
+                    raise
+                time.sleep(0.1)
+
+    def __repr__(self):
+        return f"CorpusJob(corpus_dir={self.corpus_dir}, n_samples={self.spec['n_samples']}, units={self.n_units})"
+
+    @property
+    def n_units(self):
+        return -(-self.spec["n_samples"] // self.spec["unit_size"])
+
+    def unit_range(self, unit):
+        """The range of sample indices of a unit."""
+        start = unit * self.spec["unit_size"]
+        return range(start, min(start + self.spec["unit_size"], self.spec["n_samples"]))
+
+    def _unit_name(self, unit):
+        return f"unit_{unit:05d}"
+
+    def _lease_path(self, unit):
+        return os.path.join(self._lease_dir, f"{self._unit_name(unit)}.lease")
+
+    def is_done(self, unit):
+        """Whether a unit is committed, its metadata file is written last."""
+        return os.path.exists(os.path.join(self._unit_dir, f"{self._unit_name(unit)}.json"))
+
+    def _lease_is_stale(self, path):
+        try:
+            return time.time() - os.stat(path).st_mtime > self.lease_timeout
+        except FileNotFoundError:
+            return False
+
+    @staticmethod
+    def _lease_token(path):
+        """The owner token of a lease, or None if it is missing or still being written."""
+        try:
+            with open(path) as f:
+                return json.load(f).get("token")
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    @staticmethod
+    def _move_aside(path, tag):
+        """Atomically rename a lease to a private name, of several workers only one gets the file."""
+        aside = f"{path}.{uuid.uuid4().hex}.{tag}"
+        try:
+            os.rename(path, aside)
+        except FileNotFoundError:
+            return None
+        return aside
+
+    def _restore(self, aside, path):
+        """Put back a lease moved aside by mistake, unless the unit was claimed again meanwhile."""
+        try:
+            os.link(aside, path)
+        except FileExistsError:
+            pass
+        self._remove(aside)
+
+    def claim(self, unit):
+        """
+        Try to claim a unit for this worker.
+
+        Returns
+        -------
+        bool
+            True if the unit is now leased by this worker.
+        """
+        path = self._lease_path(unit)
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            if not self._lease_is_stale(path):
+                return False
+            # Move the abandoned lease aside. Another worker may have replaced it with a fresh lease
+            # since the staleness check, so the moved file is checked again and put back if fresh.
+            aside = self._move_aside(path, "stale")
+            if aside is None:
+                return False
+            if not self._lease_is_stale(aside):
+                self._restore(aside, path)
+                return False
+            self._remove(aside)
+            # Exclusive create again, of the workers taking over at once only one succeeds
+            return self.claim(unit)
+        with os.fdopen(fd, "w") as f:
+            json.dump({"owner": self.owner, "token": self.token, "claimed": time.time()}, f)
+        return True
+
+    def _heartbeat(self, unit):
+        """Touch the lease of a unit to show it is still being generated."""
+        path = self._lease_path(unit)
+        if self._lease_token(path) != self.token:
+            return  # Taken over after a stall, the unit is finished anyway and written identically
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+    def release(self, unit):
+        """Give up the lease of a unit, a lease taken over by another worker is left in place."""
+        path = self._lease_path(unit)
+        if self._lease_token(path) != self.token:
+            return
+        # The lease may be taken over between the check and the removal, so it is moved aside first
+        aside = self._move_aside(path, "release")
+        if aside is None:
+            return
+        if self._lease_token(aside) == self.token:
+            self._remove(aside)
+        else:
+            self._restore(aside, path)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def _new_generator(self):
+        spec = self.spec
+        return MarkovGeostoryGenerator(
+            model_bounds=None if spec["model_bounds"] is None else tuple(map(tuple, spec["model_bounds"])),
+            model_resolution=tuple(spec["model_resolution"]),
+            config=spec["generator_config"],
+            label_dtype=np.int8,
+        )
+
+    def _generate_unit(self, unit, generator, workers=None):
+        """Generate the samples of a unit and commit them as a shard."""
+        spec = self.spec
+        indices = self.unit_range(unit)
+        seeds = [derive_seed(spec["seed"], i) for i in indices]
+        shard = np.empty((len(seeds), *spec["model_resolution"]), dtype=np.int8)
+        samples = []
+        started = time.time()
+
+        if workers:
+            stream = generator.stream_models(len(seeds), workers, seeds=seeds)
+        else:
+            stream = (self._generate_sample(generator, sample_seed) for sample_seed in seeds)
+        for k, (labels, metadata) in enumerate(stream):
+            shard[k] = labels
+            samples.append(
+                {
+                    "seed": int(metadata["seed"]),
+                    "history": metadata["history"],
+                    "fingerprint": metadata.get("fingerprint"),
+                    "class_counts": _class_counts(labels, spec["num_classes"], spec["min_val"]).tolist(),
+                }
+            )
+            self._heartbeat(unit)
+
+        name = self._unit_name(unit)
+        _atomic_write_bytes(os.path.join(self._unit_dir, f"{name}.bin"), shard.tobytes())
+        record = {
+            "unit": unit,
+            "count": len(samples),
+            "owner": self.owner,
+            "started": started,
+            "finished": time.time(),
+            "samples": samples,
+        }
+        # The metadata is the completion marker, so it is renamed into place after the shard
+        _atomic_write_bytes(os.path.join(self._unit_dir, f"{name}.json"), json.dumps(record).encode())
+
+    @staticmethod
+    def _generate_sample(generator, seed):
+        model = generator.generate_model(seed=seed)
+        model.fill_nans()
+        fingerprint = history_fingerprint(model.history)
+        return model.get_data_grid(), {"seed": seed, "history": model.get_history_string(), "fingerprint": fingerprint}
+
+    def run(self, workers=None, max_units=None):
+        """
+        Claim and generate units until none are left, then write the corpus index.
+
+        Parameters
+        ----------
+        workers : int, optional
+            If given, generate each unit on a local process pool with this many workers.
+        max_units : int, optional
+            Stop after generating this many units.
+
+        Returns
+        -------
+        int
+            Number of units generated by this call.
+        """
+        generator = self._new_generator()
+        completed = 0
+        try:
+            for unit in range(self.n_units):
+                if max_units is not None and completed >= max_units:
+                    break
+                if self.is_done(unit) or not self.claim(unit):
+                    continue
+                try:
+                    # Another worker may have committed the unit between the check and the claim
+                    if not self.is_done(unit):
+                        self._generate_unit(unit, generator, workers)
+                        completed += 1
+                finally:
+                    self.release(unit)
+                self.write_progress()
+        finally:
+            generator.close_pool()
+        self.finalize()
+        return completed
+
+    def _unit_records(self):
+        records = []
+        for path in sorted(glob.glob(os.path.join(self._unit_dir, "unit_*.json"))):
+            records.append(self._read_json(path))
+        return records
+
+    def finalize(self):
+        """
+        Write the corpus index once every unit is done.
+
+        Returns
+        -------
+        bool
+            True if the corpus is complete and readable with CorpusReader.
+        """
+        if os.path.exists(os.path.join(self.corpus_dir, INDEX_FILENAME)):
+            return True
+        if not all(self.is_done(unit) for unit in range(self.n_units)):
+            return False
+        records = sorted(self._unit_records(), key=lambda record: record["unit"])
+        shards = [
+            {"file": os.path.join("units", f"{self._unit_name(r['unit'])}.bin"), "count": r["count"]} for r in records
+        ]
+        samples = [sample for record in records for sample in record["samples"]]
+        spec = self.spec
+        _write_index(
+            self.corpus_dir,
+            spec["model_resolution"],
+            spec["unit_size"],
+            spec["min_val"],
+            spec["num_classes"],
+            shards,
+            samples,
+        )
+        return True
+
+    def status(self):
+        """
+        Summarize the progress and throughput of the job from its directory.
+
+        Returns
+        -------
+        dict
+            Unit and sample counts, the leased and stale units, the aggregate throughput in samples
+            per second over the span of the completed units, and per worker totals.
+        """
+        records = self._unit_records()
+        leases = glob.glob(os.path.join(self._lease_dir, "unit_*.lease"))
+        stale = sum(self._lease_is_stale(path) for path in leases)
+        samples_done = sum(record["count"] for record in records)
+
+        workers = {}
+        for record in records:
+            worker = workers.setdefault(record["owner"], {"units": 0, "samples": 0, "seconds": 0.0})
+            worker["units"] += 1
+            worker["samples"] += record["count"]
+            worker["seconds"] += record["finished"] - record["started"]
+
+        span = max((r["finished"] for r in records), default=0) - min((r["started"] for r in records), default=0)
+        return {
+            "n_samples": self.spec["n_samples"],
+            "samples_done": samples_done,
+            "fraction_done": samples_done / self.spec["n_samples"],
+            "n_units": self.n_units,
+            "units_done": len(records),
+            "units_leased": len(leases) - stale,
+            "units_stale": stale,
+            "samples_per_second": samples_done / span if span > 0 else 0.0,
+            "complete": os.path.exists(os.path.join(self.corpus_dir, INDEX_FILENAME)),
+            "workers": workers,
+            "updated": time.time(),
+        }
+
+    def write_progress(self):
+        """Write the current status to progress.json in the job directory."""
+        status = self.status()
+        _atomic_write_bytes(os.path.join(self.corpus_dir, PROGRESS_FILENAME), json.dumps(status, indent=2).encode())
+        return status
+
+
+def format_status(status):
+    """Format a job status as a short human readable summary."""
+    lines = [
+        f"samples: {status['samples_done']}/{status['n_samples']} ({100 * status['fraction_done']:.1f}%)",
+        f"units: {status['units_done']}/{status['n_units']} done, {status['units_leased']} in progress, "
+        f"{status['units_stale']} stale",
+        f"throughput: {status['samples_per_second']:.2f} samples/s",
+    ]
+    for owner, worker in sorted(status["workers"].items()):
+        rate = worker["samples"] / worker["seconds"] if worker["seconds"] > 0 else 0.0
+        lines.append(f"  {owner}: {worker['units']} units, {worker['samples']} samples, {rate:.2f} samples/s")
+    lines.append("complete" if status["complete"] else "in progress")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a corpus cooperatively across workers sharing a directory.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Join the job and generate units until none are left.")
+    run.add_argument("corpus_dir")
+    run.add_argument("--n-samples", type=int, help="Target number of samples, required for a new job.")
+    run.add_argument("--resolution", type=int, nargs=3, help="Model resolution, required for a new job.")
+    run.add_argument("--unit-size", type=int, help="Samples per work unit and shard, default 256.")
+    run.add_argument("--seed", type=int, help="Base seed of the corpus, default 0.")
+    run.add_argument("--config", help="Markov matrix configuration of the generator.")
+    run.add_argument("--workers", type=int, help="Local generation processes per unit.")
+    run.add_argument("--lease-timeout", type=float, default=600.0, help="Seconds before a silent lease is stale.")
+
+    status = commands.add_parser("status", help="Print the progress and throughput of a job.")
+    status.add_argument("corpus_dir")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        job = CorpusJob(
+            args.corpus_dir,
+            n_samples=args.n_samples,
+            unit_size=args.unit_size,
+            seed=args.seed,
+            model_resolution=args.resolution,
+            generator_config=args.config,
+            lease_timeout=args.lease_timeout,
+        )
+        job.run(workers=args.workers)
+    else:
+        job = CorpusJob(args.corpus_dir)
+    print(format_status(job.status()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""
+Near-duplicate detection for label volumes and a streaming deduplication pass over corpora.
+
+Each sample is summarized by a `LabelSketch`: the class histogram of a strided subsample of the
+volume, the labels of a coarse grid of voxels, and a MinHash signature of that grid. Signatures are
+banded into a locality-sensitive hash table, so each sample is compared only with the few kept
+samples sharing a band, and a pass over a corpus takes time linear in its size::
+
+    python -m geogen.filemanagement.dedupe corpus_dir deduplicated_dir --max-class-fraction 0.99
+"""
+
+import argparse
+import json
+from collections import defaultdict
+from typing import NamedTuple
+
+import numpy as np
+
+from geogen.filemanagement.corpus import CorpusReader, CorpusWriter
+
+_MERSENNE_PRIME = (1 << 61) - 1
+
+
+class LabelSketch(NamedTuple):
+    """A compact summary of a label volume for near-duplicate detection."""
+
+    histogram: np.ndarray  # Class fractions of a strided subsample of the volume
+    grid: np.ndarray  # Labels of a coarse (gx, gy, gz) grid of voxels
+    signature: np.ndarray  # MinHash signature of the coarse grid
+
+
+def _minhash_coefficients(num_perm, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(1, 2**31, size=(2, num_perm, 1), dtype=np.int64)
+
+
+def label_sketch(labels, num_classes=15, min_val=-1, grid=(8, 8, 8), num_perm=32, histogram_voxels=32**3):
+    """
+    Sketch a label volume.
+
+    Parameters
+    ----------
+    labels : np.ndarray
+        An integer label volume of shape (nx, ny, nz).
+    num_classes : int, optional
+        Number of label classes, from min_val to min_val + num_classes - 1. Default is 15.
+    min_val : int, optional
+        The smallest label value, -1 for air. Default is -1.
+    grid : tuple, optional
+        Number of voxels sampled along each axis for the coarse grid. Default is (8, 8, 8).
+    num_perm : int, optional
+        Length of the MinHash signature. Default is 32.
+    histogram_voxels : int, optional
+        Approximate number of voxels the class histogram is computed from. Default is 32**3.
+
+    Returns
+    -------
+    LabelSketch
+        The sketch of the volume.
+    """
+    labels = np.asarray(labels)
+    stride = max(1, int(round((labels.size / histogram_voxels) ** (1 / 3))))
+    subsample = labels[::stride, ::stride, ::stride].ravel().astype(np.int64) - min_val
+    histogram = np.bincount(subsample, minlength=num_classes)[:num_classes] / subsample.size
+
+    # The voxel at the center of each coarse cell
+    centers = [((np.arange(g) + 0.5) * n / g).astype(np.intp) for g, n in zip(grid, labels.shape)]
+    coarse = labels[np.ix_(*centers)]
+
+    # MinHash of the set of (cell, label) tokens, similar grids share most of their minima
+    tokens = np.arange(coarse.size, dtype=np.int64) * num_classes + (coarse.ravel().astype(np.int64) - min_val)
+    a, b = _minhash_coefficients(num_perm)
+    signature = ((a * tokens + b) % _MERSENNE_PRIME).min(axis=1)
+    return LabelSketch(histogram.astype(np.float32), coarse.astype(np.int8), signature)
+
+
+class DuplicateIndex:
+    """
+    A streaming index of kept samples that reports near-duplicates of new samples.
+
+    A new sample is compared with the kept samples sharing a MinHash band or a history fingerprint.
+    It duplicates one of them when their coarse grids agree on at least `grid_threshold` of the
+    cells and their class histograms differ by at most `histogram_tolerance` in L1 distance.
+
+    Parameters
+    ----------
+    bands : int, optional
+        Number of bands the signature is split into, more bands find less similar candidates.
+        Must divide the signature length. Default is 8.
+    grid_threshold : float, optional
+        Minimum fraction of agreeing coarse grid cells. Default is 0.98.
+    histogram_tolerance : float, optional
+        Maximum L1 distance between class histograms. Default is 0.02.
+    """
+
+    def __init__(self, bands=8, grid_threshold=0.98, histogram_tolerance=0.02):
+        self.bands = bands
+        self.grid_threshold = grid_threshold
+        self.histogram_tolerance = histogram_tolerance
+        self._buckets = defaultdict(list)
+        self._sketches = {}
+
+    def __len__(self):
+        return len(self._sketches)
+
+    def _band_keys(self, sketch):
+        if len(sketch.signature) % self.bands:
+            raise ValueError(f"{self.bands} bands do not divide a signature of length {len(sketch.signature)}.")
+        return [(band, rows.tobytes()) for band, rows in enumerate(np.split(sketch.signature, self.bands))]
+
+    def is_similar(self, a: LabelSketch, b: LabelSketch) -> bool:
+        """Whether two sketches are near-duplicates."""
+        if a.grid.shape != b.grid.shape:
+            return False
+        return (
+            np.mean(a.grid == b.grid) >= self.grid_threshold
+            and np.abs(a.histogram - b.histogram).sum() <= self.histogram_tolerance
+        )
+
+    def find(self, sketch, fingerprint=None):
+        """The key of a kept sample the sketch duplicates, or None."""
+        candidates = [("fingerprint", fingerprint)] if fingerprint is not None else []
+        candidates += self._band_keys(sketch)
+        seen = set()
+        for bucket in candidates:
+            for key in self._buckets.get(bucket, ()):
+                if key not in seen:
+                    seen.add(key)
+                    if self.is_similar(sketch, self._sketches[key]):
+                        return key
+        return None
+
+    def add(self, key, sketch, fingerprint=None):
+        """Keep a sample."""
+        self._sketches[key] = sketch
+        if fingerprint is not None:
+            self._buckets[("fingerprint", fingerprint)].append(key)
+        for bucket in self._band_keys(sketch):
+            self._buckets[bucket].append(key)
+
+
+def deduplicate_corpus(
+    corpus_dir,
+    output_dir,
+    grid=(8, 8, 8),
+    num_perm=32,
+    bands=8,
+    grid_threshold=0.98,
+    histogram_tolerance=0.02,
+    max_class_fraction=None,
+):
+    """
+    Copy a corpus without its near-duplicate and degenerate samples, in a single streaming pass.
+
+    Samples are read in order and the first of a group of near-duplicates is kept. Only the
+    sketches of kept samples are held in memory.
+
+    Parameters
+    ----------
+    corpus_dir : str
+        Directory of the corpus to deduplicate.
+    output_dir : str
+        Directory of the deduplicated corpus, with the same resolution and shard size.
+    grid, num_perm :
+        Sketch settings, see `label_sketch`.
+    bands, grid_threshold, histogram_tolerance :
+        Duplicate criteria, see `DuplicateIndex`.
+    max_class_fraction : float, optional
+        Also remove samples with a single class covering more than this fraction of the volume,
+        such as all basement views. Default is None to keep them.
+
+    Returns
+    -------
+    dict
+        The numbers of 'kept' samples, and the 'removed' samples as dictionaries of their 'index',
+        the 'reason' ('duplicate' or 'degenerate') and the index of the kept sample they duplicate.
+    """
+    reader = CorpusReader(corpus_dir)
+    index = DuplicateIndex(bands=bands, grid_threshold=grid_threshold, histogram_tolerance=histogram_tolerance)
+    removed = []
+    with CorpusWriter(
+        output_dir,
+        reader.resolution,
+        shard_size=reader.shard_size,
+        num_classes=reader.num_classes,
+        min_val=reader.min_val,
+    ) as writer:
+        for i in range(len(reader)):
+            labels = reader[i]
+            metadata = reader.get_metadata(i)
+            if max_class_fraction is not None:
+                class_counts = np.asarray(metadata["class_counts"])
+                if class_counts.max() > max_class_fraction * class_counts.sum():
+                    removed.append({"index": i, "reason": "degenerate", "duplicate_of": None})
+                    continue
+
+            sketch = label_sketch(labels, reader.num_classes, reader.min_val, grid=grid, num_perm=num_perm)
+            fingerprint = metadata.get("fingerprint")
+            original = index.find(sketch, fingerprint)
+            if original is not None:
+                removed.append({"index": i, "reason": "duplicate", "duplicate_of": original})
+                continue
+            index.add(i, sketch, fingerprint)
+            writer.add(labels, seed=metadata["seed"], history=metadata["history"], fingerprint=fingerprint)
+    return {"kept": len(index), "removed": removed}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Copy a corpus without its near-duplicate samples.")
+    parser.add_argument("corpus_dir", help="Directory of the corpus.")
+    parser.add_argument("output_dir", help="Directory of the deduplicated corpus.")
+    parser.add_argument("--grid-threshold", type=float, default=0.98, help="Agreeing coarse grid fraction.")
+    parser.add_argument("--histogram-tolerance", type=float, default=0.02, help="Class histogram L1 distance.")
+    parser.add_argument("--max-class-fraction", type=float, help="Remove samples dominated by one class.")
+    parser.add_argument("--report", help="Write the list of removed samples as JSON to this path.")
+    args = parser.parse_args(argv)
+
+    report = deduplicate_corpus(
+        args.corpus_dir,
+        args.output_dir,
+        grid_threshold=args.grid_threshold,
+        histogram_tolerance=args.histogram_tolerance,
+        max_class_fraction=args.max_class_fraction,
+    )
+    n_degenerate = sum(sample["reason"] == "degenerate" for sample in report["removed"])
+    print(
+        f"Kept {report['kept']} samples, removed {len(report['removed']) - n_degenerate} duplicates "
+        f"and {n_degenerate} degenerate samples."
+    )
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
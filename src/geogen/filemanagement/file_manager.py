@@ -1,7 +1,12 @@
 import os
 import pickle as pickle
+import uuid
 
-from geogen.model import GeoModel
+from geogen.model import MODEL_FILE_SUFFIX, GeoModel, load_model, load_model_spec, save_model
+
+_PICKLE_SUFFIX = ".pkl"
+_MODEL_SUFFIXES = (_PICKLE_SUFFIX, MODEL_FILE_SUFFIX)
+_CLAIM_SUFFIX = ".claim"  # Hidden marker reserving the index of a model file being written
 
 
 class FileManager:
@@ -16,29 +21,71 @@ class FileManager:
         The directory where models are saved and loaded. Default is '../saved_models'.
     auto_index : bool, optional
         Automatically manage file naming and indexing if True. Default is True.
+    file_format : str, optional
+        Format of saved models, 'pickle' for '.pkl' files or 'geoz' for the versioned model format
+        of `geogen.model.save_model`, which loads without unpickling and survives class changes.
+        Both formats are always loaded. Default is 'pickle'.
     """
 
-    def __init__(self, base_dir="../saved_models", auto_index=True):
+    def __init__(self, base_dir="../saved_models", auto_index=True, file_format="pickle"):
+        if file_format not in ("pickle", "geoz"):
+            raise ValueError(f"Unknown file format '{file_format}', expected 'pickle' or 'geoz'.")
         self.base_dir = base_dir
         self.file_index = None
         self.auto_index = auto_index
-
-    def _get_initial_file_index(self, sequential=True):
-        """Determine the starting file index based on existing files in the directory."""
-        if not os.path.exists(self.base_dir):
-            os.makedirs(self.base_dir)
+        self.file_format = file_format
+
+    @property
+    def suffix(self):
+        """The file suffix of saved models."""
+        return MODEL_FILE_SUFFIX if self.file_format == "geoz" else _PICKLE_SUFFIX
+
+    def _get_initial_file_index(self, save_dir=None):
+        """Determine the starting file index based on existing and claimed files in the directory."""
+        save_dir = save_dir if save_dir is not None else self.base_dir
+        if not os.path.exists(save_dir):
+            os.makedirs(save_dir, exist_ok=True)
             return 0
-        existing_files = [f for f in os.listdir(self.base_dir) if f.endswith(".pkl")]
+        existing_files = [f for f in os.listdir(save_dir) if f.endswith(_MODEL_SUFFIXES + (_CLAIM_SUFFIX,))]
         if not existing_files:
             return 0
-        # Extract indexes from file names assuming the format 'model_<index>.pkl'
+        # Extract indexes from file names assuming the format 'model_<index>.pkl' or '.geoz', and
+        # '.model_<index>.pkl.claim' for files being written
         indexes = [int(f.split("_")[-1].split(".")[0]) for f in existing_files]
         return max(indexes) + 1 if indexes else 0
 
+    def _claim_indexed_path(self, save_dir):
+        """
+        Reserve the next free indexed file path by exclusively creating a hidden claim file for it.
+
+        Exclusive creation is atomic, also on NFS, so concurrent writers sharing a directory never
+        pick the same index. The claim is removed only after the model file is renamed into place,
+        so readers never see an empty model file.
+
+        Returns
+        -------
+        tuple of (str, str)
+            The model file path and its claim file path.
+        """
+        self.file_index = self._get_initial_file_index(save_dir)
+        while True:
+            name = self._file_save_string(self.file_index)
+            file_path = os.path.join(save_dir, name)
+            claim_path = os.path.join(save_dir, f".{name}{_CLAIM_SUFFIX}")
+            self.file_index += 1
+            try:
+                os.close(os.open(claim_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            except FileExistsError:
+                continue
+            if not os.path.exists(file_path):
+                return file_path, claim_path
+            # Written by another writer that already removed its claim
+            os.remove(claim_path)
+
     def _file_save_string(self, model_index):
         """Format for saving model files."""
 
-        return f"model_{model_index}.pkl"
+        return f"model_{model_index}{self.suffix}"
 
     def save_geo_model(self, geo_model, save_dir, filename=None, lean=True):
         """
@@ -50,7 +97,8 @@ class FileManager:
             The GeoModel instance to be saved.
         lean : bool
             Determines the mode of saving the model. If True, the model is saved without the 'data' attribute,
-            including only essential serialized parameters such as history and bounds.
+            including only essential serialized parameters such as history and bounds. In the 'geoz' format
+            the model itself is left unchanged.
 
         Notes
         -----
@@ -64,25 +112,36 @@ class FileManager:
         >>> my_geo_model = GeoModel()
         >>> save_geo_model(my_geo_model, lean=True)
         """
-        if lean:
+        if lean and self.file_format == "pickle":
             # Implement clear_data if needed to remove unnecessary large data
             geo_model.clear_data()
 
+        claim_path = None
         if self.auto_index:
-            self.file_index = self._get_initial_file_index()
-            file_path = os.path.join(save_dir, self._file_save_string(self.file_index))
-            self.file_index += 1
+            file_path, claim_path = self._claim_indexed_path(save_dir)
         else:
             if filename is None:
                 raise ValueError("Filename must be provided if auto_index saving is disabled.")
             else:
-                file_path = os.path.join(save_dir, filename + ".pkl")
+                file_path = os.path.join(save_dir, filename + self.suffix)
 
-        with open(file_path, "wb") as file:
-            pickle.dump(geo_model, file)
+        # Write aside and rename into place, so a model file is never seen half written
+        tmp_path = f"{file_path}.{uuid.uuid4().hex}.tmp"
+        try:
+            if self.file_format == "geoz":
+                save_model(geo_model, tmp_path, data=not lean)
+            else:
+                with open(tmp_path, "wb") as file:
+                    pickle.dump(geo_model, file)
+            os.replace(tmp_path, file_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            if claim_path is not None:
+                os.remove(claim_path)
         print(f"Model saved to {file_path}")
 
-    def load_geo_model(self, file_path):
+    def load_geo_model(self, file_path, data=True):
         """
         Load a GeoModel instance from a file.
 
@@ -90,16 +149,36 @@ class FileManager:
         ----------
         file_path : str
             The path to the file from which the GeoModel will be loaded.
+        data : bool, optional
+            For '.geoz' files, whether to load the stored model data. Default is True.
 
         Returns
         -------
         GeoModel
             The loaded GeoModel instance.
         """
+        if file_path.endswith(MODEL_FILE_SUFFIX):
+            return load_model(file_path, data=data)
         with open(file_path, "rb") as file:
             model = pickle.load(file)
         return model
 
+    def load_model_spec(self, file_path):
+        """
+        Read the settings and history spec of a '.geoz' model file without its data, for fast scans.
+
+        Parameters
+        ----------
+        file_path : str
+            The path to the model file.
+
+        Returns
+        -------
+        dict
+            The model spec, see `geogen.model.serialization.model_to_spec`.
+        """
+        return load_model_spec(file_path)
+
     def save_all_models(self, models, lean=True):
         """
         Saves a list of GeoModel instances.
@@ -125,7 +204,7 @@ class FileManager:
         """
         print(f"Processing models in {self.base_dir}")
         for root, dirs, files in os.walk(self.base_dir):
-            file_list = [os.path.join(root, file) for file in files if file.endswith(".pkl")]
+            file_list = [os.path.join(root, file) for file in files if file.endswith(_MODEL_SUFFIXES)]
             if self.auto_index:
                 file_list.sort(
                     key=lambda x: (
@@ -1,5 +1,9 @@
 from geogen.generation.categorical_events import *
 
+from .batch import close_batch_pools, generate_batch
 from .geohistgen import *
 from .geowords import *
+from .markov_sampler import MarkovSequenceSampler
 from .model_generators import MarkovGeostoryGenerator
+from .parallel import GeneratorPool
+from .profiling import WordProfile, default_profile_words, profile_geowords, profile_json, profile_table
@@ -0,0 +1,124 @@
+""" Framework-agnostic batched generation of label volumes into preallocated NumPy arrays. """
+
+import atexit
+
+import numpy as np
+
+from geogen.generation.model_generators import MarkovGeostoryGenerator
+from geogen.model import GeoModel
+from geogen.probability import derive_seed
+
+# The settings and generator of the latest batch, kept with its persistent process pool
+_latest = None
+
+
+def _get_generator(bounds, resolution, config):
+    """The generator of the latest batch if the settings match, else a new one replacing it."""
+    global _latest
+    key = (tuple(tuple(float(b) for b in axis) for axis in bounds), resolution, None if config is None else str(config))
+    if _latest is None or _latest[0] != key:
+        close_batch_pools()  # Only the pool of the latest settings is kept
+        generator = MarkovGeostoryGenerator(
+            model_bounds=bounds, model_resolution=resolution, config=config, label_dtype=np.int8
+        )
+        _latest = (key, generator)
+    return _latest[1]
+
+
+def close_batch_pools():
+    """Shut down the process pool kept alive by `generate_batch` calls with workers, also done at exit."""
+    if _latest is not None:
+        _latest[1].close_pool()
+
+
+atexit.register(close_batch_pools)
+
+
+def generate_batch(
+    n,
+    bounds=((-3840, 3840), (-3840, 3840), (-1920, 1920)),
+    resolution=(256, 256, 128),
+    seed=None,
+    out=None,
+    return_metadata=False,
+    config=None,
+    workers=None,
+    num_classes=15,
+    min_val=-1,
+):
+    """
+    Generate a batch of geological models as int8 label volumes, written in place into one array.
+
+    Only NumPy is used, so the batch can be handed to PyTorch, JAX or any other pipeline without
+    conversion (e.g. `torch.from_numpy` or `jax.numpy.asarray`). Reusing the same `out` array for
+    every batch avoids all per-sample allocation of the output. Sequentially, one GeoModel is
+    computed into for the whole batch. With workers, the process pool is kept alive between calls
+    with the same settings and samples are copied from shared memory straight into `out`. A call
+    with other bounds, resolution or config closes it, see `close_batch_pools`.
+
+    Parameters
+    ----------
+    n : int
+        Number of models in the batch.
+    bounds : tuple, optional
+        Bounds of the models as ((xmin, xmax), (ymin, ymax), (zmin, zmax)).
+    resolution : tuple, optional
+        Resolution of the models as (x_res, y_res, z_res). Default is (256, 256, 128).
+    seed : int, optional
+        Base seed of the batch, sample i is generated from `derive_seed(seed, i)`. Fresh entropy is
+        used if not provided.
+    out : np.ndarray, optional
+        A C-contiguous int8 array of shape (n, X, Y, Z) to fill. A new array is allocated if None.
+    return_metadata : bool, optional
+        Also return a metadata dictionary of the batch. Default is False.
+    config : str, optional
+        A path to a Markov matrix configuration file for the generator.
+    workers : int, optional
+        If given, generate on a process pool with this many workers.
+    num_classes : int, optional
+        Number of classes in the class histograms of the metadata. Default is 15.
+    min_val : int, optional
+        The smallest label value, usually the air value -1. Default is -1.
+
+    Returns
+    -------
+    np.ndarray or tuple of (np.ndarray, dict)
+        The filled (n, X, Y, Z) int8 label array with air as -1 and, if return_metadata is True, a
+        dictionary with the 'seeds' (n,) uint64 array, the 'histories' list of history strings and
+        the 'class_counts' (n, num_classes) voxel count array of each sample.
+    """
+    resolution = tuple(int(r) for r in resolution)
+    shape = (n, *resolution)
+    if out is None:
+        out = np.empty(shape, dtype=np.int8)
+    elif out.shape != shape or out.dtype != np.int8 or not out.flags.c_contiguous:
+        raise ValueError(f"Expected a C-contiguous int8 array of shape {shape}, got {out.dtype} {out.shape}.")
+
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    seeds = [derive_seed(seed, i) for i in range(n)]
+    histories = []
+
+    generator = _get_generator(bounds, resolution, config)
+    if workers:
+        for _, metadata in generator.stream_models(n, workers, seeds=seeds, out=out):
+            histories.append(metadata["history"])
+    else:
+        model = GeoModel(bounds=generator.model_bounds, resolution=resolution, label_dtype=np.int8)
+        for i, sample_seed in enumerate(seeds):
+            generator.generate_model(seed=sample_seed, model=model)
+            out[i] = model.data.reshape(resolution)
+            histories.append(model.get_history_string())
+
+    if not return_metadata:
+        return out
+
+    class_counts = np.stack(
+        [np.bincount(sample.ravel().astype(np.int64) - min_val, minlength=num_classes) for sample in out]
+    )
+    metadata = {
+        "seeds": np.array(seeds, dtype=np.uint64),
+        "histories": histories,
+        "class_counts": class_counts,
+    }
+    return out, metadata
@@ -39,22 +39,33 @@ class GeoWord(_ABC):
     or terminate with one or more defined `GeoProcess` instances.
 
 
+    All random variables of a word are drawn from its own generator. Sub-words added through
+    `add_process` draw from the parent's generator, so a whole history is reproducible from
+    the seed of the top level word.
+
+    Many instances of a word can be generated at once with `generate_population`. Words that
+    implement `sample_population_parameters` draw the random variables of all instances with
+    vectorized calls and build each instance from its parameters with `build_from_parameters`.
+    Their `build_history` draws the parameters of a single instance with the same sampler, see
+    `sample_parameters`, so there is one code path per word.
+
     Parameters
     ----------
-    seed : Optional[int]
-        An optional seed for the random number generator, ensuring reproducibility.
+    seed : Optional[int | np.random.SeedSequence | np.random.Generator]
+        An optional seed for the random number generator, ensuring reproducibility. A Generator
+        is used directly and shares its stream with the caller.
 
     Attributes
     ----------
     hist : List[Union[geo.GeoProcess, GeoWord]]
         A list of geological processes forming the history of the GeoWord, to be randomly sampled.
-    seed : Optional[int]
+    seed : Optional[int | np.random.SeedSequence | np.random.Generator]
         The seed for the random number generator, ensuring reproducibility.
     rng : np.random.Generator
         The random number generator used to sample random variables.
     """
 
-    def __init__(self, seed: int = None):
+    def __init__(self, seed=None):
         self.hist = []
         self.seed = seed
         self.rng = np.random.default_rng(seed)
@@ -69,6 +80,83 @@ class GeoWord(_ABC):
         """
         pass
 
+    @classmethod
+    def sample_population_parameters(cls, n, rng):
+        """
+        Draw the random variables of n instances of the word at once.
+
+        Parameters
+        ----------
+        n : int
+            Number of instances.
+        rng : np.random.Generator
+            Random number generator.
+
+        Returns
+        -------
+        dict or None
+            The parameters as a struct of arrays, each entry holding one value per instance. None
+            for words without a vectorized sampler, which are generated one by one.
+        """
+        return None
+
+    @staticmethod
+    def _instance_parameters(params, i):
+        """The parameters of instance i, with NumPy scalars as Python numbers."""
+        instance = {}
+        for key, values in params.items():
+            value = values[i]
+            instance[key] = value.item() if isinstance(value, np.generic) else value
+        return instance
+
+    def sample_parameters(self):
+        """Draw the random variables of this instance from its generator with the population sampler."""
+        params = type(self).sample_population_parameters(1, self.rng)
+        return None if params is None else self._instance_parameters(params, 0)
+
+    def build_from_parameters(self, params):
+        """
+        Build the history of one instance from its entry of `sample_population_parameters`.
+
+        Words with a vectorized sampler override this method. The default is for words without
+        one, which get no parameters and build their history with `build_history`.
+        """
+        if params is not None:
+            raise TypeError(f"{self.__class__.__name__} builds its history without sampled parameters.")
+        self.build_history()
+
+    @classmethod
+    def generate_population(cls, n, seed=None):
+        """
+        Generate the histories of n independent instances of the word.
+
+        Parameters
+        ----------
+        n : int
+            Number of instances.
+        seed : Optional[int | np.random.SeedSequence | np.random.Generator]
+            Seed for all instances of the population.
+
+        Returns
+        -------
+        list of geo.CompoundProcess
+            One sampled history snippet per instance.
+        """
+        rng = np.random.default_rng(seed)
+        # Subclasses must define their own sampler, an inherited one samples the wrong word
+        params = cls.sample_population_parameters(n, rng) if "sample_population_parameters" in cls.__dict__ else None
+
+        population = []
+        for i in range(n):
+            word = cls(seed=rng)
+            word.hist.clear()
+            if params is None:
+                word.build_history()
+            else:
+                word.build_from_parameters(cls._instance_parameters(params, i))
+            population.append(geo.CompoundProcess(word.hist.copy(), name=cls.__name__))
+        return population
+
     def generate(self):
         """
         Generates the geological history by building and compiling it into a CompoundProcess.
@@ -92,7 +180,8 @@ class GeoWord(_ABC):
 
         This method supports adding individual `GeoProcess` or `GeoWord` instances, as well as lists of them.
         Items are added in chronological order from earliest to latest event. Recursive calls to other GeoWords
-        are supported by calling their own generate methods to build their sub-histories.
+        are supported by calling their own generate methods to build their sub-histories. Sub-words sample
+        from this word's random number generator.
 
         Parameters
         ----------
@@ -105,6 +194,7 @@ class GeoWord(_ABC):
             If the item is not a `GeoProcess`, `GeoWord`, or a list of these.
         """
         if isinstance(item, GeoWord):
+            item.rng = self.rng
             self.hist.extend(item.generate().history)
         elif isinstance(item, geo.GeoProcess):
             self.hist.append(item)
@@ -148,21 +238,34 @@ class InfiniteSedimentUniform(GeoWord):  # Validated
     """
 
     def build_history(self):
+        self.build_from_parameters(self.sample_parameters())
+
+    @classmethod
+    def sample_population_parameters(cls, n, rng):
         # Choose a large depth that runs beyond the model's height extension bars
         depth = (Z_RANGE) * (3 * geo.GeoModel.HEIGHT_BAR_EXT_FACTOR)  # Pseudo-infinite using a large depth
-        sediment_base = -depth  # The sediment base is located so that it builds back up to z=0
-
-        # calculate layer thicknesses to fill the depth of sediment
-        vals = []
-        thicks = []
-        while depth > 0:
-            vals.append(self.rng.choice(SEDIMENT_VALS))
-            thicks.append(self.rng.uniform(50, Z_RANGE / 4))
-            depth -= thicks[-1]
 
+        # Add one layer at a time to the instances that are not filled yet, until the full depth
+        vals = [[] for _ in range(n)]
+        thicks = [[] for _ in range(n)]
+        filled = np.zeros(n)
+        active = np.arange(n)
+        while active.size:
+            layer_vals = rng.choice(SEDIMENT_VALS, size=active.size)
+            layer_thicks = rng.uniform(50, Z_RANGE / 4, size=active.size)
+            for i, val, thick in zip(active, layer_vals.tolist(), layer_thicks.tolist()):
+                vals[i].append(val)
+                thicks[i].append(thick)
+            filled[active] += layer_thicks
+            active = active[filled[active] < depth]
+        return {"vals": vals, "thicks": thicks}
+
+    def build_from_parameters(self, params):
+        # The sediment base is located so that it builds back up to z=0
+        sediment_base = -(Z_RANGE) * (3 * geo.GeoModel.HEIGHT_BAR_EXT_FACTOR)
         # Bedrock ensures full coverage underneath sediment in all cases
         self.add_process(geo.Bedrock(base=sediment_base, value=BED_ROCK_VAL))
-        self.add_process(geo.Sedimentation(vals, thicks, base=sediment_base))
+        self.add_process(geo.Sedimentation(list(params["vals"]), list(params["thicks"]), base=sediment_base))
 
 
 class InfiniteSedimentMarkov(GeoWord):  # Validated
@@ -192,22 +295,32 @@ class InfiniteSedimentMarkov(GeoWord):  # Validated
     """
 
     def build_history(self):
+        self.build_from_parameters(self.sample_parameters())
+
+    @classmethod
+    def sample_population_parameters(cls, n, rng):
+        return {
+            "thickness_variance": rng.uniform(0.1, 0.6, n),
+            "dirichlet_alpha": rng.uniform(0.6, 1.2, n),
+        }
+
+    def build_from_parameters(self, params):
         # Caution, the depth needs to extend beyond the bottom of the model mesh,
         # Including height bar extensions for height tracking, or it will leave a gap underneath
         depth = (Z_RANGE) * (3 * geo.GeoModel.HEIGHT_BAR_EXT_FACTOR)
         sediment_base = -depth
 
         # Get a markov process for selecting next layer type, gaussian differencing for thickness
-        # Explanation can be found in the helper class
+        # Explanation can be found in the helper class. The layer sequence itself is a sequential
+        # Markov process, drawn per instance
         markov_helper = MarkovSedimentHelper(
             categories=SEDIMENT_VALS,
             rng=self.rng,
             thickness_bounds=(200, Z_RANGE / 4),
-            thickness_variance=self.rng.uniform(0.1, 0.6),
-            dirichlet_alpha=self.rng.uniform(0.6, 1.2),
+            thickness_variance=params["thickness_variance"],
+            dirichlet_alpha=params["dirichlet_alpha"],
             anticorrelation_factor=0.05,
         )
-
         vals, thicks = markov_helper.generate_sediment_layers(total_depth=depth)
 
         # Bedrock ensures full coverage underneath sediment in all cases
@@ -241,6 +354,18 @@ class InfiniteSedimentTilted(GeoWord):  # Validated
     """
 
     def build_history(self):
+        self.build_from_parameters(self.sample_parameters())
+
+    @classmethod
+    def sample_population_parameters(cls, n, rng):
+        return {
+            "thickness_variance": rng.uniform(0.1, 0.6, n),  # Variance in layer thickness
+            "dirichlet_alpha": rng.uniform(0.6, 1.2, n),  # Parameter controlling repeatability of layers
+            "strike": rng.uniform(0, 360, n),  # Random strike direction
+            "dip": rng.normal(0, 10, n),  # Tilt angle sampled from a normal distribution
+        }
+
+    def build_from_parameters(self, params):
         # Sediment parameters
         depth = (Z_RANGE) * (
             3 * geo.GeoModel.HEIGHT_BAR_EXT_FACTOR
@@ -249,28 +374,22 @@ class InfiniteSedimentTilted(GeoWord):  # Validated
 
         minimum_layer_thickness = 200  # Minimum thickness for sediment layers (meters)
         maximum_layer_thickness = Z_RANGE / 4  # Maximum thickness for sediment layers (based on Z_RANGE)
-        thickness_variance = self.rng.uniform(0.1, 0.6)  # Variance in layer thickness
-        dirichlet_alpha = self.rng.uniform(0.6, 1.2)  # Parameter controlling repeatability of layers
         anticorrelation_factor = 0.05  # Bias to prevent successive layers from being too similar
 
-        # Tilt parameters
-        strike = self.rng.uniform(0, 360)  # Random strike direction
-        dip = self.rng.normal(0, 10)  # Tilt angle sampled from a normal distribution
-
         # Generate sediment layers using a Markov process
         markov_helper = MarkovSedimentHelper(
             categories=SEDIMENT_VALS,
             rng=self.rng,
             thickness_bounds=(minimum_layer_thickness, maximum_layer_thickness),
-            thickness_variance=thickness_variance,
-            dirichlet_alpha=dirichlet_alpha,
+            thickness_variance=params["thickness_variance"],
+            dirichlet_alpha=params["dirichlet_alpha"],
             anticorrelation_factor=anticorrelation_factor,
         )
         vals, thicks = markov_helper.generate_sediment_layers(total_depth=depth)
 
         # Sediment process
         sed = geo.Sedimentation(vals, thicks, base=sediment_base)
-        tilt = geo.Tilt(strike=strike, dip=dip, origin=geo.BacktrackedPoint((0, 0, 0)))
+        tilt = geo.Tilt(strike=params["strike"], dip=params["dip"], origin=geo.BacktrackedPoint((0, 0, 0)))
 
         # Erosion process: truncating sediment at the base
         unc = geo.UnconformityBase(1000)  # Unconformity cuts off sediment above a base level
@@ -311,34 +430,30 @@ class FineRepeatSediment(GeoWord):  # Validated
     """
 
     def build_history(self):
-        # Random variables with detailed annotations
-        # Log-normal depth, with a mean and standard deviation designed for sedimentation layers
-        depth = self.rng.lognormal(
-            *rv.log_normal_params(mean=MEAN_SEDIMENTATION_DEPTH, std_dev=MEAN_SEDIMENTATION_DEPTH / 3)
-        )
-        # Markov helper random parameters
-        minimum_layer_thickness = 100  # Minimum thickness for sediment layers (meters)
-        maximum_layer_thickness = 400  # Maximum thickness for sediment layers
-        thickness_variance = self.rng.uniform(
-            0.1, 0.3
-        )  # Range for sediment layer thickness variance in a set
-        dirichlet_alpha = self.rng.uniform(
-            0.6, 2.0
-        )  # Dirichlet distribution parameter for layer transitions
-        anticorrelation_factor = 0.05  # Fixed anticorrelation factor
+        self.build_from_parameters(self.sample_parameters())
+
+    @classmethod
+    def sample_population_parameters(cls, n, rng):
+        return {
+            # Log-normal depth, with a mean and standard deviation designed for sedimentation layers
+            "depth": rng.lognormal(
+                *rv.log_normal_params(mean=MEAN_SEDIMENTATION_DEPTH, std_dev=MEAN_SEDIMENTATION_DEPTH / 3), size=n
+            ),
+            "thickness_variance": rng.uniform(0.1, 0.3, n),  # Range for sediment layer thickness variance in a set
+            "dirichlet_alpha": rng.uniform(0.6, 2.0, n),  # Dirichlet distribution parameter for layer transitions
+        }
 
+    def build_from_parameters(self, params):
         # Get a markov process for selecting next layer type, gaussian differencing for thickness
         markov_helper = MarkovSedimentHelper(
             categories=SEDIMENT_VALS,
             rng=self.rng,
-            thickness_bounds=(minimum_layer_thickness, maximum_layer_thickness),
-            thickness_variance=thickness_variance,
-            dirichlet_alpha=dirichlet_alpha,
-            anticorrelation_factor=anticorrelation_factor,
+            thickness_bounds=(100, 400),  # Minimum and maximum thickness for sediment layers (meters)
+            thickness_variance=params["thickness_variance"],
+            dirichlet_alpha=params["dirichlet_alpha"],
+            anticorrelation_factor=0.05,  # Fixed anticorrelation factor
         )
-
-        vals, thicks = markov_helper.generate_sediment_layers(total_depth=depth)
-
+        vals, thicks = markov_helper.generate_sediment_layers(total_depth=params["depth"])
         self.add_process(geo.Sedimentation(vals, thicks))
 
 
@@ -368,24 +483,29 @@ class CoarseRepeatSediment(GeoWord):  # Validated
     """
 
     def build_history(self):
-        # Get a log-normal depth for the sediment block
-        depth = self.rng.lognormal(
-            # This helper calculates the required parameters to hit target mean and std for distro
-            *rv.log_normal_params(mean=MEAN_SEDIMENTATION_DEPTH, std_dev=MEAN_SEDIMENTATION_DEPTH / 3)
-        )
+        self.build_from_parameters(self.sample_parameters())
+
+    @classmethod
+    def sample_population_parameters(cls, n, rng):
+        return {
+            "depth": rng.lognormal(
+                *rv.log_normal_params(mean=MEAN_SEDIMENTATION_DEPTH, std_dev=MEAN_SEDIMENTATION_DEPTH / 3), size=n
+            ),
+            "thickness_variance": rng.uniform(0.1, 0.2, n),
+            "dirichlet_alpha": rng.uniform(0.8, 1.2, n),  # Low alpha for high repeatability
+        }
 
+    def build_from_parameters(self, params):
         # Get a markov process for selecting next layer type, gaussian differencing for thickness
         markov_helper = MarkovSedimentHelper(
             categories=SEDIMENT_VALS,
             rng=self.rng,
             thickness_bounds=(Z_RANGE / 12, Z_RANGE / 6),
-            thickness_variance=self.rng.uniform(0.1, 0.2),
-            dirichlet_alpha=self.rng.uniform(0.8, 1.2),  # Low alpha for high repeatability
+            thickness_variance=params["thickness_variance"],
+            dirichlet_alpha=params["dirichlet_alpha"],
             anticorrelation_factor=0.05,  # Low factor gives low repeatability
         )
-
-        vals, thicks = markov_helper.generate_sediment_layers(total_depth=depth)
-
+        vals, thicks = markov_helper.generate_sediment_layers(total_depth=params["depth"])
         self.add_process(geo.Sedimentation(vals, thicks))
 
 
@@ -400,12 +520,17 @@ class SingleRandSediment(GeoWord):
     """
 
     def build_history(self):
-        val = self.rng.choice(SEDIMENT_VALS)
-        sediment = geo.Sedimentation(
-            [val],
-            [self.rng.normal(MEAN_SEDIMENTATION_DEPTH, MEAN_SEDIMENTATION_DEPTH / 3)],
-        )
-        self.add_process(sediment)
+        self.build_from_parameters(self.sample_parameters())
+
+    @classmethod
+    def sample_population_parameters(cls, n, rng):
+        return {
+            "value": rng.choice(SEDIMENT_VALS, size=n),
+            "thickness": rng.normal(MEAN_SEDIMENTATION_DEPTH, MEAN_SEDIMENTATION_DEPTH / 3, n),
+        }
+
+    def build_from_parameters(self, params):
+        self.add_process(geo.Sedimentation([params["value"]], [params["thickness"]]))
 
 
 """ Erosion events"""
@@ -430,12 +555,16 @@ class _BaseErosionWord(GeoWord):  # Validated
     def __init__(self, seed=None):
         super().__init__(seed)
 
-    def calculate_depth(self):
-        erosion_factor = self.rng.lognormal(
-            *rv.log_normal_params(mean=1, std_dev=0.5)
-        )  # Generally between .25 and 2.5
+    @classmethod
+    def sample_depths(cls, n, rng):
+        """Draw n erosion depths at once."""
+        # Generally between .25 and 2.5
+        erosion_factor = rng.lognormal(*rv.log_normal_params(mean=1, std_dev=0.5), size=n)
         erosion_factor = np.clip(erosion_factor, 0.25, 3)
-        return erosion_factor * self.MEAN_DEPTH
+        return erosion_factor * cls.MEAN_DEPTH
+
+    def calculate_depth(self):
+        return self.sample_depths(1, self.rng)[0].item()
 
 
 class FlatUnconformity(_BaseErosionWord):  # Validated
@@ -454,9 +583,14 @@ class FlatUnconformity(_BaseErosionWord):  # Validated
     """
 
     def build_history(self):
-        total_depth = self.calculate_depth()
-        unconformity = geo.UnconformityDepth(total_depth)
-        self.add_process(unconformity)
+        self.build_from_parameters(self.sample_parameters())
+
+    @classmethod
+    def sample_population_parameters(cls, n, rng):
+        return {"total_depth": cls.sample_depths(n, rng)}
+
+    def build_from_parameters(self, params):
+        self.add_process(geo.UnconformityDepth(params["total_depth"]))
 
 
 class TiltedUnconformity(_BaseErosionWord):  # Validated
@@ -481,12 +615,12 @@ class TiltedUnconformity(_BaseErosionWord):  # Validated
     def build_history(self):
         num_tilts = self.rng.integers(1, 4)
         total_depth = self.calculate_depth()
-        depths = np.random.dirichlet(alpha=[1] * num_tilts) * total_depth
+        depths = self.rng.dirichlet(alpha=[1] * num_tilts) * total_depth
 
         for depth in depths:
             strike = self.rng.uniform(0, 360)
             dip = self.rng.normal(0, 3)
-            x, y, z = rv.random_point_in_ellipsoid(MAX_BOUNDS)
+            x, y, z = rv.random_point_in_ellipsoid(MAX_BOUNDS, rng=self.rng)
             origin = geo.BacktrackedPoint((x, y, 0))
             tilt_in = geo.Tilt(strike=strike, dip=dip, origin=origin)
             tilt_out = geo.Tilt(strike=strike, dip=-dip, origin=origin)
@@ -534,11 +668,11 @@ class WaveUnconformity(_BaseErosionWord):
         self.add_process([fold_in1, fold_in2, unconformity, fold_out2, fold_out1])
 
     def get_fold_pair(self, strike, dip):
-        wave_generator = FourierWaveGenerator(num_harmonics=np.random.randint(3, 5), smoothness=1)
+        wave_generator = FourierWaveGenerator(num_harmonics=self.rng.integers(3, 5), smoothness=1, rng=self.rng)
         period = self.rng.uniform(0.5, 2) * X_RANGE
         min_amp = period * 0.001
         max_amp = period * 0.04
-        amp = rv.beta_min_max(a=1.5, b=1.5, min_val=min_amp, max_val=max_amp)
+        amp = rv.beta_min_max(a=1.5, b=1.5, min_val=min_amp, max_val=max_amp, rng=self.rng)
         fold_params = {
             "strike": strike,
             "dip": dip,  # average of dike dip and 90
@@ -614,7 +748,7 @@ class DikePlaneWord(GeoWord):  # Validated
         The wobble and elliptical tapering are multiplicatively combined to shape the dike.
         """
         # Make a fourier based modifier for both x and y
-        fourier = rv.FourierWaveGenerator(num_harmonics=4, smoothness=1)
+        fourier = FourierWaveGenerator(num_harmonics=4, smoothness=1, rng=self.rng)
         x_var = fourier.generate()
         y_var = fourier.generate()
         amp = self.rng.uniform(0.1, 0.2) * wobble_factor  # unevenness of the dike thickness
@@ -623,22 +757,31 @@ class DikePlaneWord(GeoWord):  # Validated
         return self.OrganicDikeThicknessFunc(length, expo, amp, x_var, y_var)
 
     def build_history(self):
-        width = rv.beta_min_max(2, 4, 50, 500)
-        length = rv.beta_min_max(2, 2, 300, 16000)
-        origin = rv.random_point_in_ellipsoid(MAX_BOUNDS)
-        back_origin = geo.BacktrackedPoint(origin)  # Use a backtracked point to ensure origin is in view
-        dike_params = {
-            "strike": self.rng.uniform(0, 360),
-            "dip": self.rng.normal(90, 10),  # Bias towards vertical dikes
-            "origin": back_origin,
-            "width": width,
-            "value": self.rng.choice(DIKE_VALS),
-            "thickness_func": self.get_organic_thickness_func(
-                length, wobble_factor=self.rng.uniform(0.5, 1.5)
-            ),
+        self.build_from_parameters(self.sample_parameters())
+
+    @classmethod
+    def sample_population_parameters(cls, n, rng):
+        return {
+            "width": rv.beta_min_max(2, 4, 50, 500, rng=rng, size=n),
+            "length": rv.beta_min_max(2, 2, 300, 16000, rng=rng, size=n),
+            "origin": np.column_stack(rv.random_point_in_ellipsoid(MAX_BOUNDS, rng=rng, size=n)),
+            "strike": rng.uniform(0, 360, n),
+            "dip": rng.normal(90, 10, n),  # Bias towards vertical dikes
+            "value": rng.choice(DIKE_VALS, size=n),
+            "wobble_factor": rng.uniform(0.5, 1.5, n),
         }
-        dike = geo.DikePlane(**dike_params)
 
+    def build_from_parameters(self, params):
+        # The Fourier thickness variations are drawn per instance. A backtracked origin ensures
+        # the dike is in view
+        dike = geo.DikePlane(
+            strike=params["strike"],
+            dip=params["dip"],
+            origin=geo.BacktrackedPoint(tuple(params["origin"])),
+            width=params["width"],
+            value=params["value"],
+            thickness_func=self.get_organic_thickness_func(params["length"], wobble_factor=params["wobble_factor"]),
+        )
         self.add_process(dike)
 
 
@@ -670,12 +813,12 @@ class SingleDikeWarped(DikePlaneWord):  # Validated
     def build_history(self):
         strike = self.rng.uniform(0, 360)
         dip = self.rng.normal(90, 10)
-        width = rv.beta_min_max(2, 4, 50, 500)
-        length = rv.beta_min_max(2, 2, 300, 16000)
+        width = rv.beta_min_max(2, 4, 50, 500, rng=self.rng)
+        length = rv.beta_min_max(2, 2, 300, 16000, rng=self.rng)
         dike_params = {
             "strike": strike,
             "dip": dip,  # Bias towards vertical dikes
-            "origin": geo.BacktrackedPoint(rv.random_point_in_ellipsoid(MAX_BOUNDS)),
+            "origin": geo.BacktrackedPoint(rv.random_point_in_ellipsoid(MAX_BOUNDS, rng=self.rng)),
             "width": width,
             "value": self.rng.choice(DIKE_VALS),
             "thickness_func": self.get_organic_thickness_func(length, wobble_factor=1.5),
@@ -691,7 +834,8 @@ class SingleDikeWarped(DikePlaneWord):  # Validated
 
     def get_fold(self, dike_strike, dike_dip):
         wave_generator = FourierWaveGenerator(
-            num_harmonics=np.random.randint(4, 8), smoothness=np.random.normal(1.2, 0.2)
+            num_harmonics=self.rng.integers(4, 8), smoothness=self.rng.normal(1.2, 0.2),
+            rng=self.rng,
         )
         period = self.rng.uniform(0.5, 2) * X_RANGE
         amp = self.rng.uniform(10, 250)
@@ -737,9 +881,9 @@ class DikeGroup(DikePlaneWord):  # Validated
         num_dikes = self.rng.geometric(p=0.7) + 1
 
         # Starting parameters, to be sequentially modified
-        origin = rv.random_point_in_ellipsoid(MAX_BOUNDS)
+        origin = rv.random_point_in_ellipsoid(MAX_BOUNDS, rng=self.rng)
         strike = self.rng.uniform(0, 360)
-        width = rv.beta_min_max(1.5, 4, 40, 350)
+        width = rv.beta_min_max(1.5, 4, 40, 350, rng=self.rng)
         dip = self.rng.normal(90, 8)
         value = self.rng.choice(INTRUSION_VALS)
         spacing_avg = self.rng.lognormal(*rv.log_normal_params(mean=1200, std_dev=400))
@@ -752,7 +896,7 @@ class DikeGroup(DikePlaneWord):  # Validated
         self.add_process(fold_in)
 
         for _ in range(num_dikes):
-            length = rv.beta_min_max(2, 2, 600, 16000)
+            length = rv.beta_min_max(2, 2, 600, 16000, rng=self.rng)
             dike_params = {
                 "strike": strike,
                 "dip": dip,
@@ -786,7 +930,8 @@ class DikeGroup(DikePlaneWord):  # Validated
 
     def get_fold(self, dike_strike, dike_dip):
         wave_generator = FourierWaveGenerator(
-            num_harmonics=np.random.randint(4, 8), smoothness=np.random.normal(1.2, 0.2)
+            num_harmonics=self.rng.integers(4, 8), smoothness=self.rng.normal(1.2, 0.2),
+            rng=self.rng,
         )
         period = self.rng.uniform(0.5, 2) * X_RANGE
         amp = self.rng.uniform(30, 60)
@@ -881,14 +1026,14 @@ class SillWord(GeoWord):
         higher exp_z value.
         """
         # Make a fourier based modifier for both x and y
-        fourier = rv.FourierWaveGenerator(num_harmonics=4, smoothness=1)
+        fourier = FourierWaveGenerator(num_harmonics=4, smoothness=1, rng=self.rng)
         x_var = fourier.generate()
         y_var = fourier.generate()
         radial_var = fourier.generate()
-        amp = np.random.uniform(0.1, 0.2) * wobble_factor  # unevenness of the dike thickness
-        exp_x = np.random.uniform(1.5, 4)  # Hyper ellipse exponent controls tapering sharpness
-        exp_y = np.random.uniform(1.5, 4)  # Hyper ellipse exponent controls tapering sharpness
-        exp_z = np.random.uniform(3, 6)  # Hyper ellipse exponent controls tapering sharpness
+        amp = self.rng.uniform(0.1, 0.2) * wobble_factor  # unevenness of the dike thickness
+        exp_x = self.rng.uniform(1.5, 4)  # Hyper ellipse exponent controls tapering sharpness
+        exp_y = self.rng.uniform(1.5, 4)  # Hyper ellipse exponent controls tapering sharpness
+        exp_z = self.rng.uniform(3, 6)  # Hyper ellipse exponent controls tapering sharpness
 
         # Return an instance of the EllipsoidShapingFunction class
         return self.EllipsoidShapingFunction(
@@ -905,21 +1050,31 @@ class SillWord(GeoWord):
         )
 
     def build_history(self):
-        width = rv.beta_min_max(2, 4, 50, 250)
-        x_length = rv.beta_min_max(2, 2, 600, 5000)
-        y_length = self.rng.normal(1, 0.2) * x_length
-        origin = geo.BacktrackedPoint(rv.random_point_in_ellipsoid(MAX_BOUNDS))
-
-        dike_params = {
-            "strike": self.rng.uniform(0, 360),
-            "dip": self.rng.normal(0, 0.1),  # Bias towards horizontal sills
-            "origin": origin,
-            "width": width,
-            "value": self.rng.choice(INTRUSION_VALS),
-            "thickness_func": self.get_ellipsoid_shaping_function(x_length, y_length, wobble_factor=0.0),
+        self.build_from_parameters(self.sample_parameters())
+
+    @classmethod
+    def sample_population_parameters(cls, n, rng):
+        x_length = rv.beta_min_max(2, 2, 600, 5000, rng=rng, size=n)
+        return {
+            "width": rv.beta_min_max(2, 4, 50, 250, rng=rng, size=n),
+            "x_length": x_length,
+            "y_length": rng.normal(1, 0.2, n) * x_length,
+            "origin": np.column_stack(rv.random_point_in_ellipsoid(MAX_BOUNDS, rng=rng, size=n)),
+            "strike": rng.uniform(0, 360, n),
+            "dip": rng.normal(0, 0.1, n),  # Bias towards horizontal sills
+            "value": rng.choice(INTRUSION_VALS, size=n),
         }
-        dike = geo.DikePlane(**dike_params)
 
+    def build_from_parameters(self, params):
+        shaping_func = self.get_ellipsoid_shaping_function(params["x_length"], params["y_length"], wobble_factor=0.0)
+        dike = geo.DikePlane(
+            strike=params["strike"],
+            dip=params["dip"],
+            origin=geo.BacktrackedPoint(tuple(params["origin"])),
+            width=params["width"],
+            value=params["value"],
+            thickness_func=shaping_func,
+        )
         self.add_process(dike)
 
 
@@ -979,8 +1134,8 @@ class SillSystem(SillWord):
             sill_origin = geo.SedimentConditionedOrigin(x=x_loc, y=y_loc, boundary_index=boundary)
             origins.append(sill_origin)
 
-            width = rv.beta_min_max(2, 4, 40, 250)
-            x_length = rv.beta_min_max(2, 2, 600, 4000)
+            width = rv.beta_min_max(2, 4, 40, 250, rng=self.rng)
+            x_length = rv.beta_min_max(2, 2, 600, 4000, rng=self.rng)
             y_length = self.rng.lognormal(*rv.log_normal_params(mean=1, std_dev=0.2)) * x_length
 
             dike_params = {
@@ -1075,12 +1230,12 @@ class _HemiPushedWord(GeoWord):
         1=z^2+x^2+y^2 will give a default hemisphere, the purpose is to distort the default z surface
         """
 
-        fourier = rv.FourierWaveGenerator(num_harmonics=4, smoothness=1)
+        fourier = FourierWaveGenerator(num_harmonics=4, smoothness=1, rng=self.rng)
         x_var = fourier.generate()
         y_var = fourier.generate()
-        exp_x = np.random.uniform(1.5, 4)
-        exp_y = np.random.uniform(1.5, 4)
-        exp_z = np.random.uniform(1.5, 3)
+        exp_x = self.rng.uniform(1.5, 4)
+        exp_y = self.rng.uniform(1.5, 4)
+        exp_z = self.rng.uniform(1.5, 3)
         radial_var = fourier.generate()
 
         # Return an instance of the HemiFunction class
@@ -1117,7 +1272,7 @@ class Laccolith(_HemiPushedWord):  # Validated
         height = self.rng.uniform(250, 1000)
         self.origin = self.get_origin(height)  # places the self.origin parameter
         rotation = self.rng.uniform(0, 360)
-        min_axis_scale = rv.beta_min_max(2, 2, 0.5, 1.5)
+        min_axis_scale = rv.beta_min_max(2, 2, 0.5, 1.5, rng=self.rng)
 
         hemi_params = {
             "origin": self.origin,
@@ -1161,7 +1316,8 @@ class Laccolith(_HemiPushedWord):  # Validated
 
     def get_fold(self):
         wave_generator = FourierWaveGenerator(
-            num_harmonics=np.random.randint(4, 8), smoothness=np.random.normal(1.2, 0.2)
+            num_harmonics=self.rng.integers(4, 8), smoothness=self.rng.normal(1.2, 0.2),
+            rng=self.rng,
         )
         period = self.rng.uniform(0.5, 2) * X_RANGE
         amp = self.rng.uniform(100, 300)
@@ -1204,7 +1360,7 @@ class Lopolith(_HemiPushedWord):
         height = 0.3 * self.rng.uniform(1e-2, 1e-1) + 0.7 * self.rng.uniform(200, 800)
         self.origin = self.get_origin(height)  # places the self.origin parameter
         rotation = self.rng.uniform(0, 360)
-        min_axis_scale = rv.beta_min_max(2, 2, 0.5, 1.5)
+        min_axis_scale = rv.beta_min_max(2, 2, 0.5, 1.5, rng=self.rng)
 
         hemi_params = {
             "origin": self.origin,
@@ -1248,7 +1404,8 @@ class Lopolith(_HemiPushedWord):
 
     def get_fold(self):
         wave_generator = FourierWaveGenerator(
-            num_harmonics=np.random.randint(4, 8), smoothness=np.random.normal(1.2, 0.2)
+            num_harmonics=self.rng.integers(4, 8), smoothness=self.rng.normal(1.2, 0.2),
+            rng=self.rng,
         )
         period = self.rng.uniform(0.5, 2) * X_RANGE
         amp = self.rng.uniform(100, 300)
@@ -1292,10 +1449,10 @@ class VolcanicPlug(GeoWord):
 
         diam = self.rng.lognormal(*rv.log_normal_params(mean=1, std_dev=0.2)) * 200
         origin = geo.BacktrackedPoint(
-            rv.random_point_in_ellipsoid((BOUNDS_X, BOUNDS_Y, (BOUNDS_Z[0], BOUNDS_Z[1] * 0.8)))
+            rv.random_point_in_ellipsoid((BOUNDS_X, BOUNDS_Y, (BOUNDS_Z[0], BOUNDS_Z[1] * 0.8)), rng=self.rng)
         )
         rotation = self.rng.uniform(0, 360)
-        min_axis_scale = rv.beta_min_max(2, 2, 0.2, 1.8)
+        min_axis_scale = rv.beta_min_max(2, 2, 0.2, 1.8, rng=self.rng)
 
         plug_params = {
             "origin": origin,
@@ -1350,10 +1507,10 @@ class BlobWord(GeoWord):
         if self.rock_val is None:
             self.rock_val = self.rng.choice(BLOB_VALS)
         if self.origin is None:
-            self.origin = geo.BacktrackedPoint(tuple(rv.random_point_in_box(MAX_BOUNDS)))
+            self.origin = geo.BacktrackedPoint(tuple(rv.random_point_in_box(MAX_BOUNDS, rng=self.rng)))
 
         # Ball list generator is a markov chain maker for point distribution
-        n_balls = int(rv.beta_min_max(2, 2, 8, 60))
+        n_balls = int(rv.beta_min_max(2, 2, 8, 60, rng=self.rng))
         scale_factor = 0.5 ** ((n_balls - 30) / 40)  # Heuristically tuned to adjust radius
         blg = geo.BallListGenerator(
             step_range=(10, 25),
@@ -1362,6 +1519,7 @@ class BlobWord(GeoWord):
                 20 * scale_factor,
             ),  # Correlate the radius with the number of balls
             goo_range=(0.5, 0.7),
+            rng=self.rng,
         )
 
         # Blobs look better with multi-branched approach
@@ -1397,7 +1555,7 @@ class BlobCluster(GeoWord):
     def build_history(self):
         n_blobs = self.rng.integers(2, 7)
         blob_val = self.rng.choice(BLOB_VALS)
-        starting_origin = rv.random_point_in_ellipsoid(MAX_BOUNDS)
+        starting_origin = rv.random_point_in_ellipsoid(MAX_BOUNDS, rng=self.rng)
 
         # generate a set of origins for the blobs using a markov stepping algorithm
         origin_list = [starting_origin]
@@ -1407,7 +1565,7 @@ class BlobCluster(GeoWord):
         # Process each sampled point into a blob
         for origin in origin_list:
             origin = geo.BacktrackedPoint(origin)
-            blob_word = BlobWord(seed=self.seed, origin=origin, value=blob_val)
+            blob_word = BlobWord(seed=self.rng, origin=origin, value=blob_val)
             sub_hist = blob_word.generate()
             self.add_process(sub_hist)
 
@@ -1431,7 +1589,7 @@ class BlobCluster(GeoWord):
         step_max = 1000
 
         for _ in range(MAX_ATTEMPTS):
-            step_size = rv.beta_min_max(1.3, 2, step_min, step_max)
+            step_size = rv.beta_min_max(1.3, 2, step_min, step_max, rng=self.rng)
             # Random direction on the unit sphere
             direction = self.rng.normal(size=3)
             direction /= np.linalg.norm(direction)
@@ -1528,11 +1686,11 @@ class TiltCutFill(GeoWord):
     def get_fold_pair(self, strike):
         dip = self.rng.normal(90, 10)
 
-        wave_generator = FourierWaveGenerator(num_harmonics=np.random.randint(3, 5), smoothness=1)
+        wave_generator = FourierWaveGenerator(num_harmonics=self.rng.integers(3, 5), smoothness=1, rng=self.rng)
         period = self.rng.uniform(0.5, 2) * X_RANGE
         min_amp = period * 0.003
         max_amp = period * 0.02
-        amp = rv.beta_min_max(a=1.5, b=1.5, min_val=min_amp, max_val=max_amp)
+        amp = rv.beta_min_max(a=1.5, b=1.5, min_val=min_amp, max_val=max_amp, rng=self.rng)
         fold_params = {
             "strike": strike,
             "dip": dip,  # average of dike dip and 90
@@ -1543,7 +1701,7 @@ class TiltCutFill(GeoWord):
         }
         fold_in = geo.Fold(**fold_params)
         fold_out = copy.deepcopy(fold_in)
-        springback_factor = rv.beta_min_max(a=1.5, b=1.5, min_val=0.98, max_val=1)
+        springback_factor = rv.beta_min_max(a=1.5, b=1.5, min_val=0.98, max_val=1, rng=self.rng)
         fold_out.amplitude *= -1 * springback_factor
         return fold_in, fold_out
 
@@ -1556,13 +1714,13 @@ class MicroNoise(GeoWord):  # Validated
 
     def build_history(self):
         # Fourier wave generator creates randomized waves with a bias towards lower frequencies
-        wave_generator = FourierWaveGenerator(num_harmonics=self.rng.integers(4, 6), smoothness=0.8)
+        wave_generator = FourierWaveGenerator(num_harmonics=self.rng.integers(4, 6), smoothness=0.8, rng=self.rng)
 
         for _ in range(self.rng.integers(3, 7)):
             period = self.rng.uniform(100, 1000)
             amplitude = period * self.rng.uniform(0.002, 0.005) + 5
             fold_params = {
-                "origin": geo.BacktrackedPoint(rv.random_point_in_ellipsoid(MAX_BOUNDS)),
+                "origin": geo.BacktrackedPoint(rv.random_point_in_ellipsoid(MAX_BOUNDS, rng=self.rng)),
                 "strike": self.rng.uniform(0, 360),
                 "dip": self.rng.uniform(0, 360),
                 "rake": self.rng.uniform(0, 360),
@@ -1578,50 +1736,56 @@ class SimpleFold(GeoWord):  # validated
     """A simple fold structure with random orientation and amplitude."""
 
     def build_history(self):
-        period = rv.beta_min_max(a=1.4, b=2.1, min_val=100, max_val=14000)
+        self.build_from_parameters(self.sample_parameters())
+
+    @classmethod
+    def sample_population_parameters(cls, n, rng):
+        period = rv.beta_min_max(a=1.4, b=2.1, min_val=100, max_val=14000, rng=rng, size=n)
         min_amp = period * 0.04
         max_amp = period * (0.18 - 0.07 * period / 10000)  # Linear interp, 1000 -> .17 , 11000 -> .10
-        amp = self.rng.beta(a=2.1, b=1.4) * (max_amp - min_amp) + min_amp
-
-        fold_params = {
-            "strike": self.rng.uniform(0, 360),
-            "dip": self.rng.normal(90, 45),  # Preference towards vertical fold planes
-            "rake": self.rng.uniform(0, 360),
+        return {
             "period": period,
-            "amplitude": amp,
-            "periodic_func": None,
-            "phase": self.rng.uniform(0, 2 * np.pi),
-            "origin": geo.BacktrackedPoint(rv.random_point_in_ellipsoid(MAX_BOUNDS)),
+            "amplitude": rng.beta(a=2.1, b=1.4, size=n) * (max_amp - min_amp) + min_amp,
+            "strike": rng.uniform(0, 360, n),
+            "dip": rng.normal(90, 45, n),  # Preference towards vertical fold planes
+            "rake": rng.uniform(0, 360, n),
+            "phase": rng.uniform(0, 2 * np.pi, n),
+            "origin": np.column_stack(rv.random_point_in_ellipsoid(MAX_BOUNDS, rng=rng, size=n)),
         }
-        fold = geo.Fold(**fold_params)
-        self.add_process(fold)
+
+    def build_from_parameters(self, params):
+        fold_params = dict(params, periodic_func=None, origin=geo.BacktrackedPoint(tuple(params["origin"])))
+        self.add_process(geo.Fold(**fold_params))
 
 
 class ShapedFold(GeoWord):  # Validated
     """A fold structure with a random shape factor."""
 
     def build_history(self):
-        true_period = rv.beta_min_max(a=2.1, b=2.1, min_val=1000, max_val=11000)
-        shape = self.rng.normal(0.3, 0.1)
+        self.build_from_parameters(self.sample_parameters())
+
+    @classmethod
+    def sample_population_parameters(cls, n, rng):
+        true_period = rv.beta_min_max(a=2.1, b=2.1, min_val=1000, max_val=11000, rng=rng, size=n)
+        shape = rng.normal(0.3, 0.1, n)
         harmonic_weight = shape / np.sqrt(1 + shape**2)
         period = (1 - (2 / 3) * harmonic_weight) * true_period  # Effective period due to shape
         min_amp = period * 0.04
         max_amp = period * (0.18 - 0.07 * period / 10000)  # Linear interp, 1000 -> .17 , 11000 -> .10
-        amp = self.rng.beta(a=1.2, b=2.1) * (max_amp - min_amp) + min_amp
-
-        fold_params = {
-            "strike": self.rng.uniform(0, 360),
-            "dip": self.rng.normal(90, 45),  # Preference towards vertical fold planes
-            "rake": self.rng.uniform(0, 360),
+        return {
             "period": true_period,
-            "amplitude": amp,
             "shape": shape,
-            "periodic_func": None,
-            "phase": self.rng.uniform(0, 2 * np.pi),
-            "origin": geo.BacktrackedPoint(rv.random_point_in_ellipsoid(MAX_BOUNDS)),
+            "amplitude": rng.beta(a=1.2, b=2.1, size=n) * (max_amp - min_amp) + min_amp,
+            "strike": rng.uniform(0, 360, n),
+            "dip": rng.normal(90, 45, n),
+            "rake": rng.uniform(0, 360, n),
+            "phase": rng.uniform(0, 2 * np.pi, n),
+            "origin": np.column_stack(rv.random_point_in_ellipsoid(MAX_BOUNDS, rng=rng, size=n)),
         }
-        fold = geo.Fold(**fold_params)
-        self.add_process(fold)
+
+    def build_from_parameters(self, params):
+        fold_params = dict(params, periodic_func=None, origin=geo.BacktrackedPoint(tuple(params["origin"])))
+        self.add_process(geo.Fold(**fold_params))
 
 
 class FourierFold(GeoWord):  # Validated
@@ -1633,8 +1797,9 @@ class FourierFold(GeoWord):  # Validated
         mu_smoothness = 1.4 - 0.1 * period / 10000
         # Fourier wave generator creates randomized waves with a bias towards lower frequencies
         wave_generator = FourierWaveGenerator(
-            num_harmonics=np.random.randint(3, 6),
-            smoothness=np.random.normal(mu_smoothness, 0.2),
+            num_harmonics=self.rng.integers(3, 6),
+            smoothness=self.rng.normal(mu_smoothness, 0.2),
+            rng=self.rng,
         )
         min_amp = period * 0.04
         max_amp = period * (0.18 - 0.09 * period / 10000)  # Linear interp
@@ -1654,11 +1819,11 @@ class FourierFold(GeoWord):  # Validated
 """ Fault Events"""
 
 
-def _typical_fault_amplitude():
+def _typical_fault_amplitude(rng, size=None):
     """Get a typical fault amplitude based on a beta distribution."""
     min_amp = 60
     max_amp = 1000
-    return rv.beta_min_max(1.8, 5.5, min_amp, max_amp)
+    return rv.beta_min_max(1.8, 5.5, min_amp, max_amp, rng=rng, size=size)
 
 
 class FaultRandom(GeoWord):
@@ -1679,22 +1844,21 @@ class FaultRandom(GeoWord):
     """
 
     def build_history(self):
-        strike = self.rng.uniform(0, 360)
-        dip = self.rng.uniform(0, 90)
-        rake = self.rng.uniform(0, 360)
-        amplitude = _typical_fault_amplitude()
-        origin = rv.random_point_in_box(MAX_BOUNDS)
-
-        fault_params = {
-            "strike": strike,
-            "dip": dip,
-            "rake": rake,
-            "amplitude": amplitude,
-            "origin": geo.BacktrackedPoint(tuple(origin)),
+        self.build_from_parameters(self.sample_parameters())
+
+    @classmethod
+    def sample_population_parameters(cls, n, rng):
+        return {
+            "strike": rng.uniform(0, 360, n),
+            "dip": rng.uniform(0, 90, n),
+            "rake": rng.uniform(0, 360, n),
+            "amplitude": _typical_fault_amplitude(rng, size=n),
+            "origin": np.column_stack(rv.random_point_in_box(MAX_BOUNDS, rng=rng, size=n)),
         }
 
-        fault = geo.Fault(**fault_params)
-        self.add_process(fault)
+    def build_from_parameters(self, params):
+        fault_params = dict(params, origin=geo.BacktrackedPoint(tuple(params["origin"])))
+        self.add_process(geo.Fault(**fault_params))
 
 
 class FaultNormal(GeoWord):
@@ -1716,29 +1880,37 @@ class FaultNormal(GeoWord):
     """
 
     def build_history(self):
-        strike = self.rng.uniform(0, 360)
-        dip = 90 - np.abs(self.rng.normal(0, 20))
-        rake = self.rng.normal(90, 5)
-
-        fault_params = {
-            "strike": strike,
-            "dip": dip,
-            "rake": rake,
-            "amplitude": _typical_fault_amplitude(),
-            "origin": geo.BacktrackedPoint(tuple(rv.random_point_in_box(MAX_BOUNDS))),
+        self.build_from_parameters(self.sample_parameters())
+
+    @classmethod
+    def sample_population_parameters(cls, n, rng):
+        return {
+            "strike": rng.uniform(0, 360, n),
+            "dip": 90 - np.abs(rng.normal(0, 20, n)),
+            "rake": rng.normal(90, 5, n),
+            "amplitude": _typical_fault_amplitude(rng, size=n),
+            "origin": np.column_stack(rv.random_point_in_box(MAX_BOUNDS, rng=rng, size=n)),
+            "fold_amp": rng.uniform(0, 200, n),
         }
 
-        fold_amp = self.rng.uniform(0, 200)
-        fold_in = self.get_fold(strike, fold_amp)
+    def build_from_parameters(self, params):
+        # The wrapping folds have Fourier wave shapes, drawn per instance
+        fold_in = self.get_fold(params["strike"], params["fold_amp"])
         fold_out = copy.deepcopy(fold_in)
         fold_out.amplitude *= -1
-
-        fault = geo.Fault(**fault_params)
+        fault = geo.Fault(
+            strike=params["strike"],
+            dip=params["dip"],
+            rake=params["rake"],
+            amplitude=params["amplitude"],
+            origin=geo.BacktrackedPoint(tuple(params["origin"])),
+        )
         self.add_process([fold_in, fault, fold_out])
 
     def get_fold(self, strike, amp):
         wave_generator = FourierWaveGenerator(
-            num_harmonics=np.random.randint(3, 5), smoothness=np.random.normal(1.2, 0.2)
+            num_harmonics=self.rng.integers(3, 5), smoothness=self.rng.normal(1.2, 0.2),
+            rng=self.rng,
         )
         period = self.rng.uniform(0.5, 2) * X_RANGE
         fold_params = {
@@ -1780,8 +1952,8 @@ class FaultReverse(GeoWord):
             "strike": strike,
             "dip": dip,
             "rake": rake,
-            "amplitude": _typical_fault_amplitude(),
-            "origin": geo.BacktrackedPoint(tuple(rv.random_point_in_box(MAX_BOUNDS))),
+            "amplitude": _typical_fault_amplitude(self.rng),
+            "origin": geo.BacktrackedPoint(tuple(rv.random_point_in_box(MAX_BOUNDS, rng=self.rng))),
         }
 
         fold_amp = self.rng.uniform(0, 200)
@@ -1794,7 +1966,8 @@ class FaultReverse(GeoWord):
 
     def get_fold(self, strike, amp):
         wave_generator = FourierWaveGenerator(
-            num_harmonics=np.random.randint(3, 5), smoothness=np.random.normal(1.2, 0.2)
+            num_harmonics=self.rng.integers(3, 5), smoothness=self.rng.normal(1.2, 0.2),
+            rng=self.rng,
         )
         period = self.rng.uniform(0.5, 2) * X_RANGE
         fold_params = {
@@ -1834,11 +2007,11 @@ class FaultHorstGraben(GeoWord):
         strike = self.rng.uniform(0, 360)
         dip_offset = np.abs(self.rng.normal(0, 10))
         rake = self.rng.normal(90, 3)
-        amplitude = _typical_fault_amplitude()
-        origin = rv.random_point_in_box(MAX_BOUNDS)
+        amplitude = _typical_fault_amplitude(self.rng)
+        origin = rv.random_point_in_box(MAX_BOUNDS, rng=self.rng)
 
         # Throw distance between faults, correlated with amplitude
-        distance = rv.beta_min_max(2, 2, 2, 8) * amplitude * (1 + dip_offset / 5)
+        distance = rv.beta_min_max(2, 2, 2, 8, rng=self.rng) * amplitude * (1 + dip_offset / 5)
 
         fault1_params = {
             "strike": strike,
@@ -1887,7 +2060,8 @@ class FaultHorstGraben(GeoWord):
 
     def get_fold(self, strike, amp):
         wave_generator = FourierWaveGenerator(
-            num_harmonics=np.random.randint(3, 5), smoothness=np.random.normal(1.2, 0.2)
+            num_harmonics=self.rng.integers(3, 5), smoothness=self.rng.normal(1.2, 0.2),
+            rng=self.rng,
         )
         period = self.rng.uniform(0.5, 2) * X_RANGE
         fold_params = {
@@ -1927,8 +2101,8 @@ class FaultStrikeSlip(GeoWord):
         direction = self.rng.choice([-1, 1])
         # Similar to lognormal distribution in shape,
         # most values within 30-250m, but outliers up to 2km
-        amplitude = rv.beta_min_max(1.4, 10, 45, 2000) * direction
-        origin = rv.random_point_in_box(MAX_BOUNDS)
+        amplitude = rv.beta_min_max(1.4, 10, 45, 2000, rng=self.rng) * direction
+        origin = rv.random_point_in_box(MAX_BOUNDS, rng=self.rng)
 
         fault_params = {
             "strike": strike,
@@ -1975,11 +2149,11 @@ class FaultSequence(GeoWord):  # Inherits from FaultRandom for base faulting beh
         num_faults = self.rng.geometric(p=0.7) + 1
 
         # Starting parameters for the first fault
-        origin = rv.random_point_in_box(MAX_BOUNDS)
+        origin = rv.random_point_in_box(MAX_BOUNDS, rng=self.rng)
         strike = self.rng.uniform(0, 360)
         dip = self.rng.normal(90, 20)
         rake = self.rng.normal(90, 30)
-        amplitude = _typical_fault_amplitude() / (num_faults - 1)
+        amplitude = _typical_fault_amplitude(self.rng) / (num_faults - 1)
         spacing_avg = self.rng.lognormal(*rv.log_normal_params(mean=600, std_dev=900))
 
         # Setup slight wave transform for deformation along the fault sequence
@@ -2023,7 +2197,8 @@ class FaultSequence(GeoWord):  # Inherits from FaultRandom for base faulting beh
 
     def get_fold(self, fault_strike, fault_dip):
         wave_generator = FourierWaveGenerator(
-            num_harmonics=np.random.randint(3, 6), smoothness=np.random.normal(1.2, 0.2)
+            num_harmonics=self.rng.integers(3, 6), smoothness=self.rng.normal(1.2, 0.2),
+            rng=self.rng,
         )
         period = self.rng.uniform(0.5, 2) * X_RANGE
         amp = self.rng.uniform(10, 250)
@@ -0,0 +1,99 @@
+""" Vectorized sampling of event sequences from a Markov transition matrix. """
+
+from typing import List
+
+import numpy as np
+
+
+class MarkovSequenceSampler:
+    """
+    Draws many Markov chain state sequences at once from a transition matrix, using only NumPy.
+
+    Each row of the transition matrix is stored as a cumulative probability table. One step of
+    every sequence is taken at once by locating a uniform draw in the table row of the current
+    state, a vectorized row-wise searchsorted. All uniform draws of a batch are taken up front as
+    one (n, max_steps) block, so the result is a pure function of the random generator state and
+    bit-reproducible from a seed, whatever the lengths of the sequences.
+
+    Parameters
+    ----------
+    transition_matrix : np.ndarray
+        A square row-stochastic matrix of transition probabilities.
+    states : list of str
+        The state names of the rows and columns of the transition matrix.
+    """
+
+    PADDING = -1  # Index filling sequence arrays after termination
+
+    def __init__(self, transition_matrix, states):
+        transition_matrix = np.asarray(transition_matrix, dtype=np.float64)
+        if transition_matrix.ndim != 2 or transition_matrix.shape[0] != transition_matrix.shape[1]:
+            raise ValueError("Transition matrix must be square.")
+        if len(states) != transition_matrix.shape[0]:
+            raise ValueError(f"Expected {transition_matrix.shape[0]} state names, got {len(states)}.")
+        self.states = list(states)
+        self.state_index = {state: i for i, state in enumerate(self.states)}
+        self.cumulative = np.cumsum(transition_matrix, axis=1)
+        # Guard against rounding, every draw in [0, 1) must land on a state of nonzero probability.
+        # The table is closed at the last such state of each row, so trailing zero probability
+        # states can not be reached by a draw above a cumulative sum that rounded below 1.
+        columns = np.arange(transition_matrix.shape[1])
+        last_nonzero = np.where(transition_matrix > 0, columns, -1).max(axis=1)
+        self.cumulative[columns[None, :] >= np.maximum(last_nonzero, 0)[:, None]] = np.inf
+
+    def sample_indices(self, n, start, max_steps, end=None, rng=None):
+        """
+        Draw n state index sequences.
+
+        Parameters
+        ----------
+        n : int
+            Number of sequences.
+        start : str
+            The initial state of every sequence.
+        max_steps : int
+            Maximum number of transitions of a sequence.
+        end : str, optional
+            A terminal state, sequences stop once they reach it.
+        rng : np.random.Generator, optional
+            Random number generator.
+
+        Returns
+        -------
+        tuple of (np.ndarray, np.ndarray)
+            The (n, max_steps + 1) array of state indices, starting with the initial state and padded
+            with PADDING after termination, and the (n,) length of each sequence.
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        draws = rng.random((n, max_steps))
+        end_index = self.state_index[end] if end is not None else self.PADDING
+
+        sequences = np.full((n, max_steps + 1), self.PADDING, dtype=np.int64)
+        sequences[:, 0] = self.state_index[start]
+        lengths = np.ones(n, dtype=np.int64)
+        active = sequences[:, 0] != end_index
+
+        current = sequences[:, 0].copy()
+        for step in range(max_steps):
+            if not active.any():
+                break
+            # Row-wise searchsorted: count of table entries at or below the draw in the current row
+            rows = self.cumulative[current[active]]
+            current[active] = np.sum(rows <= draws[active, step, None], axis=1)
+            sequences[active, step + 1] = current[active]
+            lengths[active] += 1
+            active &= current != end_index
+        return sequences, lengths
+
+    def sample(self, n, start, max_steps, end=None, rng=None) -> List[List[str]]:
+        """
+        Draw n state name sequences, see `sample_indices`.
+
+        Returns
+        -------
+        list of list of str
+            The state names of each sequence, from the initial state to the terminal state or the
+            maximum number of steps.
+        """
+        sequences, lengths = self.sample_indices(n, start, max_steps, end, rng)
+        return [[self.states[i] for i in sequence[:length]] for sequence, length in zip(sequences, lengths)]
@@ -4,14 +4,22 @@ import abc as _abc
 import csv
 import importlib.resources as resources
 import os
-from typing import List
+from collections import deque
+from typing import TYPE_CHECKING, List
 
 import numpy as np
-from pydtmc import MarkovChain
 
 import geogen.generation.categorical_events as events
 from geogen.generation.geowords import BOUNDS_X, BOUNDS_Y, BOUNDS_Z
+from geogen.generation.markov_sampler import MarkovSequenceSampler
+from geogen.generation.parallel import GeneratorPool
+from geogen.model.cost import CostBudget, CostEstimate, CostModel
 from geogen.model.geomodel import GeoModel, GeoProcess
+from geogen.model.geoprocess import empty_mask
+from geogen.model.util import sample_crop_offsets
+
+if TYPE_CHECKING:
+    from pydtmc import MarkovChain
 
 
 class _GeostoryGenerator(_abc.ABC):
@@ -26,11 +34,28 @@ class _GeostoryGenerator(_abc.ABC):
         The resolution of the model in the form (nx, ny, nz), by default (256, 256, 128)
     config : str, optional
         The path to a configuration file or object, if any.
+    label_dtype : dtype, optional
+        Compute models as integer rock labels of this type (np.int8 or np.int16), see GeoModel.
+        Default is None, for float models with NaN air.
+    cost_budget : CostBudget, optional
+        A bound on the predicted compute time and memory of generated models. Histories over budget
+        are resampled or downgraded before they are computed. Default is None for no bound.
+    cost_model : CostModel, optional
+        The cost model predicting the cost of histories, a default one is used if not provided.
     **kwargs : dict, optional
         Additional keyword arguments specific to the generator.
     """
 
-    def __init__(self, model_bounds=None, model_resolution=None, config=None, **kwargs):
+    def __init__(
+        self,
+        model_bounds=None,
+        model_resolution=None,
+        config=None,
+        label_dtype=None,
+        cost_budget: CostBudget = None,
+        cost_model: CostModel = None,
+        **kwargs,
+    ):
 
         self.model_bounds = model_bounds or (
             BOUNDS_X,
@@ -39,24 +64,243 @@ class _GeostoryGenerator(_abc.ABC):
         )
         self.model_resolution = model_resolution or (256, 256, 128)
         self.config = config
+        self.label_dtype = label_dtype
+        self.cost_budget = cost_budget
+        self.cost_model = cost_model if cost_model is not None else CostModel()
         self.additional_params = kwargs
+        self._pool = None
+
+    def _get_init_kwargs(self):
+        """Keyword arguments needed to rebuild an equivalent generator in a worker process."""
+        return dict(
+            model_bounds=self.model_bounds,
+            model_resolution=self.model_resolution,
+            config=self.config,
+            label_dtype=self.label_dtype,
+            cost_budget=self.cost_budget,
+            cost_model=self.cost_model,
+            **self.additional_params,
+        )
 
-    def _history_to_model(self, hist: List[GeoProcess]) -> GeoModel:
-        """Generate a model from a history and normalize the height."""
-        model = GeoModel(bounds=self.model_bounds, resolution=self.model_resolution)
+    def _history_to_model(self, hist: List[GeoProcess], rng=None, model: GeoModel = None) -> GeoModel:
+        """Generate a model from a history and normalize the height, reusing a given model object."""
+        if model is None:
+            model = GeoModel(bounds=self.model_bounds, resolution=self.model_resolution, label_dtype=self.label_dtype)
+        model.clear_history()
         model.add_history(hist)
         model.clear_data()
-        model.compute_model(normalize=True)
+        model.compute_model(normalize=True, rng=rng)
         return model
 
+    def estimate_cost(self, history: List[GeoProcess]) -> CostEstimate:
+        """Predict the compute time and peak memory of a history as a normalized model of this generator."""
+        return self.cost_model.estimate(
+            history, self.model_resolution, label_dtype=self.label_dtype, normalize=True
+        )
+
+    def _downgrade_history(self, history: List[GeoProcess]) -> List[GeoProcess]:
+        """Remove the events saving the most cost until the history is within the cost budget."""
+        history = list(history)
+        while len(history) > 1 and not self.cost_budget.allows(self.estimate_cost(history)):
+            # The first event lays down the base strata and is always kept
+            costs = [self.estimate_cost(history[:i] + history[i + 1 :]).seconds for i in range(1, len(history))]
+            del history[1 + int(np.argmin(costs))]
+        return history
+
     @_abc.abstractmethod
-    def generate_models(self, n_samples: int = 1) -> List[GeoModel]:
-        """Generate multiple geological models."""
+    def generate_models(self, n_samples: int = 1, seeds=None) -> List[GeoModel]:
+        """Generate multiple geological models, optionally with one seed per model."""
         pass
 
-    def generate_model(self) -> GeoModel:
-        """Generate a single geological model."""
-        return self.generate_models(1)[0]
+    def generate_model(self, seed=None) -> GeoModel:
+        """Generate a single geological model, reproducible from an optional seed."""
+        return self.generate_models(1, seeds=[seed])[0]
+
+    async def agenerate_model(self, seed=None, executor=None, supersede=True) -> GeoModel:
+        """
+        Generate a single model like `generate_model` on an executor, without blocking the event loop.
+
+        Parameters
+        ----------
+        seed : int | np.random.SeedSequence | np.random.Generator, optional
+            Seed of the model, see `generate_model`.
+        executor : Executor or str, optional
+            An executor, or 'thread' or 'process' for a shared pool. See `geogen.model.aio`.
+        supersede : bool, optional
+            Whether this request cancels a pending `agenerate_model` of the same generator, and is
+            cancelled by the next one. Default is True.
+
+        Returns
+        -------
+        GeoModel
+            The generated model.
+
+        Raises
+        ------
+        asyncio.CancelledError
+            If the request was superseded by a newer one.
+        """
+        from geogen.model.aio import run_in_executor  # asyncio is only loaded by async users
+
+        return await run_in_executor(
+            self.generate_model, seed, executor=executor, supersede=self if supersede else None
+        )
+
+    def generate_crops(self, crop_size, n_crops, seed=None, layout="random", max_air_fraction=None):
+        """
+        Generate one model at the full generator resolution and cut several crops from it.
+
+        The model is height normalized over its full extent, so all crops share consistent heights.
+        Crops are views of the model labels, no data is copied until they are stacked or collated.
+
+        Parameters
+        ----------
+        crop_size : tuple
+            The (cx, cy, cz) resolution of the crops, at most the model resolution.
+        n_crops : int
+            Number of crops.
+        seed : int, optional
+            Seed of the model and of the crop placement.
+        layout : str, optional
+            'random' for uniformly placed crops or 'grid' for non-overlapping crops. Default is 'random'.
+        max_air_fraction : float, optional
+            Reject crops with a larger fraction of air voxels. Default is None for no rejection.
+
+        Returns
+        -------
+        crops : list of np.ndarray
+            Label volume views of shape crop_size, with air filled as -1.
+        offsets : list of tuple
+            The (x, y, z) voxel offset of each crop in the full model.
+        """
+        rng = np.random.default_rng(seed)
+        model = self.generate_model(seed=rng)
+        empty = empty_mask(model.data).reshape(model.X.shape) if max_air_fraction is not None else None
+        model.fill_nans()
+        labels = model.get_data_grid()
+
+        offsets = sample_crop_offsets(
+            labels.shape,
+            crop_size,
+            n_crops,
+            rng=rng,
+            layout=layout,
+            empty=empty,
+            max_empty_fraction=max_air_fraction,
+        )
+        crops = [labels[tuple(slice(o, o + c) for o, c in zip(offset, crop_size))] for offset in offsets]
+        return crops, offsets
+
+    def stream_models(self, n_samples, workers, ordered=True, max_in_flight=None, seeds=None, out=None):
+        """
+        Stream compact label volumes generated on a persistent process pool.
+
+        The pool is created on first use and kept alive between calls with the same worker
+        configuration. Use `close_pool` to release it. Closing the returned iterator early
+        cancels all queued work.
+
+        Parameters
+        ----------
+        n_samples : int
+            Number of samples to generate.
+        workers : int
+            Number of worker processes.
+        ordered : bool, optional
+            Yield samples in seed order if True, or as soon as they finish if False. Default is True.
+        max_in_flight : int, optional
+            Bound on the number of samples generated ahead of the consumer. Default is 2 * workers.
+        seeds : list of int, optional
+            One seed per sample. Random seeds are drawn if not provided.
+        out : np.ndarray, optional
+            An int8 (n_samples, X, Y, Z) array the volumes are written into, see `GeneratorPool.imap`.
+
+        Yields
+        ------
+        tuple of (np.ndarray, dict)
+            An int8 label volume with air filled as GeoModel.EMPTY_VALUE, and the sample metadata
+            containing its seed and history string.
+        """
+        seeds = self._stream_seeds(n_samples, seeds)
+        pool = self._get_pool(workers, max_in_flight)
+        yield from pool.imap(seeds, ordered=ordered, out=out)
+
+    async def agenerate_stream(self, n_samples, seeds=None, executor=None, prefetch=2):
+        """
+        Asynchronously iterate over generated models, prefetching the next ones on an executor.
+
+        Closing the iterator early cancels the prefetched models that did not start.
+
+        Parameters
+        ----------
+        n_samples : int
+            Number of models to generate.
+        seeds : list of int, optional
+            One seed per model. Random seeds are drawn if not provided.
+        executor : Executor or str, optional
+            An executor, or 'thread' or 'process' for a shared pool. See `geogen.model.aio`.
+        prefetch : int, optional
+            Number of models generated ahead of the consumer. Default is 2.
+
+        Yields
+        ------
+        GeoModel
+            The generated models in seed order.
+        """
+        import asyncio
+
+        from geogen.model.aio import get_executor
+
+        seeds = list(self._stream_seeds(n_samples, seeds))
+        executor = get_executor(executor)
+        pending = deque()
+        try:
+            for seed in seeds:
+                pending.append(asyncio.wrap_future(executor.submit(self.generate_model, seed)))
+                if len(pending) > prefetch:
+                    yield await pending.popleft()
+            while pending:
+                yield await pending.popleft()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    @staticmethod
+    def _stream_seeds(n_samples, seeds):
+        """Validate the seeds of a stream, or draw random ones."""
+        if seeds is None:
+            return np.random.default_rng().integers(0, 2**32, size=n_samples)
+        if len(seeds) != n_samples:
+            raise ValueError(f"Expected {n_samples} seeds, got {len(seeds)}.")
+        return seeds
+
+    def _get_pool(self, workers, max_in_flight=None):
+        """Fetch the persistent pool, rebuilding it if the worker configuration changed."""
+        max_in_flight = max_in_flight or 2 * workers
+        pool = self._pool
+        if pool is None or pool.workers != workers or pool.max_in_flight != max_in_flight:
+            self.close_pool()
+            # Workers emit int8 volumes, so they compute in int8 label mode directly
+            generator_kwargs = {**self._get_init_kwargs(), "label_dtype": np.int8}
+            self._pool = GeneratorPool(
+                generator_cls=self.__class__,
+                generator_kwargs=generator_kwargs,
+                resolution=self.model_resolution,
+                workers=workers,
+                max_in_flight=max_in_flight,
+            )
+        return self._pool
+
+    def close_pool(self):
+        """Shut down the persistent generation pool if one is running."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
+    def __getstate__(self):
+        # The process pool belongs to the parent process and is never pickled
+        state = self.__dict__.copy()
+        state["_pool"] = None
+        return state
 
 
 class MarkovGeostoryGenerator(_GeostoryGenerator):
@@ -81,6 +325,9 @@ class MarkovGeostoryGenerator(_GeostoryGenerator):
     config : str, optional
         The path to a CSV file containing a labeled Markov transition matrix, a default matrix is provided.
         See the MarkovMatrixParser class for more information on format and requirements.
+    label_dtype : dtype, optional
+        Compute models as integer rock labels of this type (np.int8 or np.int16), see GeoModel.
+        Default is None, for float models with NaN air.
     """
 
     _START_STATE = "BaseStrata"  # Name of the Markov chain start state, must reference valid events class
@@ -90,44 +337,117 @@ class MarkovGeostoryGenerator(_GeostoryGenerator):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.markov_matrix_parser = MarkovMatrixParser(self.config)
-        self.mc: MarkovChain = self.markov_matrix_parser.get_markov_chain()
+        self.sampler = self.markov_matrix_parser.get_sampler()
         self.event_dictionary = self.markov_matrix_parser.get_event_dictionary()
-
-    def build_sentence(self) -> List[str]:
-        """Build a geological sentence from a Markov chain."""
-        sequence = self._build_markov_sequence()
+        self._mc = None
+
+    @property
+    def mc(self) -> "MarkovChain":
+        """The pydtmc MarkovChain of the transition matrix, built on first use. Requires pydtmc."""
+        if self._mc is None:
+            self._mc = self.markov_matrix_parser.get_markov_chain()
+        return self._mc
+
+    def build_sentence(self, rng=None) -> List[str]:
+        """Build a geological sentence from a Markov chain, with all events sharing one generator."""
+        rng = rng if rng is not None else np.random.default_rng()
+        sequence = self._build_markov_sequence(rng)
         # Instantiate the event classes from the sequence
-        sentence = [self.event_dictionary[state]() for state in sequence]
+        sentence = [self.event_dictionary[state](seed=rng) for state in sequence]
         return sentence
 
-    def build_geostory(self):
+    def build_geostory(self, rng=None):
         """Build a geological history from a Markov chain."""
-        sentence = self.build_sentence()
+        sentence = self.build_sentence(rng)
         # Generate the history from the instantiated events
         history = [word.generate() for word in sentence]
         return history
 
-    def _build_markov_sequence(self) -> List[str]:
+    def _build_markov_sequence(self, rng=None) -> List[str]:
         """Generate a list of dictionary keys using the Markov chain."""
-        sequence = self.mc.simulate(
-            steps=self._MAX_STEPS,
-            initial_state=self._START_STATE,
-            final_state=self._END_STATE,
+        return self.build_markov_sequences(1, rng)[0]
+
+    def build_markov_sequences(self, n, rng=None) -> List[List[str]]:
+        """
+        Draw n event sequences from the Markov chain at once.
+
+        Sequences start with the start state and stop at the end state or after the maximum number
+        of steps, see MarkovSequenceSampler.
+        """
+        return self.sampler.sample(
+            n, start=self._START_STATE, max_steps=self._MAX_STEPS, end=self._END_STATE, rng=rng
         )
-        return sequence
 
-    def generate_models(self, n_samples: int = 1) -> List[GeoModel]:
-        """Generate multiple geological models."""
-        models = []
-        for _ in range(n_samples):
-            history = self.build_geostory()
-            model = self._history_to_model(history)
-            models.append(model)
-        return models
+    def generate_models(self, n_samples: int = 1, workers: int = None, ordered: bool = True, seeds=None):
+        """
+        Generate multiple geological models.
+
+        Parameters
+        ----------
+        n_samples : int, optional
+            Number of models to generate. Default is 1.
+        workers : int, optional
+            If given, generate on a persistent pool of worker processes and return compact int8 label
+            volumes instead of GeoModel objects. See `stream_models` for lazy streaming.
+        ordered : bool, optional
+            With workers, whether the returned volumes keep submission order. Default is True.
+        seeds : list of int, optional
+            One seed per model. A model generated from a seed is identical whether it is generated
+            sequentially or on a worker. Fresh entropy is used if not provided.
+
+        Returns
+        -------
+        list of GeoModel or list of np.ndarray
+            GeoModels when generating sequentially, label volumes when using workers.
+        """
+        if workers:
+            stream = self.stream_models(n_samples, workers, ordered=ordered, seeds=seeds)
+            return [labels for labels, _ in stream]
 
-    def generate_model(self) -> GeoModel:
-        """Generate a single geological model."""
-        return self.generate_models(1)[0]
+        if seeds is None:
+            seeds = [None] * n_samples
+        elif len(seeds) != n_samples:
+            raise ValueError(f"Expected {n_samples} seeds, got {len(seeds)}.")
+        return [self.generate_model(seed) for seed in seeds]
+
+    def generate_model(self, seed=None, model: GeoModel = None) -> GeoModel:
+        """
+        Generate a single geological model.
+
+        Parameters
+        ----------
+        seed : int | np.random.SeedSequence | np.random.Generator, optional
+            Seed for every random choice made for the model, from the Markov sentence to the height
+            normalization. The same seed always produces the same model.
+        model : GeoModel, optional
+            A model with the bounds and resolution of the generator to compute into, replacing its
+            history and data, instead of a new GeoModel. Default is None.
+
+        Returns
+        -------
+        GeoModel
+            The computed and height normalized model.
+        """
+        rng = np.random.default_rng(seed)
+        history = self.build_geostory(rng)
+        if self.cost_budget is not None:
+            history = self._fit_history_to_budget(history, rng)
+        return self._history_to_model(history, rng, model)
+
+    def _fit_history_to_budget(self, history: List[GeoProcess], rng) -> List[GeoProcess]:
+        """Bring a history within the cost budget following the budget policy."""
+        if self.cost_budget.policy == "resample":
+            cheapest, cheapest_cost = history, self.estimate_cost(history)
+            attempts = 0
+            while not self.cost_budget.allows(cheapest_cost) and attempts < self.cost_budget.max_attempts:
+                candidate = self.build_geostory(rng)
+                cost = self.estimate_cost(candidate)
+                if cost.seconds < cheapest_cost.seconds or self.cost_budget.allows(cost):
+                    cheapest, cheapest_cost = candidate, cost
+                attempts += 1
+            history = cheapest
+        # Downgrading is a no-op for histories within budget
+        return self._downgrade_history(history)
 
 
 class MarkovMatrixParser:
@@ -303,7 +623,16 @@ class MarkovMatrixParser:
     def get_transition_matrix(self):
         return self.transition_matrix
 
-    def get_markov_chain(self) -> MarkovChain:
+    def get_sampler(self) -> MarkovSequenceSampler:
+        return MarkovSequenceSampler(self.transition_matrix, self.markov_states)
+
+    def get_markov_chain(self) -> "MarkovChain":
+        # pydtmc is an optional dependency, only needed for the MarkovChain analysis tools
+        try:
+            from pydtmc import MarkovChain
+        except ImportError as e:
+            raise ImportError("pydtmc is required for get_markov_chain, install it with `pip install PyDTMC`.") from e
+
         # Create the MarkovChain library object
         mc = MarkovChain(self.transition_matrix, self.markov_states)
         return mc
@@ -0,0 +1,166 @@
+""" Process-pool bulk generation of compact label volumes from a geostory generator. """
+
+import multiprocessing as mp
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from geogen.model.cache import history_fingerprint
+
+# Per-process state of a pool worker, populated once by the pool initializer
+_worker_state = {}
+
+
+def _init_worker(generator_cls, generator_kwargs, shared_buffer, slot_shape):
+    """Build the worker's generator once and attach to the shared label slots."""
+    _worker_state["generator"] = generator_cls(**generator_kwargs)
+    _worker_state["slots"] = np.frombuffer(shared_buffer, dtype=np.int8).reshape(slot_shape)
+
+
+def _generate_into_slot(seed, slot):
+    """Generate one model from a seed and write its int8 labels into a shared slot."""
+    model = _worker_state["generator"].generate_model(seed=seed)
+    model.fill_nans()
+    _worker_state["slots"][slot] = model.get_data_grid()
+    return {"seed": seed, "history": model.get_history_string(), "fingerprint": history_fingerprint(model.history)}
+
+
+class GeneratorPool:
+    """
+    A persistent process pool that generates geological models and returns them as compact
+    int8 label volumes.
+
+    Each worker builds its own generator once at start-up. Tasks only carry a seed and a slot
+    index; the worker writes the label volume into a preallocated shared memory slot and returns
+    a small metadata dictionary. No GeoModel objects cross the process boundary.
+
+    Parameters
+    ----------
+    generator_cls : type
+        The generator class to instantiate in each worker, e.g. MarkovGeostoryGenerator.
+    generator_kwargs : dict
+        Keyword arguments used to build the generator in each worker.
+    resolution : tuple
+        The (nx, ny, nz) resolution of the generated label volumes.
+    workers : int
+        Number of worker processes.
+    max_in_flight : int, optional
+        Maximum number of samples being generated or waiting to be consumed at once. This bounds
+        the shared memory to max_in_flight label volumes. Default is 2 * workers.
+    mp_context : str, optional
+        The multiprocessing start method ('fork', 'spawn', 'forkserver'). Default is the platform default.
+    """
+
+    def __init__(self, generator_cls, generator_kwargs, resolution, workers, max_in_flight=None, mp_context=None):
+        if workers < 1:
+            raise ValueError(f"Number of workers must be at least 1, got {workers}.")
+        self.workers = workers
+        self.max_in_flight = max_in_flight or 2 * workers
+        self.resolution = tuple(resolution)
+
+        ctx = mp.get_context(mp_context)
+        slot_shape = (self.max_in_flight, *self.resolution)
+        self._shared_buffer = ctx.RawArray("b", int(np.prod(slot_shape)))
+        self._slots = np.frombuffer(self._shared_buffer, dtype=np.int8).reshape(slot_shape)
+
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(generator_cls, generator_kwargs, self._shared_buffer, slot_shape),
+        )
+        self._cancel_event = threading.Event()
+        self._active = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def imap(self, seeds, ordered=True, out=None):
+        """
+        Stream generated label volumes for a sequence of seeds.
+
+        Parameters
+        ----------
+        seeds : iterable of int
+            One seed per sample to generate.
+        ordered : bool, optional
+            If True, samples are yielded in the order of the seeds. If False, samples are yielded as
+            soon as any worker finishes. Default is True.
+        out : np.ndarray, optional
+            An int8 array of shape (len(seeds), *resolution). Sample i is copied from its shared slot
+            straight into out[i], which is yielded, instead of into a new array.
+
+        Yields
+        ------
+        tuple of (np.ndarray, dict)
+            An int8 label volume of shape `resolution` owned by the caller, and the sample metadata.
+        """
+        if self._active:
+            raise RuntimeError("GeneratorPool only supports one active stream at a time.")
+        self._active = True
+        self._cancel_event.clear()
+
+        seed_iter = enumerate(seeds)
+        free_slots = deque(range(self.max_in_flight))
+        pending = {}  # future -> (slot index, sample index)
+        submitted = deque()  # futures in submission order for ordered streaming
+
+        def submit_next():
+            index, seed = next(seed_iter, (None, None))
+            if seed is None:
+                return False
+            slot = free_slots.popleft()
+            future = self._executor.submit(_generate_into_slot, int(seed), slot)
+            pending[future] = (slot, index)
+            submitted.append(future)
+            return True
+
+        try:
+            while free_slots and submit_next():
+                pass
+
+            while pending and not self._cancel_event.is_set():
+                if ordered:
+                    future = submitted.popleft()
+                    future.result()
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    future = done.pop()
+                    submitted.remove(future)
+
+                slot, index = pending.pop(future)
+                metadata = future.result()
+                if out is None:
+                    labels = self._slots[slot].copy()
+                else:
+                    labels = out[index]
+                    labels[...] = self._slots[slot]
+                free_slots.append(slot)
+                submit_next()
+
+                yield labels, metadata
+        finally:
+            self._drain(pending)
+            self._active = False
+
+    def _drain(self, pending):
+        """Cancel queued tasks and wait for running ones so their slots can be safely reused."""
+        for future in pending:
+            future.cancel()
+        running = [future for future in pending if not future.cancelled()]
+        wait(running)
+        pending.clear()
+
+    def cancel(self):
+        """Stop the active stream after the sample currently being consumed."""
+        self._cancel_event.set()
+
+    def close(self):
+        """Cancel any outstanding work and shut down the worker processes."""
+        self.cancel()
+        self._executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,229 @@
+"""
+Profiling of the generation and compute cost of GeoWords, for tuning the word mix for throughput.
+
+Run as a script to print a table and optionally write JSON for trend tracking::
+
+    python -m geogen.generation.profiling --samples 8 --resolution 64 64 64 --json profile.json
+"""
+
+import argparse
+import json
+import platform
+import time
+import tracemalloc
+from typing import List
+
+import numpy as np
+
+import geogen.generation.categorical_events as events
+from geogen.generation.geowords import BOUNDS_X, BOUNDS_Y, BOUNDS_Z, GeoWord, InfiniteSedimentUniform
+from geogen.model import GeoModel
+from geogen.probability import derive_seed
+
+_BASE_STRATA_SEED = 0  # All words are computed on top of the same base strata
+
+
+class WordProfile:
+    """
+    The measured costs of K seeded instances of one GeoWord.
+
+    Attributes
+    ----------
+    name : str
+        The name of the word class.
+    samples : dict
+        Lists of the per instance 'build_seconds', 'compute_seconds', 'peak_bytes' and 'snapshots'.
+    """
+
+    METRICS = ("build_seconds", "compute_seconds", "peak_bytes", "snapshots")
+
+    def __init__(self, name):
+        self.name = name
+        self.samples = {metric: [] for metric in self.METRICS}
+
+    def __repr__(self):
+        return f"WordProfile(name={self.name}, samples={len(self.samples['build_seconds'])})"
+
+    def summary(self):
+        """The mean, median, 90th percentile and maximum of each metric."""
+        summary = {}
+        for metric, values in self.samples.items():
+            values = np.asarray([v for v in values if v is not None], dtype=np.float64)
+            if values.size == 0:
+                continue
+            summary[metric] = {
+                "mean": float(values.mean()),
+                "median": float(np.median(values)),
+                "p90": float(np.percentile(values, 90)),
+                "max": float(values.max()),
+            }
+        return summary
+
+
+def default_profile_words() -> List[type]:
+    """Every categorical event class followed by the GeoWord classes of its cases."""
+    words = []
+    for name in events.__all__:
+        category = getattr(events, name)
+        case_words = [type(p) for case in category().cases for p in case.processes if isinstance(p, GeoWord)]
+        for word in [category, *case_words]:
+            if word not in words:
+                words.append(word)
+    return words
+
+
+def profile_geowords(
+    words=None,
+    n_samples=8,
+    resolution=(64, 64, 64),
+    bounds=None,
+    seed=0,
+    measure_memory=True,
+) -> List[WordProfile]:
+    """
+    Measure the cost of building and computing seeded instances of GeoWords.
+
+    Each instance is computed on top of the same base strata, without height normalization. The
+    compute time is measured first, then the peak memory is measured with tracemalloc in a second
+    computation, since tracing slows down the allocations.
+
+    Parameters
+    ----------
+    words : list of type, optional
+        The GeoWord classes to profile. Default is `default_profile_words()`.
+    n_samples : int, optional
+        Number of seeded instances of each word. Default is 8.
+    resolution : tuple, optional
+        The model resolution. Default is (64, 64, 64).
+    bounds : tuple, optional
+        The model bounds. Default is the generator bounds.
+    seed : int, optional
+        Base seed, instance k of every word uses the seed `derive_seed(seed, k)`. Default is 0.
+    measure_memory : bool, optional
+        Whether to measure the peak memory. Default is True.
+
+    Returns
+    -------
+    list of WordProfile
+        One profile per word, in the order of `words`.
+    """
+    words = words if words is not None else default_profile_words()
+    bounds = bounds or (BOUNDS_X, BOUNDS_Y, BOUNDS_Z)
+    base_strata = InfiniteSedimentUniform(seed=_BASE_STRATA_SEED).generate()
+
+    profiles = []
+    for word in words:
+        profile = WordProfile(word.__name__)
+        for k in range(n_samples):
+            start = time.perf_counter()
+            snippet = word(seed=derive_seed(seed, k)).generate()
+            profile.samples["build_seconds"].append(time.perf_counter() - start)
+
+            model = GeoModel(bounds=bounds, resolution=resolution)
+            model.add_history([base_strata, snippet])
+            model.compute_model(keep_snapshots=False)
+            profile.samples["compute_seconds"].append(model.compute_stats["seconds"])
+            profile.samples["snapshots"].append(len(model.snapshot_indices))
+
+            peak_bytes = None
+            if measure_memory:
+                model.clear_data()
+                tracemalloc.start()
+                try:
+                    model.compute_model(keep_snapshots=False)
+                    peak_bytes = tracemalloc.get_traced_memory()[1]
+                finally:
+                    tracemalloc.stop()
+            profile.samples["peak_bytes"].append(peak_bytes)
+        profiles.append(profile)
+    return profiles
+
+
+def profile_table(profiles: List[WordProfile]) -> str:
+    """Format profiles as a text table of median and 90th percentile costs, most expensive first."""
+    header = (
+        f"{'word':<28}{'build ms':>10}{'compute ms':>12}{'p90 ms':>10}"
+        f"{'max ms':>10}{'peak MB':>10}{'snapshots':>11}"
+    )
+    lines = [header, "-" * len(header)]
+    summaries = [(profile.name, profile.summary()) for profile in profiles]
+    summaries.sort(key=lambda item: item[1]["compute_seconds"]["median"], reverse=True)
+    for name, summary in summaries:
+        compute = summary["compute_seconds"]
+        peak = f"{summary['peak_bytes']['median'] / 2**20:10.1f}" if "peak_bytes" in summary else f"{'-':>10}"
+        lines.append(
+            f"{name:<28}{summary['build_seconds']['median'] * 1e3:10.2f}{compute['median'] * 1e3:12.1f}"
+            f"{compute['p90'] * 1e3:10.1f}{compute['max'] * 1e3:10.1f}{peak}"
+            f"{summary['snapshots']['median']:11.1f}"
+        )
+    return "\n".join(lines)
+
+
+def profile_json(profiles: List[WordProfile], path=None, **metadata) -> dict:
+    """
+    Collect profiles in a JSON serializable report, optionally written to a file.
+
+    Parameters
+    ----------
+    profiles : list of WordProfile
+        The profiles.
+    path : str, optional
+        A file to write the report to.
+    **metadata :
+        Run settings recorded in the report, such as the resolution and number of samples.
+
+    Returns
+    -------
+    dict
+        The report with the run metadata, and the summary and raw samples of every word.
+    """
+    report = {
+        "metadata": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            **metadata,
+        },
+        "words": {
+            profile.name: {"summary": profile.summary(), "samples": profile.samples} for profile in profiles
+        },
+    }
+    if path is not None:
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile the build and compute cost of GeoWords.")
+    parser.add_argument("--words", nargs="+", help="Names of GeoWord classes, default is every event and case.")
+    parser.add_argument("--samples", type=int, default=8, help="Seeded instances per word.")
+    parser.add_argument("--resolution", type=int, nargs=3, default=(64, 64, 64), help="Model resolution.")
+    parser.add_argument("--seed", type=int, default=0, help="Base seed of the instances.")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the peak memory measurement.")
+    parser.add_argument("--json", help="Write a JSON report to this path.")
+    args = parser.parse_args(argv)
+
+    words = None
+    if args.words:
+        # The events module also exposes every GeoWord class
+        unknown = [name for name in args.words if not isinstance(getattr(events, name, None), type)]
+        if unknown:
+            parser.error(f"Unknown GeoWord classes: {', '.join(unknown)}")
+        words = [getattr(events, name) for name in args.words]
+
+    profiles = profile_geowords(
+        words,
+        n_samples=args.samples,
+        resolution=tuple(args.resolution),
+        seed=args.seed,
+        measure_memory=not args.no_memory,
+    )
+    print(profile_table(profiles))
+    if args.json:
+        profile_json(profiles, args.json, resolution=args.resolution, samples=args.samples, seed=args.seed)
+
+
+if __name__ == "__main__":
+    main()
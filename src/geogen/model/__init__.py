@@ -1,4 +1,16 @@
+from .cache import ModelCache, UncacheableError, history_fingerprint, history_hash
+from .cost import CostBudget, CostEstimate, CostModel, history_cost_features
 from .deferredparameter import *
+from .disk_cache import DiskCache
 from .geomodel import *
 from .geoprocess import *
 from .metaballs import *
+from .serialization import (
+    MODEL_FILE_SUFFIX,
+    SerializationError,
+    load_model,
+    load_model_spec,
+    register_function,
+    register_type,
+    save_model,
+)
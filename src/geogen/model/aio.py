@@ -0,0 +1,106 @@
+"""
+Executors and supersede-cancellation for the asyncio API of models and generators.
+
+Interactive tools await `GeoModel.acompute_model` and `generator.agenerate_model` to keep their
+event loop responsive. The work runs on a thread or process pool. A request made with a
+`supersede` key cancels the request still pending under the same key, so only the latest request
+of e.g. a slider delivers a result. Work that already started cannot be interrupted. It runs to
+completion on its own copy of the model, and its result is dropped.
+"""
+
+import asyncio
+import os
+import threading
+import weakref
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+_executors = {}
+_default_executor = "thread"
+_lock = threading.Lock()
+
+# The latest pending request of each supersede key
+_pending = weakref.WeakKeyDictionary()
+
+
+def get_executor(executor=None) -> Executor:
+    """
+    Resolve an executor argument of the asyncio API.
+
+    Parameters
+    ----------
+    executor : Executor or str, optional
+        An executor, or 'thread' or 'process' for the shared pools of this module, created on first
+        use with one worker per CPU. Default is the executor set by `set_default_executor`.
+
+    Returns
+    -------
+    Executor
+        The executor to run the work on.
+    """
+    executor = executor if executor is not None else _default_executor
+    if isinstance(executor, Executor):
+        return executor
+    if executor not in ("thread", "process"):
+        raise ValueError(f"executor must be an Executor, 'thread' or 'process', got {executor!r}.")
+    with _lock:
+        if executor not in _executors:
+            pool_cls = ThreadPoolExecutor if executor == "thread" else ProcessPoolExecutor
+            _executors[executor] = pool_cls(max_workers=os.cpu_count())
+        return _executors[executor]
+
+
+def set_default_executor(executor):
+    """Set the executor used when none is passed, an Executor or 'thread' (the default) or 'process'."""
+    global _default_executor
+    if not isinstance(executor, Executor) and executor not in ("thread", "process"):
+        raise ValueError(f"executor must be an Executor, 'thread' or 'process', got {executor!r}.")
+    _default_executor = executor
+
+
+def shutdown_executors(wait=True):
+    """Shut down the shared thread and process pools, they are recreated when used again."""
+    with _lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=wait, cancel_futures=True)
+
+
+async def run_in_executor(func, *args, executor=None, supersede=None):
+    """
+    Run a function on an executor and await its result.
+
+    Parameters
+    ----------
+    func : callable
+        The function, picklable when run on a process pool.
+    *args :
+        Arguments of the function.
+    executor : Executor or str, optional
+        The executor, see `get_executor`.
+    supersede : object, optional
+        A weak referenceable key. A pending request under the same key is cancelled, and this
+        request is in turn cancelled by the next one. Default is None for no cancellation.
+
+    Returns
+    -------
+    object
+        The result of the function.
+
+    Raises
+    ------
+    asyncio.CancelledError
+        If the request was superseded or the awaiting task was cancelled.
+    """
+    future = asyncio.wrap_future(get_executor(executor).submit(func, *args))
+    if supersede is not None:
+        previous = _pending.get(supersede)
+        if previous is not None:
+            # Cancelling the asyncio future also cancels the executor task if it did not start
+            previous.cancel()
+        _pending[supersede] = future
+    try:
+        return await future
+    finally:
+        if supersede is not None and _pending.get(supersede) is future:
+            del _pending[supersede]
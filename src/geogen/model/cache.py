@@ -0,0 +1,260 @@
+"""
+A content-addressed on-disk cache of computed models.
+
+A model is identified by a canonical hash of its history parameters, bounds, resolution, dtypes
+and the geogen version, so the same history computed anywhere on the machine is computed once::
+
+    cache = ModelCache()
+    model.compute_model(cache=cache)  # Computed and stored, or loaded in milliseconds
+"""
+
+import functools
+import hashlib
+import os
+import struct
+import types
+
+import numpy as np
+
+import geogen
+from geogen.model.disk_cache import DiskCache
+
+
+class UncacheableError(TypeError):
+    """A history holds an object without a stable encoding, such as a random generator."""
+
+
+class _Encoder:
+    """Feeds a canonical, type tagged encoding of nested objects to a hash."""
+
+    def __init__(self, hasher, digits=None):
+        self.hasher = hasher
+        self.digits = digits  # Significant digits floats are rounded to, None for exact floats
+        self._stack = set()  # Ids of the objects being encoded, to encode cycles as back references
+
+    def _float(self, value):
+        value = float(value)
+        if self.digits is not None:
+            value = float(f"{value:.{self.digits}g}")
+        return value.hex().encode()
+
+    def _write(self, tag, payload=b""):
+        self.hasher.update(tag + struct.pack("<Q", len(payload)) + payload)
+
+    def encode(self, obj):
+        if obj is None or isinstance(obj, (bool, np.bool_)):
+            self._write(b"b", repr(None if obj is None else bool(obj)).encode())
+        elif isinstance(obj, (int, np.integer)):
+            self._write(b"i", str(int(obj)).encode())
+        elif isinstance(obj, (float, np.floating)):
+            # Exact unless rounded, and NaN (a runtime placeholder in several processes) is stable
+            self._write(b"f", self._float(obj))
+        elif isinstance(obj, str):
+            self._write(b"s", obj.encode())
+        elif isinstance(obj, np.ndarray):
+            if obj.dtype.hasobject:
+                self._write(b"A", repr(obj.shape).encode())
+                self._encode_items(obj.ravel().tolist())
+            elif obj.dtype.kind == "f" and self.digits is not None:
+                self._write(b"A", repr(obj.shape).encode())
+                self._write(b"d", b"".join(self._float(value) for value in obj.ravel()))
+            else:
+                self._write(b"a", f"{obj.dtype.str}{obj.shape}".encode())
+                self._write(b"d", np.ascontiguousarray(obj).tobytes())
+        elif isinstance(obj, np.random.Generator):
+            raise UncacheableError("Random generators make the computation non-deterministic.")
+        elif isinstance(obj, (type, types.BuiltinFunctionType, np.dtype)):
+            self._write(b"t", self._qualified_name(obj).encode())
+        elif id(obj) in self._stack:
+            self._write(b"r", type(obj).__qualname__.encode())  # A process referencing itself
+        else:
+            self._stack.add(id(obj))
+            try:
+                self._encode_container(obj)
+            finally:
+                self._stack.discard(id(obj))
+
+    def _encode_container(self, obj):
+        if isinstance(obj, (list, tuple)):
+            self._write(b"l" if isinstance(obj, list) else b"u", str(len(obj)).encode())
+            self._encode_items(obj)
+        elif isinstance(obj, dict):
+            self._write(b"m", str(len(obj)).encode())
+            for key in sorted(obj, key=repr):
+                self.encode(key)
+                self.encode(obj[key])
+        elif isinstance(obj, functools.partial):
+            self._write(b"p")
+            self._encode_items([obj.func, obj.args, obj.keywords])
+        elif isinstance(obj, types.MethodType):
+            self._write(b"M", obj.__func__.__qualname__.encode())
+            self.encode(obj.__self__)
+        elif isinstance(obj, types.FunctionType):
+            # Functions are identified by name, closures and defaults by value. The geogen version in
+            # the key covers changes to the code of geogen functions.
+            self._write(b"F", self._qualified_name(obj).encode())
+            cells = [cell.cell_contents for cell in obj.__closure__ or ()]
+            self._encode_items([cells, obj.__defaults__, obj.__kwdefaults__])
+        elif hasattr(obj, "__dict__"):
+            self._write(b"o", self._qualified_name(type(obj)).encode())
+            self.encode(vars(obj))
+        else:
+            raise UncacheableError(f"No stable encoding for {type(obj).__name__} objects.")
+
+    def _encode_items(self, items):
+        for item in items:
+            self.encode(item)
+
+    @staticmethod
+    def _qualified_name(obj):
+        if isinstance(obj, np.dtype):
+            return obj.str
+        return f"{getattr(obj, '__module__', '')}.{obj.__qualname__}"
+
+
+def history_hash(history, bounds, resolution, dtype=np.float32, label_dtype=None, height_tracking=True):
+    """
+    A canonical hash of everything that determines a computed model.
+
+    Parameters
+    ----------
+    history : list of GeoProcess
+        The packed history of the model.
+    bounds, resolution, dtype, label_dtype, height_tracking :
+        The model settings, see GeoModel.
+
+    Returns
+    -------
+    str
+        A hex SHA-256 digest.
+
+    Raises
+    ------
+    UncacheableError
+        If the history holds an object without a stable encoding.
+    """
+    hasher = hashlib.sha256()
+    encoder = _Encoder(hasher)
+    settings = [
+        geogen.__version__,
+        tuple(tuple(float(b) for b in axis) for axis in bounds),
+        tuple(int(r) for r in resolution),
+        np.dtype(dtype),
+        None if label_dtype is None else np.dtype(label_dtype),
+        bool(height_tracking),
+    ]
+    encoder.encode(settings)
+    encoder.encode(list(history))
+    return hasher.hexdigest()
+
+
+def history_fingerprint(history, digits=None):
+    """
+    A stable fingerprint of a geological history, computed without running the model.
+
+    Equal histories have equal fingerprints across processes, pickling and lean saves.
+
+    Parameters
+    ----------
+    history : list of GeoProcess
+        The packed history, e.g. `model.history`.
+    digits : int, optional
+        Round every float parameter to this many significant digits, so histories differing only
+        by tiny amounts share a fingerprint. Default is None for exact parameters.
+
+    Returns
+    -------
+    str or None
+        A hex SHA-256 digest, or None if the history holds an object without a stable encoding.
+    """
+    hasher = hashlib.sha256()
+    try:
+        _Encoder(hasher, digits=digits).encode(list(history))
+    except UncacheableError:
+        return None
+    return hasher.hexdigest()
+
+
+class ModelCache(DiskCache):
+    """
+    A content-addressed cache of computed model data on local disk.
+
+    Entries are compressed .npz files named by `history_hash`. Storage, atomic writes and least
+    recently used eviction are those of `DiskCache`, so any number of processes share one cache
+    directory without locks.
+
+    Parameters
+    ----------
+    cache_dir : str, optional
+        Directory of the cache. Default is 'geogen/models' in the user cache directory, shared by
+        every program of the user on the machine.
+    max_bytes : int, optional
+        Disk budget, the least recently used entries are evicted beyond it. Default is 10 GB.
+    snapshots : bool, optional
+        Whether to also store the mesh and data snapshots, which are much larger than the labels.
+        Without them, a model loaded from the cache has no snapshots. Default is False.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=10 * 1024**3, snapshots=False):
+        if cache_dir is None:
+            user_cache = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+            cache_dir = os.path.join(user_cache, "geogen", "models")
+        super().__init__(cache_dir, max_bytes)
+        self.snapshots = snapshots
+
+    def __contains__(self, key):
+        return os.path.exists(self._entry_path(key))
+
+    def key(self, model):
+        """The cache key of a model, or None if its history can not be cached."""
+        try:
+            return history_hash(
+                model.history, model.bounds, model.resolution, model.dtype, model.label_dtype, model.height_tracking
+            )
+        except UncacheableError:
+            return None
+
+    def load(self, model, key, keep_snapshots=True):
+        """
+        Fill a model with its cached data.
+
+        Parameters
+        ----------
+        model : GeoModel
+            The model, with the history the key was computed from.
+        key : str
+            The cache key of the model.
+        keep_snapshots : bool, optional
+            Whether snapshots are requested. A cache storing snapshots misses entries without them.
+
+        Returns
+        -------
+        bool
+            Whether the model was found and loaded.
+        """
+        entry = self._read(key)
+        if entry is None or "data" not in entry:
+            return False
+        if keep_snapshots and self.snapshots and "mesh_snapshots" not in entry:
+            return False
+
+        model.clear_data()
+        model._setup_mesh()
+        model.data = entry["data"]
+        model.history_unpacked = model._unpack_history()
+        if keep_snapshots and "mesh_snapshots" in entry:
+            model.snapshot_indices = entry["snapshot_indices"].tolist()
+            model.mesh_snapshots = entry["mesh_snapshots"]
+            model.data_snapshots = entry["data_snapshots"]
+        return True
+
+    def store(self, model, key):
+        """Atomically store the data of a computed model and evict old entries if over budget."""
+        entry = {"data": model.data}
+        if self.snapshots and model.mesh_snapshots.size:
+            entry.update(
+                snapshot_indices=np.asarray(model.snapshot_indices),
+                mesh_snapshots=model.mesh_snapshots,
+                data_snapshots=model.data_snapshots,
+            )
+        self._write(key, **entry)
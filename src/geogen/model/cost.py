@@ -0,0 +1,328 @@
+""" Prediction of the compute time and peak memory of a geological history before computing it. """
+
+import json
+from typing import NamedTuple
+
+import numpy as np
+from scipy.optimize import nnls
+
+from geogen.model.geomodel import GeoModel
+from geogen.model.geoprocess import CompoundProcess, DeferredParameter, Deposition, Transformation
+from geogen.model.metaballs import MetaBall
+
+
+class CostEstimate(NamedTuple):
+    """Predicted compute time in seconds and peak memory in bytes of a model computation."""
+
+    seconds: float
+    peak_bytes: int
+
+
+def history_cost_features(history):
+    """
+    Count the cost drivers of a geological history without computing it.
+
+    Parameters
+    ----------
+    history : list of GeoProcess
+        The history, compound processes are unpacked into their atomic processes.
+
+    Returns
+    -------
+    dict
+        'units' maps process type names to their number of passes over the points, with one pass per
+        ball for MetaBalls. 'snapshots' is the number of mesh snapshots, 'events' the number of
+        atomic processes and 'deferred' the number of process runs needed to resolve deferred parameters.
+    """
+    unpacked = []
+    for event in history:
+        unpacked.extend(event.unpack() if isinstance(event, CompoundProcess) else [event])
+
+    units = {}
+    deferred = 0
+    for i, event in enumerate(unpacked):
+        name = type(event).__name__
+        units[name] = units.get(name, 0) + (len(event.balls) if isinstance(event, MetaBall) else 1)
+        for value in vars(event).values():
+            if isinstance(value, DeferredParameter):
+                # Backtracking a point runs every later transformation on it
+                deferred += sum(isinstance(e, Transformation) for e in unpacked[i + 1 :]) or 1
+
+    # Same rule as GeoModel._prepare_snapshots: the oldest state and each deposition after a transformation
+    snapshots = 1 + sum(
+        isinstance(unpacked[i], Deposition) and isinstance(unpacked[i - 1], Transformation)
+        for i in range(1, len(unpacked))
+    )
+    return {"units": units, "snapshots": snapshots, "events": len(unpacked), "deferred": deferred}
+
+
+class CostModel:
+    """
+    A linear model of the compute time and peak memory of a geological history.
+
+    The time is the sum over the atomic processes of a per point cost of their type times the
+    number of computed points, plus the cost of setting up the mesh and copying its snapshots, a fixed overhead per process
+    and the cost of resolving deferred parameters. Height normalization adds a few passes at the low
+    normalization resolution. The memory is the size of the arrays allocated by the computation.
+
+    The default coefficients were measured on a single core at 64^3 resolution. They can be
+    recalibrated for the machine at hand from timed computations with `record` and `fit`, and kept
+    between runs with `save` and `load`.
+
+    Parameters
+    ----------
+    point_costs : dict, optional
+        Seconds per point and pass of process types, overriding the defaults.
+    mesh_cost : float, optional
+        Seconds per point to set up and clean up the mesh.
+    snapshot_cost : float, optional
+        Seconds per point to store and restore one mesh snapshot.
+    event_cost : float, optional
+        Fixed seconds per atomic process.
+    deferred_cost : float, optional
+        Seconds per process run to resolve deferred parameters.
+    memory_scale : float, optional
+        Calibration factor of the predicted memory. Default is 1.0.
+    """
+
+    # fmt: off
+    DEFAULT_POINT_COSTS = {
+        "Bedrock": 3e-9, "Sedimentation": 8e-9, "UnconformityBase": 4e-9, "UnconformityDepth": 8e-9,
+        "Layer": 5e-9, "Shift": 5e-9, "Rotate": 20e-9, "Tilt": 21e-9, "Fold": 76e-9, "Fault": 38e-9,
+        "Shear": 38e-9, "DikePlane": 52e-9, "DikeColumn": 40e-9, "DikeHemisphere": 203e-9,
+        "PushHemisphere": 297e-9, "DikePlug": 100e-9, "PushPlug": 150e-9, "MetaBall": 1.3e-9,
+    }
+    DEFAULT_POINT_COST = 50e-9  # For process types without a measured cost
+    NORMALIZATION_PASSES = 2  # Typical number of low resolution computations of the height normalization
+    WORKING_COPIES = 6  # Temporary float64 copies of the mesh made by transformations
+    # fmt: on
+
+    def __init__(
+        self,
+        point_costs=None,
+        mesh_cost=80e-9,
+        snapshot_cost=4e-9,
+        event_cost=3e-5,
+        deferred_cost=3e-5,
+        memory_scale=1.0,
+    ):
+        self.point_costs = {**self.DEFAULT_POINT_COSTS, **(point_costs or {})}
+        self.mesh_cost = mesh_cost
+        self.snapshot_cost = snapshot_cost
+        self.event_cost = event_cost
+        self.deferred_cost = deferred_cost
+        self.memory_scale = memory_scale
+        self.records = []  # Cost features and measurements of timed computations
+
+    def __repr__(self):
+        return f"CostModel(process_types={len(self.point_costs)}, records={len(self.records)})"
+
+    @staticmethod
+    def _num_points(resolution, height_tracking=True):
+        """Number of computed points of a model, with the height tracking bars."""
+        bars = 10 * GeoModel.HEIGHT_BAR_RESOLUTION if height_tracking else 0
+        return int(np.prod(resolution)) + bars
+
+    def _design_row(self, features, points, low_res_points, passes):
+        """Coefficient names and their multipliers in the predicted time of one computation."""
+        total_points = points + passes * low_res_points
+        runs = 1 + passes
+        row = {f"point:{name}": units * total_points for name, units in features["units"].items()}
+        row["mesh"] = total_points
+        row["snapshot"] = features["snapshots"] * total_points
+        row["event"] = features["events"] * runs
+        row["deferred"] = features["deferred"] * runs
+        return row
+
+    def _get_coefficient(self, name):
+        if name.startswith("point:"):
+            return self.point_costs.get(name[len("point:") :], self.DEFAULT_POINT_COST)
+        return getattr(self, f"{name}_cost")
+
+    def _set_coefficient(self, name, value):
+        if name.startswith("point:"):
+            self.point_costs[name[len("point:") :]] = value
+        else:
+            setattr(self, f"{name}_cost", value)
+
+    def estimate(
+        self,
+        history,
+        resolution,
+        dtype=np.float32,
+        label_dtype=None,
+        height_tracking=True,
+        normalize=False,
+        low_res=(8, 8, 64),
+    ) -> CostEstimate:
+        """
+        Predict the cost of computing a history.
+
+        Parameters
+        ----------
+        history : list of GeoProcess
+            The geological history.
+        resolution : tuple
+            The (x, y, z) model resolution.
+        dtype, label_dtype, height_tracking :
+            The GeoModel settings of the computation.
+        normalize : bool, optional
+            Whether the computation includes the height normalization. Default is False.
+        low_res : tuple, optional
+            The resolution of the height normalization.
+
+        Returns
+        -------
+        CostEstimate
+            The predicted compute time and peak memory.
+        """
+        features = history_cost_features(history)
+        points = self._num_points(resolution, height_tracking)
+        low_res_points = self._num_points(low_res) if normalize else 0
+        passes = self.NORMALIZATION_PASSES if normalize else 0
+
+        row = self._design_row(features, points, low_res_points, passes)
+        seconds = sum(self._get_coefficient(name) * multiplier for name, multiplier in row.items())
+        peak_bytes = self.memory_scale * self._array_bytes(features, resolution, points, dtype, label_dtype)
+        return CostEstimate(seconds, int(peak_bytes))
+
+    def _array_bytes(self, features, resolution, points, dtype, label_dtype):
+        """Size of the arrays allocated by a computation, at its peak in the forward pass."""
+        coord_size = np.dtype(dtype).itemsize
+        data_size = np.dtype(label_dtype if label_dtype is not None else dtype).itemsize
+        grid = 3 * int(np.prod(resolution)) * coord_size  # X, Y and Z meshgrids
+        mesh = 3 * points * coord_size + points * data_size  # xyz and data
+        snapshots = features["snapshots"] * points * (3 * 8 + data_size)  # Mesh snapshots are float64
+        working = self.WORKING_COPIES * 3 * points * 8
+        return grid + mesh + snapshots + working
+
+    def record(self, model, seconds=None, peak_bytes=None):
+        """
+        Record a timed computation of a model for calibration with `fit`.
+
+        Parameters
+        ----------
+        model : GeoModel
+            A computed model, its `compute_stats` give the settings and time of the computation.
+        seconds : float, optional
+            The measured compute time, taken from the model's `compute_stats` if not given.
+        peak_bytes : int, optional
+            The measured peak memory of the computation, if known.
+        """
+        stats = model.compute_stats
+        if not stats:
+            raise ValueError("Model has no compute statistics, compute it first.")
+        if stats.get("cached"):
+            raise ValueError("Model was loaded from a cache, its compute time is not a measurement.")
+        features = history_cost_features(model.history)
+        points = self._num_points(model.resolution, model.height_tracking)
+        normalize = stats["normalize"]
+        self.records.append(
+            {
+                "features": features,
+                "points": points,
+                "low_res_points": self._num_points(stats["low_res"]) if normalize else 0,
+                "passes": self.NORMALIZATION_PASSES if normalize else 0,
+                "seconds": stats["seconds"] if seconds is None else seconds,
+                "peak_bytes": peak_bytes,
+                "array_bytes": self._array_bytes(features, model.resolution, points, model.dtype, model.label_dtype),
+            }
+        )
+
+    def fit(self, prior_weight=1.0):
+        """
+        Fit the coefficients to the recorded computations.
+
+        Time coefficients are fit by non-negative least squares, regularized towards their current
+        values so that process types seen in few records keep sensible costs. Coefficients of process
+        types absent from the records are unchanged. The memory scale is fit to the records with a
+        measured peak memory.
+
+        Parameters
+        ----------
+        prior_weight : float, optional
+            Weight of the current coefficients against the records. Default is 1.0.
+        """
+        if not self.records:
+            raise ValueError("No computations recorded, see CostModel.record.")
+
+        rows = [
+            self._design_row(r["features"], r["points"], r["low_res_points"], r["passes"]) for r in self.records
+        ]
+        names = sorted({name for row in rows for name in row})
+        A = np.array([[row.get(name, 0.0) for name in names] for row in rows], dtype=np.float64)
+        b = np.array([r["seconds"] for r in self.records], dtype=np.float64)
+
+        # Columns span many orders of magnitude, normalize them for a well conditioned solve
+        scale = np.linalg.norm(A, axis=0)
+        scale[scale == 0] = 1.0
+        prior = np.array([self._get_coefficient(name) for name in names]) * scale
+        weights = prior_weight * np.eye(len(names))
+        coefficients, _ = nnls(np.vstack((A / scale, weights)), np.concatenate((b, weights @ prior)))
+        for name, value in zip(names, coefficients / scale):
+            self._set_coefficient(name, float(value))
+
+        ratios = [r["peak_bytes"] / r["array_bytes"] for r in self.records if r["peak_bytes"] is not None]
+        if ratios:
+            self.memory_scale = float(np.median(ratios))
+        return self
+
+    def to_dict(self):
+        """The coefficients as a JSON serializable dictionary."""
+        return {
+            "point_costs": dict(self.point_costs),
+            "mesh_cost": self.mesh_cost,
+            "snapshot_cost": self.snapshot_cost,
+            "event_cost": self.event_cost,
+            "deferred_cost": self.deferred_cost,
+            "memory_scale": self.memory_scale,
+        }
+
+    def save(self, path):
+        """Save the coefficients to a JSON file."""
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        """Load a cost model from a JSON file written by `save`."""
+        with open(path, "r") as f:
+            return cls(**json.load(f))
+
+
+class CostBudget:
+    """
+    A bound on the predicted cost of generated histories.
+
+    Parameters
+    ----------
+    max_seconds : float, optional
+        Maximum predicted compute time of a model.
+    max_bytes : int, optional
+        Maximum predicted peak memory of a model.
+    policy : str, optional
+        'resample' draws new histories until one is within budget, and downgrades the cheapest one
+        found if none is after `max_attempts`. 'downgrade' removes the events of a history that save
+        the most until it is within budget. Default is 'resample'.
+    max_attempts : int, optional
+        Number of histories drawn by the 'resample' policy. Default is 10.
+    """
+
+    POLICIES = ("resample", "downgrade")
+
+    def __init__(self, max_seconds=None, max_bytes=None, policy="resample", max_attempts=10):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown budget policy '{policy}', must be one of {self.POLICIES}.")
+        self.max_seconds = max_seconds
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.max_attempts = max_attempts
+
+    def __repr__(self):
+        return f"CostBudget(max_seconds={self.max_seconds}, max_bytes={self.max_bytes}, policy={self.policy})"
+
+    def allows(self, estimate: CostEstimate) -> bool:
+        """Whether an estimated cost is within the budget."""
+        within_time = self.max_seconds is None or estimate.seconds <= self.max_seconds
+        within_memory = self.max_bytes is None or estimate.peak_bytes <= self.max_bytes
+        return within_time and within_memory
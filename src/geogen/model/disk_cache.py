@@ -0,0 +1,139 @@
+"""
+A least recently used store of compressed arrays on local disk, the storage of the sample and model caches.
+"""
+
+import os
+import tempfile
+
+import numpy as np
+
+
+class DiskCache:
+    """
+    A least recently used store of named entries of arrays, one compressed .npz file per entry.
+
+    Writes go to a temporary file that is atomically renamed into place, so several processes can
+    share one cache directory without locks and a reader never sees a partially written file.
+    Recency is tracked through file modification times, which are refreshed on every hit.
+
+    The total size is tracked as entries are written, and the directory is only scanned when the
+    budget is exceeded, or every `rescan_interval` writes to account for the writes of other
+    processes. Eviction then goes down to `low_water` of the budget, so filling a cache of N
+    entries takes O(N) file operations in total rather than a scan per write.
+
+    Parameters
+    ----------
+    cache_dir : str
+        Directory holding the cache files, created if it does not exist.
+    max_bytes : int, optional
+        Disk budget for the cache. The least recently used entries are evicted once it is exceeded.
+        Default is 10 GB.
+    low_water : float, optional
+        Fraction of the budget the cache is reduced to by an eviction. Default is 0.9.
+    rescan_interval : int, optional
+        Number of writes after which the directory is scanned again for its true size. Default is 1000.
+    """
+
+    _SUFFIX = ".npz"
+
+    def __init__(self, cache_dir, max_bytes=10 * 1024**3, low_water=0.9, rescan_interval=1000):
+        if max_bytes <= 0:
+            raise ValueError(f"Cache budget must be positive, got {max_bytes} bytes.")
+        if not 0.0 < low_water <= 1.0:
+            raise ValueError(f"low_water must be in (0, 1], got {low_water}.")
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.low_water = low_water
+        self.rescan_interval = rescan_interval
+        os.makedirs(cache_dir, exist_ok=True)
+        self._total = self.size_bytes()  # Running estimate of the size of the cache
+        self._writes = 0  # Writes since the last scan
+
+    def _entry_path(self, name):
+        return os.path.join(self.cache_dir, name + self._SUFFIX)
+
+    def _read(self, name):
+        """
+        Load the arrays of an entry and mark it as recently used.
+
+        Returns
+        -------
+        dict of np.ndarray or None
+            The arrays of the entry, or None if it is missing or unreadable.
+        """
+        path = self._entry_path(name)
+        try:
+            with np.load(path) as npz:
+                arrays = {key: npz[key] for key in npz.files}
+            os.utime(path)  # Mark as recently used
+        except (FileNotFoundError, OSError, ValueError, KeyError):
+            # Missing, evicted by another process in the meantime, or unreadable
+            return None
+        return arrays
+
+    def _write(self, name, **arrays):
+        """Atomically store the arrays of an entry and evict old entries if over budget."""
+        path = self._entry_path(name)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez_compressed(f, **arrays)
+                size = f.tell()
+            try:
+                size -= os.path.getsize(path)  # An entry that is replaced
+            except FileNotFoundError:
+                pass
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._total += size
+        self._writes += 1
+        if self._total > self.max_bytes or self._writes >= self.rescan_interval:
+            self.evict()
+
+    def size_bytes(self):
+        """Total size of the cached entries in bytes."""
+        return sum(size for _, _, size in self._entries())
+
+    def _entries(self):
+        """List (mtime, path, size) for all complete cache entries."""
+        entries = []
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(self._SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, entry.path, stat.st_size))
+        return entries
+
+    def evict(self):
+        """Scan the cache and remove least recently used entries down to the low water mark if over budget."""
+        entries = self._entries()
+        total = sum(size for _, _, size in entries)
+        self._writes = 0
+        if total > self.max_bytes:
+            target = self.low_water * self.max_bytes
+            entries.sort()
+            for _, path, size in entries:
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass  # Already evicted by another process
+                total -= size
+        self._total = total
+
+    def clear(self):
+        """Remove all entries from the cache."""
+        for _, path, _ in self._entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self._total = 0
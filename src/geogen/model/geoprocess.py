@@ -9,6 +9,28 @@ import numpy as np
 
 from geogen.model.util import rotate, slip_normal_vectors
 
+# Air (empty) cells are NaN in float data, and this sentinel in integer label data
+EMPTY_LABEL = -1
+
+
+def empty_mask(data):
+    """Boolean mask of the empty (air) cells of a float (NaN) or integer label (EMPTY_LABEL) data array."""
+    if data.dtype.kind == "f":
+        return np.isnan(data)
+    return data == EMPTY_LABEL
+
+
+def empty_value(data):
+    """The value marking empty (air) cells in a data array, NaN for float data or EMPTY_LABEL for labels."""
+    return np.nan if data.dtype.kind == "f" else EMPTY_LABEL
+
+
+def as_data_value(value, data):
+    """Convert a rock value, where NaN means air, to the representation used by a data array."""
+    if data.dtype.kind != "f" and np.isnan(value):
+        return EMPTY_LABEL
+    return value
+
 
 class GeoProcess(_ABC):
     """
@@ -298,7 +320,7 @@ class Layer(Deposition):
         z_coords = xyz[:, 2]
 
         # Create a mask where z is within the specified range and data is None
-        mask = (self.base <= z_coords) & (z_coords <= self.base + self.width) & (np.isnan(data))
+        mask = (self.base <= z_coords) & (z_coords <= self.base + self.width) & empty_mask(data)
 
         # Apply the mask and update data where condition is met
         data[mask] = self.value
@@ -453,8 +475,8 @@ class Sedimentation(Deposition):
         return xyz, data
 
     def get_nan_z_values(self, xyz, data):
-        """Extract z values where data is NaN and return them along with their mask."""
-        nan_idxs = np.isnan(data)
+        """Extract z values where data is empty and return them along with their mask."""
+        nan_idxs = empty_mask(data)
         z_values = xyz[nan_idxs, 2] if np.any(nan_idxs) else np.array([])
         return z_values, nan_idxs
 
@@ -482,7 +504,8 @@ class Sedimentation(Deposition):
             # Bin the z values into the layer (which layer they belong to)
             layer_indices = np.digitize(z_values, boundaries)
             # Map the layer indices to the corresponding value, 0 bin and last bin are out of bounds (no layer)
-            extended_value_list = np.array([np.nan] + self.value_list + [np.nan])
+            empty = empty_value(data)
+            extended_value_list = np.array([empty] + self.value_list + [empty])
             data[nan_idxs] = extended_value_list[layer_indices]
 
     def last_value(self):
@@ -559,7 +582,7 @@ class DikePlane(Deposition):
         M2 = rotate([0.0, 1.0, 0], -self.dip)  # Rotation around y-axis in strike frame for dip
 
         # Prune out NaN points to reduce computation
-        nan_mask = ~np.isnan(data)
+        nan_mask = ~empty_mask(data)
         xyz_rock = xyz[nan_mask]
 
         # Check if xyz_rock has no valid points after applying the mask
@@ -686,7 +709,7 @@ class DikeColumn(Deposition):
 
         mask = (r <= self.diam / 2.0) & (z <= 0) & (z >= (self.origin[2] - self.depth))
         if self.clip:
-            mask &= ~np.isnan(data)
+            mask &= ~empty_mask(data)
         data[mask] = self.value
 
         return xyz, data
@@ -795,7 +818,7 @@ class DikeHemisphere(Deposition):
             inside = z > -self.z_function(x, y)
             mask = inside & (z < 0)
         if self.clip:
-            mask &= ~np.isnan(data)
+            mask &= ~empty_mask(data)
         data[mask] = self.value
 
         return xyz, data
@@ -1137,7 +1160,7 @@ class DikePlug(Deposition):
 
         if self.clip:
             # Clip the plug to not protrude above the surface
-            mask &= ~np.isnan(data)
+            mask &= ~empty_mask(data)
         data[mask] = self.value
 
         return xyz, data
@@ -1302,7 +1325,7 @@ class UnconformityBase(Deposition):
         # Mask for points above the base level
         mask = xyz[:, 2] > self.base
         # Apply the mask and update data where condition is met
-        data[mask] = self.value
+        data[mask] = as_data_value(self.value, data)
 
         # Return the unchanged xyz and the potentially modified data
         return xyz, data
@@ -1337,11 +1360,11 @@ class UnconformityDepth(Deposition):
 
     def run(self, xyz, data):
         # Find the peak of non-NaN data
-        self.peak = np.max(xyz[:, 2][~np.isnan(data)])
+        self.peak = np.max(xyz[:, 2][~empty_mask(data)])
 
         # Erode down
         mask = xyz[:, 2] > self.peak - self.depth
-        data[mask] = self.value
+        data[mask] = as_data_value(self.value, data)
 
         # Return the unchanged xyz and the potentially modified data
         return xyz, data
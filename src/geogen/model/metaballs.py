@@ -4,7 +4,7 @@ from typing import List
 
 import numpy as np
 
-from geogen.model.geoprocess import Deposition
+from geogen.model.geoprocess import Deposition, empty_mask
 
 
 class Ball:
@@ -29,9 +29,11 @@ class BallListGenerator:
     step_range (tuple): The range of uniform sampled step sizes for the metaballs.
     rad_range (tuple): The range of uniform sampled radii for the metaballs. Radius is distance to potential of 1.
     goo_range (tuple): The range of uniform sampled goo factors for the metaballs.
+    rng (np.random.Generator): Random number generator.
     """
 
-    def __init__(self, step_range, rad_range, goo_range):
+    def __init__(self, step_range, rad_range, goo_range, rng=None):
+        self.rng = rng if rng is not None else np.random.default_rng()
         self.step_range = step_range
         self.rad_range = rad_range
         self.goo_range = goo_range
@@ -48,19 +50,19 @@ class BallListGenerator:
         balls = []
         # Set start point and unit direction
         current_point = np.array(origin, dtype=float)
-        previous_direction = np.random.normal(size=3)
+        previous_direction = self.rng.normal(size=3)
         previous_direction /= np.linalg.norm(previous_direction)
 
         for _ in range(n_balls):
-            radius = np.random.uniform(*self.rad_range)
-            goo_factor = np.random.uniform(*self.goo_range)
+            radius = self.rng.uniform(*self.rad_range)
+            goo_factor = self.rng.uniform(*self.goo_range)
             balls.append(Ball(current_point, radius, goo_factor))
 
             # Generate the next point with a Gaussian bias towards the previous direction
-            random_variation = np.random.normal(loc=0, scale=1, size=3)
+            random_variation = self.rng.normal(loc=0, scale=1, size=3)
             direction = previous_direction + variance * random_variation
             direction /= np.linalg.norm(direction)
-            step = direction * np.random.uniform(*self.step_range)
+            step = direction * self.rng.uniform(*self.step_range)
             current_point += step
 
             # Update the previous direction
@@ -127,7 +129,7 @@ class MetaBall(Deposition):
             mask = np.ones(xyz_p.shape[0], dtype=bool)
 
         if self.clip:
-            mask = mask & (~np.isnan(data))
+            mask = mask & (~empty_mask(data))
 
         # apply mask to reduce the computation size
         data_filtered = data[mask]
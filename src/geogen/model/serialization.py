@@ -0,0 +1,305 @@
+"""
+A versioned model file format that is safe to load and does not depend on pickle.
+
+A model file is a zip archive holding a JSON spec of the model settings and history, and
+optionally the model data as a compressed `.npy` block::
+
+    model.geoz
+        model.json         # format version, settings and history spec
+        arrays/data.npy    # optional, the computed data
+
+Processes and parameters are stored by type name and attribute values, and only the registered
+types and functions below are ever instantiated on load. Loading the spec alone reads nothing of
+the array payload, which makes scans over large model databases fast.
+"""
+
+import functools
+import importlib
+import io
+import json
+import math
+import types
+import zipfile
+
+import numpy as np
+
+import geogen
+from geogen.model.geomodel import GeoModel
+from geogen.model.geoprocess import DeferredParameter, GeoProcess
+from geogen.model.metaballs import Ball
+
+MODEL_FORMAT_VERSION = 1
+MODEL_FILE_SUFFIX = ".geoz"
+_SPEC_MEMBER = "model.json"
+_DATA_MEMBER = "arrays/data.npy"
+
+# Types and functions outside of geogen.model, imported when first needed as "module:qualname"
+_types = {
+    "DikePlaneWord.OrganicDikeThicknessFunc": "geogen.generation.geowords:DikePlaneWord.OrganicDikeThicknessFunc",
+    "SillWord.EllipsoidShapingFunction": "geogen.generation.geowords:SillWord.EllipsoidShapingFunction",
+    "_HemiPushedWord.HemiFunction": "geogen.generation.geowords:_HemiPushedWord.HemiFunction",
+    "Ball": Ball,
+}
+_functions = {
+    "damped_fourier_wave_fun": "geogen.probability.wavegenerators:damped_fourier_wave_fun",
+}
+
+
+class SerializationError(ValueError):
+    """A model holds an object the format can not store, or a file holds an unknown type."""
+
+
+def register_type(cls, name=None):
+    """
+    Register a class whose instances are stored by their attributes, e.g. a shaping function class.
+
+    Subclasses of GeoProcess and DeferredParameter are registered automatically. Can be used as a
+    class decorator.
+
+    Parameters
+    ----------
+    cls : type
+        The class, instances are rebuilt without calling `__init__`, from their stored attributes.
+    name : str, optional
+        The name of the type in model files. Default is the qualified name of the class.
+    """
+    _types[name or cls.__qualname__] = cls
+    return cls
+
+
+def register_function(func, name=None):
+    """Register a function that may be stored in a model, directly or as a functools.partial."""
+    _functions[name or func.__qualname__] = func
+    return func
+
+
+def _resolve(registry, name):
+    """Look up a registered object, importing it on first use."""
+    target = registry.get(name)
+    if isinstance(target, str):
+        module, qualname = target.split(":")
+        target = importlib.import_module(module)
+        for attr in qualname.split("."):
+            target = getattr(target, attr)
+        registry[name] = target
+    return target
+
+
+def _all_subclasses(cls):
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from _all_subclasses(subclass)
+
+
+def _type_by_name(name):
+    cls = _resolve(_types, name)
+    if cls is None:
+        # Processes and parameters are registered by being subclasses
+        cls = next(
+            (c for base in (GeoProcess, DeferredParameter) for c in _all_subclasses(base) if c.__qualname__ == name),
+            None,
+        )
+    if cls is None:
+        raise SerializationError(f"Unknown type '{name}' in model file.")
+    return cls
+
+
+def _type_name(cls):
+    if issubclass(cls, (GeoProcess, DeferredParameter)):
+        return cls.__qualname__
+    for name in _types:
+        if _resolve(_types, name) is cls:
+            return name
+    raise SerializationError(f"Type {cls.__qualname__} is not registered, see register_type.")
+
+
+def _function_name(func):
+    for name in _functions:
+        if _resolve(_functions, name) is func:
+            return name
+    raise SerializationError(f"Function {func.__qualname__} is not registered, see register_function.")
+
+
+def _encode(value, owner=None):
+    """Encode a value as JSON compatible data, JSON objects are always tagged with a '$' key."""
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, (np.bool_, np.integer)):
+        return value.item()
+    if isinstance(value, (float, np.floating)):
+        value = float(value)
+        return value if math.isfinite(value) else {"$float": repr(value)}
+    if isinstance(value, int):
+        return value
+    if isinstance(value, list):
+        return [_encode(v, owner) for v in value]
+    if isinstance(value, tuple):
+        return {"$tuple": [_encode(v, owner) for v in value]}
+    if isinstance(value, dict):
+        if not all(isinstance(k, str) for k in value):
+            raise SerializationError("Only dictionaries with string keys can be stored.")
+        return {"$dict": {k: _encode(v, owner) for k, v in value.items()}}
+    if isinstance(value, np.ndarray):
+        if value.dtype.hasobject:
+            raise SerializationError("Object arrays can not be stored.")
+        values = [_encode(v) for v in value.ravel().tolist()]
+        return {"$array": values, "dtype": value.dtype.str, "shape": value.shape}
+    if isinstance(value, functools.partial):
+        return {
+            "$partial": _function_name(value.func),
+            "args": _encode(list(value.args), owner),
+            "keywords": _encode(value.keywords, owner),
+        }
+    if isinstance(value, types.MethodType):
+        if value.__self__ is not owner:
+            raise SerializationError(f"Only methods of the object holding them can be stored, got {value}.")
+        return {"$method": value.__func__.__name__}
+    if isinstance(value, types.FunctionType):
+        return {"$function": _function_name(value)}
+    if isinstance(value, type):
+        return {"$type": _type_name(value)}
+    if hasattr(value, "__dict__"):
+        name = _type_name(type(value))
+        return {"$object": name, "state": {k: _encode(v, value) for k, v in vars(value).items()}}
+    raise SerializationError(f"Objects of type {type(value).__name__} can not be stored.")
+
+
+def _decode(node, owner=None):
+    """Rebuild a value encoded by `_encode`."""
+    if isinstance(node, list):
+        return [_decode(v, owner) for v in node]
+    if not isinstance(node, dict):
+        return node
+    if "$float" in node:
+        return float(node["$float"])
+    if "$tuple" in node:
+        return tuple(_decode(v, owner) for v in node["$tuple"])
+    if "$dict" in node:
+        return {k: _decode(v, owner) for k, v in node["$dict"].items()}
+    if "$array" in node:
+        values = [_decode(v) for v in node["$array"]]
+        return np.array(values, dtype=np.dtype(node["dtype"])).reshape(node["shape"])
+    if "$partial" in node:
+        func = _resolve(_functions, node["$partial"])
+        if func is None:
+            raise SerializationError(f"Unknown function '{node['$partial']}' in model file.")
+        return functools.partial(func, *_decode(node["args"], owner), **_decode(node["keywords"], owner))
+    if "$method" in node:
+        name = node["$method"]
+        if name.startswith("__") or not isinstance(getattr(type(owner), name, None), types.FunctionType):
+            raise SerializationError(f"Unknown method '{name}' of {type(owner).__qualname__} in model file.")
+        return getattr(owner, name)
+    if "$function" in node:
+        func = _resolve(_functions, node["$function"])
+        if func is None:
+            raise SerializationError(f"Unknown function '{node['$function']}' in model file.")
+        return func
+    if "$type" in node:
+        return _type_by_name(node["$type"])
+    if "$object" in node:
+        cls = _type_by_name(node["$object"])
+        obj = cls.__new__(cls)
+        obj.__dict__.update({k: _decode(v, obj) for k, v in node["state"].items()})
+        return obj
+    raise SerializationError(f"Unknown entry {sorted(node)} in model file.")
+
+
+def history_to_spec(history):
+    """Encode a list of GeoProcesses as JSON compatible data."""
+    return [_encode(process) for process in history]
+
+
+def history_from_spec(spec):
+    """Rebuild a list of GeoProcesses from `history_to_spec` data."""
+    return [_decode(process) for process in spec]
+
+
+def model_to_spec(model: GeoModel) -> dict:
+    """Encode the settings and history of a model as JSON compatible data."""
+    return {
+        "format": "geogen-model",
+        "version": MODEL_FORMAT_VERSION,
+        "geogen_version": geogen.__version__,
+        "name": model.name,
+        "bounds": [list(axis) for axis in model.bounds],
+        "resolution": list(model.resolution),
+        "dtype": np.dtype(model.dtype).str,
+        "label_dtype": None if model.label_dtype is None else np.dtype(model.label_dtype).str,
+        "height_tracking": model.height_tracking,
+        "history": history_to_spec(model.history),
+    }
+
+
+def model_from_spec(spec: dict) -> GeoModel:
+    """Rebuild an uncomputed model from `model_to_spec` data."""
+    if spec.get("format") != "geogen-model":
+        raise SerializationError("Not a geogen model spec.")
+    if spec["version"] > MODEL_FORMAT_VERSION:
+        raise SerializationError(f"Unsupported model format version {spec['version']}.")
+    model = GeoModel(
+        bounds=tuple(tuple(axis) for axis in spec["bounds"]),
+        resolution=tuple(spec["resolution"]),
+        dtype=np.dtype(spec["dtype"]).type,
+        name=spec["name"],
+        height_tracking=spec["height_tracking"],
+        label_dtype=None if spec["label_dtype"] is None else np.dtype(spec["label_dtype"]).type,
+    )
+    model.add_history(history_from_spec(spec["history"]))
+    return model
+
+
+def save_model(model: GeoModel, path, data=True):
+    """
+    Save a model to a model file.
+
+    Parameters
+    ----------
+    model : GeoModel
+        The model, it is not modified.
+    path : str or file-like
+        The file to write, by convention with the '.geoz' suffix.
+    data : bool, optional
+        Whether to store the computed data of the model, if it has any. Default is True.
+    """
+    spec = model_to_spec(model)
+    has_data = data and model.data.size == np.prod(model.resolution)
+    spec["arrays"] = {"data": {"shape": list(model.resolution), "dtype": model.data.dtype.str}} if has_data else {}
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(_SPEC_MEMBER, json.dumps(spec))
+        if has_data:
+            buffer = io.BytesIO()
+            np.save(buffer, model.data, allow_pickle=False)
+            archive.writestr(_DATA_MEMBER, buffer.getvalue())
+
+
+def load_model_spec(path) -> dict:
+    """Read the spec of a model file, without reading its array payload."""
+    with zipfile.ZipFile(path) as archive:
+        return json.loads(archive.read(_SPEC_MEMBER))
+
+
+def load_model(path, data=True) -> GeoModel:
+    """
+    Load a model from a model file.
+
+    Parameters
+    ----------
+    path : str or file-like
+        The model file.
+    data : bool, optional
+        Whether to load the stored data. With data, the model mesh is set up as after computation.
+        Default is True.
+
+    Returns
+    -------
+    GeoModel
+        The model, computed if its data was stored and loaded.
+    """
+    with zipfile.ZipFile(path) as archive:
+        spec = json.loads(archive.read(_SPEC_MEMBER))
+        model = model_from_spec(spec)
+        if data and "data" in spec.get("arrays", {}):
+            values = np.load(io.BytesIO(archive.read(_DATA_MEMBER)), allow_pickle=False)
+            model._setup_mesh()
+            model.data = values
+    return model
@@ -130,3 +130,145 @@ def resample_mesh(mesh, resolution):
     model_mesh = interp((X, Y))
 
     return model_mesh
+
+
+def sample_crop_offsets(
+    shape, crop_size, n_crops, rng=None, layout="random", empty=None, max_empty_fraction=None, max_attempts=10
+):
+    """
+    Sample the offsets of sub-volume crops from a volume.
+
+    Parameters
+    ----------
+    shape : tuple of int
+        The (X, Y, Z) shape of the volume.
+    crop_size : tuple of int
+        The (cx, cy, cz) shape of the crops.
+    n_crops : int
+        Number of crops.
+    rng : np.random.Generator, optional
+        Random number generator.
+    layout : str, optional
+        'random' for uniformly placed crops that may overlap, or 'grid' for non-overlapping crops
+        drawn from a regular tiling of the volume. Default is 'random'.
+    empty : np.ndarray, optional
+        Boolean mask of the empty (air) voxels of the volume, required with max_empty_fraction.
+    max_empty_fraction : float, optional
+        Reject crops with a larger fraction of empty voxels. After max_attempts rejected random
+        crops, or when the grid runs out of accepted tiles, the crops with the least air are used.
+    max_attempts : int, optional
+        Maximum number of random placements tried per crop. Default is 10.
+
+    Returns
+    -------
+    list of tuple
+        The (x, y, z) offset of each crop.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    if any(c > s for c, s in zip(crop_size, shape)):
+        raise ValueError(f"Crop size {tuple(crop_size)} is larger than the volume shape {tuple(shape)}.")
+    if max_empty_fraction is not None and empty is None:
+        raise ValueError("An empty mask is required to reject crops by their fraction of air.")
+
+    def empty_fraction(offset):
+        if max_empty_fraction is None:
+            return 0.0
+        slices = tuple(slice(o, o + c) for o, c in zip(offset, crop_size))
+        return np.count_nonzero(empty[slices]) / np.prod(crop_size)
+
+    if layout == "grid":
+        tiles = [range(0, s - c + 1, c) for s, c in zip(shape, crop_size)]
+        grid = [(int(x), int(y), int(z)) for x in tiles[0] for y in tiles[1] for z in tiles[2]]
+        if n_crops > len(grid):
+            raise ValueError(f"Requested {n_crops} crops, but only {len(grid)} non-overlapping crops fit.")
+        grid = [grid[i] for i in rng.permutation(len(grid))]
+        if max_empty_fraction is not None:
+            # Stable sort keeps the random order among the accepted tiles
+            grid.sort(key=lambda offset: max(empty_fraction(offset), max_empty_fraction))
+        return grid[:n_crops]
+
+    if layout != "random":
+        raise ValueError(f"Unknown crop layout '{layout}', expected 'random' or 'grid'.")
+
+    offsets = []
+    for _ in range(n_crops):
+        best_offset, best_fraction = None, np.inf
+        for _ in range(max_attempts):
+            offset = tuple(int(rng.integers(0, s - c + 1)) for s, c in zip(shape, crop_size))
+            fraction = empty_fraction(offset)
+            if fraction < best_fraction:
+                best_offset, best_fraction = offset, fraction
+            if max_empty_fraction is None or fraction <= max_empty_fraction:
+                break
+        offsets.append(best_offset)
+    return offsets
+
+
+def mode_pool(labels, factor=2, num_classes=15, min_val=-1, priority=None, min_count=1):
+    """
+    Downsample a categorical label volume by taking the mode of each factor^3 block.
+
+    Parameters
+    ----------
+    labels : np.ndarray
+        An integer (X, Y, Z) label volume, each dimension divisible by factor.
+    factor : int, optional
+        Downsampling factor along each axis. Default is 2.
+    num_classes : int, optional
+        Number of label values, from min_val to min_val + num_classes - 1. Default is 15.
+    min_val : int, optional
+        The smallest label value, usually the air value -1. Default is -1.
+    priority : sequence of int, optional
+        Label values that take a block whenever they cover at least min_count of its voxels, with
+        earlier entries winning over later ones. Use it to keep thin features such as dikes.
+    min_count : int, optional
+        Number of voxels a priority label needs in a block to win it. Default is 1.
+
+    Returns
+    -------
+    np.ndarray
+        The downsampled label volume with the same dtype. Ties in the mode go to the larger label.
+    """
+    if any(n % factor for n in labels.shape):
+        raise ValueError(f"Volume shape {labels.shape} is not divisible by the pooling factor {factor}.")
+    nx, ny, nz = (n // factor for n in labels.shape)
+    blocks = labels.reshape(nx, factor, ny, factor, nz, factor)
+
+    counts = np.empty((num_classes, nx, ny, nz), dtype=np.int32)
+    for i in range(num_classes):
+        counts[i] = np.count_nonzero(blocks == min_val + i, axis=(1, 3, 5))
+
+    # Argmax returns the first maximum, searching from the largest label breaks ties towards it
+    pooled = (min_val + num_classes - 1 - np.argmax(counts[::-1], axis=0)).astype(labels.dtype)
+    for value in reversed(priority or []):
+        pooled[counts[value - min_val] >= min_count] = value
+    return pooled
+
+
+def label_pyramid(labels, levels=3, factor=2, **pool_kwargs):
+    """
+    Build a multi-scale label pyramid from one full resolution label volume.
+
+    Every level is pooled from the previous one with `mode_pool`, so consecutive levels are
+    exactly consistent with each other.
+
+    Parameters
+    ----------
+    labels : np.ndarray
+        The full resolution (X, Y, Z) integer label volume.
+    levels : int, optional
+        Number of levels including the full resolution one. Default is 3.
+    factor : int, optional
+        Downsampling factor between consecutive levels. Default is 2.
+    **pool_kwargs
+        Keyword arguments passed on to `mode_pool`, e.g. priority to keep thin dikes.
+
+    Returns
+    -------
+    list of np.ndarray
+        The levels from finest to coarsest.
+    """
+    pyramid = [labels]
+    for _ in range(levels - 1):
+        pyramid.append(mode_pool(pyramid[-1], factor=factor, **pool_kwargs))
+    return pyramid
@@ -8,7 +8,7 @@ import numpy as np
 import pyvista as pv
 import matplotlib.pyplot as plt
 
-from geogen.model import GeoModel
+from geogen.model import GeoModel, empty_mask
 from geogen.generation import (
     BED_ROCK_VAL,
     SEDIMENT_VALS,
@@ -80,7 +80,7 @@ def setup_plot(
     if plotter is None:
         plotter = pv.Plotter()
 
-    if np.all(np.isnan(model.data)):
+    if np.all(empty_mask(model.data)):
         plotter.add_text("No data to show, all values are NaN.", font_size=20)
         mesh = None
     else:
@@ -12,8 +12,13 @@ def _parse_bounds(bounds):
     return bounds
 
 
-def random_point_in_ellipsoid(bounds):
-    """Generate a random point within an ellipsoid defined by bounds on x, y, z axes."""
+def random_point_in_ellipsoid(bounds, rng=None, size=None):
+    """
+    Generate a random point within an ellipsoid defined by bounds on x, y, z axes.
+
+    With a size, x, y and z are arrays of that shape holding one point per entry.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
 
     # Parse bounds and calculate centers and radii
     (x_min, x_max), (y_min, y_max), (z_min, z_max) = _parse_bounds(bounds)
@@ -25,9 +30,9 @@ def random_point_in_ellipsoid(bounds):
     center_z = z_min + z_radius
 
     # Random angles and radius for a unit sphere
-    phi = np.random.uniform(0, 2 * np.pi)  # Azimuthal angle
-    theta = np.random.uniform(0, np.pi)  # Polar angle
-    u = np.random.uniform(0, 1)  # Radius
+    phi = rng.uniform(0, 2 * np.pi, size)  # Azimuthal angle
+    theta = rng.uniform(0, np.pi, size)  # Polar angle
+    u = rng.uniform(0, 1, size)  # Radius
     r = u ** (1 / 3)
 
     # Random point in unit sphere scaled to fit the ellipsoid
@@ -38,17 +43,20 @@ def random_point_in_ellipsoid(bounds):
     return x, y, z
 
 
-def random_point_in_box(bounds):
+def random_point_in_box(bounds, rng=None, size=None):
+    """Generate a uniform random point in a box, or arrays of points of the given size."""
+    rng = rng if rng is not None else np.random.default_rng()
     (x_min, x_max), (y_min, y_max), (z_min, z_max) = _parse_bounds(bounds)
-    x_loc = np.random.uniform(x_min, x_max)
-    y_loc = np.random.uniform(y_min, y_max)
-    z_loc = np.random.uniform(z_min, z_max)
+    x_loc = rng.uniform(x_min, x_max, size)
+    y_loc = rng.uniform(y_min, y_max, size)
+    z_loc = rng.uniform(z_min, z_max, size)
     return x_loc, y_loc, z_loc
 
 
-def random_angle_degrees():
+def random_angle_degrees(rng=None):
     """Generate a random angle in degrees from 0 to 360."""
-    return np.random.uniform(0, 360)
+    rng = rng if rng is not None else np.random.default_rng()
+    return rng.uniform(0, 360)
 
 
 def log_normal_params(mean, std_dev):
@@ -58,6 +66,18 @@ def log_normal_params(mean, std_dev):
     return mu, sigma
 
 
-def beta_min_max(a, b, min_val, max_val):
-    """Generate a beta distributed random number with specified min and max values."""
-    return min_val + (max_val - min_val) * np.random.beta(a, b)
+def beta_min_max(a, b, min_val, max_val, rng=None, size=None):
+    """Generate a beta distributed random number with specified min and max values, or an array of the given size."""
+    rng = rng if rng is not None else np.random.default_rng()
+    return min_val + (max_val - min_val) * rng.beta(a, b, size)
+
+
+def derive_seed(base_seed, *keys):
+    """
+    Derive an independent 64 bit seed from a base seed and a path of integer keys, e.g. (epoch, index).
+
+    The same base seed and keys always give the same seed, and different keys give statistically
+    independent streams, so samples can be addressed without any shared state between processes.
+    """
+    seed_seq = np.random.SeedSequence(base_seed, spawn_key=tuple(int(k) for k in keys))
+    return int(seed_seq.generate_state(1, dtype=np.uint64)[0])
@@ -2,7 +2,7 @@ import numpy as np
 
 
 class SedimentBuilder:
-    def __init__(self, start_value, total_thickness, min_layers, max_layers, std=0.5):
+    def __init__(self, start_value, total_thickness, min_layers, max_layers, std=0.5, rng=None):
         """
         Initialize the sediment builder to generate sediment layers with specific characteristics.
 
@@ -11,7 +11,10 @@ class SedimentBuilder:
         - total_thickness (float): The total desired thickness of all layers combined.
         - min_layers (int): Minimum number of layers.
         - max_layers (int): Maximum number of layers.
+        - std (float): Standard deviation of the layer thicknesses, as a fraction of the mean thickness.
+        - rng (np.random.Generator): Random number generator.
         """
+        self.rng = rng if rng is not None else np.random.default_rng()
         self.start_value = start_value
         self.total_thickness = total_thickness
         self.min_layers = min_layers
@@ -20,7 +23,7 @@ class SedimentBuilder:
         self.values, self.thicknesses = self.build_layers()
 
     def build_layers(self):
-        n_layers = np.random.randint(self.min_layers, self.max_layers + 1)
+        n_layers = self.rng.integers(self.min_layers, self.max_layers + 1)
 
         # desired mean and std of the layer thicknesses
         target_mean = self.total_thickness / n_layers
@@ -31,7 +34,7 @@ class SedimentBuilder:
         sigma = np.sqrt(np.log(1 + target_std**2 / target_mean**2))
 
         # Generate random thicknesses
-        random_thicknesses = np.random.lognormal(mean=mu, sigma=sigma, size=n_layers)
+        random_thicknesses = self.rng.lognormal(mean=mu, sigma=sigma, size=n_layers)
         normalized_thicknesses = random_thicknesses / np.sum(random_thicknesses) * self.total_thickness
         values = [self.start_value + i for i in range(n_layers)]
 
@@ -101,16 +104,16 @@ class MarkovSedimentHelper:
     def next_layer_category(self, current_val):
         """Determine the next layer category based on the current category and Markov process."""
         if current_val is None:
-            return np.random.choice(self.cats)
+            return self.rng.choice(self.cats)
         else:
-            return np.random.choice(self.cats, p=self.transition_matrix[current_val])
+            return self.rng.choice(self.cats, p=self.transition_matrix[current_val])
 
     def next_layer_thickness(self, current_thick):
         """Determine the next layer thickness based on the current thickness."""
         if current_thick is None:
             return self.rng.uniform(*self.thickness_bounds)
         else:
-            next_thick = current_thick * np.random.normal(
+            next_thick = current_thick * self.rng.normal(
                 1, self.thickness_variance
             )  # Induce some variation
             next_thick = np.clip(next_thick, *self.thickness_bounds)  # Bound thicknesses
@@ -26,6 +26,8 @@ class FourierWaveGenerator:
         Frequency of the wave, by default 1.
     smoothness : float, optional
         Exponent of the amplitude decay with frequency, by default 1.0.
+    rng : np.random.Generator, optional
+        Random number generator used to sample amplitudes and phases.
 
     Methods
     -------
@@ -33,10 +35,11 @@ class FourierWaveGenerator:
         Generate a random Fourier series function f(n_cycles: np.ndarray) -> np.ndarray
     """
 
-    def __init__(self, num_harmonics, frequency=1, smoothness=1.0):
+    def __init__(self, num_harmonics, frequency=1, smoothness=1.0, rng=None):
         self.num_harmonics = num_harmonics
         self.frequency = frequency
         self.smoothness = smoothness
+        self.rng = rng if rng is not None else np.random.default_rng()
 
     def generate(self):
         """
@@ -53,9 +56,9 @@ class FourierWaveGenerator:
         total_power = 0
         order = self.smoothness
         for n in range(1, self.num_harmonics + 1):
-            amplitude = np.random.normal(loc=1.0 / (n**order), scale=0.5 / (n**order))
+            amplitude = self.rng.normal(loc=1.0 / (n**order), scale=0.5 / (n**order))
             amplitude = abs(amplitude)  # Ensure non-negative amplitude
-            phase = np.random.uniform(0, 2 * np.pi)
+            phase = self.rng.uniform(0, 2 * np.pi)
             amplitudes.append(amplitude)
             phases.append(phase)
             total_power += amplitude**2
@@ -80,14 +83,16 @@ class FourierWaveGenerator:
         self.__dict__.update(state)
 
 
-def noisy_sine_wave(frequency=1, smoothing=20, noise_scale=0.1):
+def noisy_sine_wave(frequency=1, smoothing=20, noise_scale=0.1, rng=None):
+    rng = rng if rng is not None else np.random.default_rng()
+
     # Noisy sine
     def noisy_sin_wave_func(n_cycles):
         # Deterministic sinusoidal component
         deterministic = np.sin(2 * np.pi * frequency * n_cycles)
 
         # Generate random noise
-        random_noise = np.random.normal(scale=noise_scale, size=n_cycles.shape)
+        random_noise = rng.normal(scale=noise_scale, size=n_cycles.shape)
 
         # Smooth the random noise
         smoothed_noise = gaussian_filter1d(random_noise, sigma=smoothing)
@@ -0,0 +1,79 @@
+import asyncio
+import threading
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+import geogen.generation.geowords as gw
+from geogen.generation import MarkovGeostoryGenerator
+from geogen.model import GeoModel
+
+RESOLUTION = (8, 8, 16)
+
+
+def _model():
+    model = GeoModel(resolution=RESOLUTION)
+    model.add_history([gw.InfiniteSedimentUniform(seed=1).generate(), gw.SimpleFold(seed=2).generate()])
+    return model
+
+
+class TestAsync(unittest.TestCase):
+
+    def setUp(self):
+        self.generator = MarkovGeostoryGenerator(model_resolution=RESOLUTION)
+
+    def test_acompute_model(self):
+        reference = _model()
+        reference.compute_model()
+        model = _model()
+        asyncio.run(model.acompute_model())
+        np.testing.assert_array_equal(model.data, reference.data)
+        self.assertIn("seconds", model.compute_stats)
+
+    def test_supersede(self):
+        """The older of two computations of a model is cancelled and only the newer one applies."""
+        model = _model()
+
+        async def compute_twice():
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                # Keep the worker busy so the first computation is still pending when it is superseded
+                busy = threading.Event()
+                executor.submit(busy.wait, 10)
+                first = asyncio.ensure_future(model.acompute_model(executor=executor))
+                await asyncio.sleep(0)
+                second = asyncio.ensure_future(model.acompute_model(keep_snapshots=False, executor=executor))
+                await asyncio.sleep(0)
+                busy.set()
+                return await asyncio.gather(first, second, return_exceptions=True)
+
+        first, second = asyncio.run(compute_twice())
+        self.assertIsInstance(first, asyncio.CancelledError)
+        self.assertIsNone(second)
+        self.assertEqual(model.mesh_snapshots.size, 0)
+
+    def test_agenerate_model(self):
+        reference = self.generator.generate_model(seed=3)
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            model = asyncio.run(self.generator.agenerate_model(seed=3, executor=executor))
+        np.testing.assert_array_equal(model.data, reference.data)
+
+    def test_agenerate_stream(self):
+        async def collect(n, stop=None):
+            models = []
+            async for model in self.generator.agenerate_stream(n, seeds=list(range(n)), prefetch=2):
+                models.append(model)
+                if len(models) == stop:
+                    break
+            return models
+
+        models = asyncio.run(collect(4))
+        self.assertEqual(len(models), 4)
+        np.testing.assert_array_equal(models[2].data, self.generator.generate_model(seed=2).data)
+        self.assertEqual(len(asyncio.run(collect(5, stop=1))), 1)
+        with self.assertRaises(ValueError):
+            asyncio.run(self.generator.agenerate_stream(2, seeds=[1]).__anext__())
+
+
+if __name__ == "__main__":
+    unittest.main()
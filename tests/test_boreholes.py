@@ -0,0 +1,68 @@
+import unittest
+
+import numpy as np
+
+from geogen.dataset import GeoDataBoreholeDataset, sample_well_path, surface_from_columns
+
+BOUNDS = ((-3840, 3840), (-3840, 3840), (-1920, 1920))
+
+
+class TestWellPaths(unittest.TestCase):
+
+    def test_vertical_well(self):
+        """Vertical wells keep their collar and span the model depth from the top."""
+        path = sample_well_path(BOUNDS, 32, np.random.default_rng(0))
+        self.assertEqual(path.shape, (32, 3))
+        self.assertTrue(np.all(path[:, :2] == path[0, :2]))
+        self.assertEqual((path[0, 2], path[-1, 2]), (1920, -1920))
+
+    def test_deviated_well(self):
+        """Deviated wells are vertical down to the kickoff depth, then within the maximum inclination."""
+        path = sample_well_path(BOUNDS, 64, np.random.default_rng(1), max_inclination=30, kickoff_range=(0.25, 0.25))
+        offset = np.linalg.norm(path[:, :2] - path[0, :2], axis=1)
+        np.testing.assert_allclose(offset[path[:, 2] >= 960], 0)
+        self.assertGreater(offset[-1], 0)
+        self.assertLessEqual(offset[-1], np.tan(np.radians(30)) * 2880 + 1e-6)
+
+    def test_deviated_wells_stay_in_bounds(self):
+        """Steep wells from collars near the sides have their inclination reduced to stay in the model."""
+        rng = np.random.default_rng(2)
+        paths = np.stack([sample_well_path(BOUNDS, 32, rng, max_inclination=85) for _ in range(200)])
+        for axis, (low, high) in enumerate(BOUNDS):
+            self.assertTrue(np.all((paths[..., axis] >= low) & (paths[..., axis] <= high)))
+        # Wells are still deviated, not clipped to vertical
+        self.assertGreater(np.median(np.linalg.norm(paths[:, -1, :2] - paths[:, 0, :2], axis=1)), 1000)
+
+    def test_surface_from_columns(self):
+        labels = np.array([[-1, -1, 2, 3], [4, 4, 5, 5], [-1, -1, -1, -1]], dtype=np.int8)
+        z = np.tile([3.0, 2.0, 1.0, 0.0], (3, 1))
+        surface_z, surface_labels = surface_from_columns(labels, z)
+        np.testing.assert_array_equal(surface_z, [1, 3, 0])
+        np.testing.assert_array_equal(surface_labels, [2, 4, -1])
+
+
+class TestBoreholeDataset(unittest.TestCase):
+
+    def test_samples(self):
+        """Samples pair reproducible well logs with a low-res volume of the same history."""
+        dataset = GeoDataBoreholeDataset(
+            model_bounds=BOUNDS, n_wells=3, n_depth=16, n_surface=4, volume_resolution=(8, 8, 16), seed=5
+        )
+        sample = dataset[0]
+        self.assertEqual(tuple(sample["well_xyz"].shape), (3, 16, 3))
+        self.assertEqual(tuple(sample["well_labels"].shape), (3, 16))
+        self.assertEqual(tuple(sample["surface_xyz"].shape), (4, 3))
+        self.assertEqual(tuple(sample["volume"].shape), (1, 8, 8, 16))
+        self.assertEqual(str(sample["well_labels"].dtype), "torch.int8")
+        again = dataset[0]
+        for key in sample:
+            np.testing.assert_array_equal(sample[key].numpy(), again[key].numpy())
+
+
+    def test_no_volume_by_default(self):
+        dataset = GeoDataBoreholeDataset(model_bounds=BOUNDS, n_wells=1, n_depth=8, n_surface=1, seed=0)
+        self.assertNotIn("volume", dataset[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
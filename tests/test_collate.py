@@ -0,0 +1,31 @@
+import unittest
+
+import torch
+
+from geogen.dataset import BatchOneHotTransform, CompactCollate, OneHotTransform
+
+
+class TestCompactCollate(unittest.TestCase):
+
+    def setUp(self):
+        generator = torch.Generator().manual_seed(0)
+        self.samples = [torch.randint(-1, 14, (1, 6, 5, 4), generator=generator, dtype=torch.int8) for _ in range(3)]
+
+    def test_collate_is_compact(self):
+        """Samples are stacked into a shifted uint8 batch."""
+        batch = CompactCollate()(self.samples)
+        self.assertEqual(batch.dtype, torch.uint8)
+        self.assertEqual(batch.shape, (3, 1, 6, 5, 4))
+        self.assertTrue(torch.equal(batch[1].to(torch.int16) - 1, self.samples[1].to(torch.int16)))
+
+    def test_batch_one_hot_matches_per_sample(self):
+        """Batch one-hot encoding matches the per-sample OneHotTransform."""
+        batch = BatchOneHotTransform(num_classes=15)(CompactCollate()(self.samples))
+        per_sample = OneHotTransform(num_classes=15)
+        self.assertEqual(batch.shape, (3, 15, 6, 5, 4))
+        for i, sample in enumerate(self.samples):
+            self.assertTrue(torch.equal(batch[i], per_sample(sample)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import pickle
+import tempfile
+import unittest
+
+import numpy as np
+import torch
+
+from geogen.dataset import GeoData3DCorpusDataset
+from geogen.filemanagement import CorpusReader, CorpusWriter
+from geogen.generation import MarkovGeostoryGenerator
+
+BOUNDS = ((-3840, 3840), (-3840, 3840), (-1920, 1920))
+RESOLUTION = (16, 16, 8)
+
+
+class TestCorpus(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(0)
+        self.volumes = rng.integers(-1, 14, size=(7, *RESOLUTION)).astype(np.int8)
+        with CorpusWriter(self.tmp.name, RESOLUTION, shard_size=3) as writer:
+            for i, labels in enumerate(self.volumes):
+                writer.add(labels, seed=i, history=f"history {i}")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_reader_roundtrip(self):
+        """Samples and metadata are read back across full and partial shards."""
+        reader = CorpusReader(self.tmp.name)
+        self.assertEqual(len(reader), 7)
+        self.assertEqual(len(reader.shards), 3)
+        for i, labels in enumerate(self.volumes):
+            np.testing.assert_array_equal(reader[i], labels)
+            meta = reader.get_metadata(i)
+            self.assertEqual(meta["seed"], i)
+            self.assertEqual(sum(meta["class_counts"]), labels.size)
+        np.testing.assert_array_equal(reader[-1], self.volumes[-1])
+
+    def test_reader_pickles_without_memmaps(self):
+        """A reader sent to a worker reopens its shards lazily."""
+        reader = CorpusReader(self.tmp.name)
+        reader[0]
+        clone = pickle.loads(pickle.dumps(reader))
+        self.assertEqual(clone._memmaps, {})
+        np.testing.assert_array_equal(clone[4], self.volumes[4])
+
+    def test_existing_corpus_is_not_overwritten(self):
+        with self.assertRaises(FileExistsError):
+            CorpusWriter(self.tmp.name, RESOLUTION)
+
+    def test_dataset_zero_copy(self):
+        """The dataset returns int8 tensors sharing memory with the shard memory map."""
+        dataset = GeoData3DCorpusDataset(self.tmp.name)
+        sample = dataset[5]
+        self.assertEqual(sample.shape, (1, *RESOLUTION))
+        self.assertEqual(sample.dtype, torch.int8)
+        self.assertTrue(np.shares_memory(sample.numpy(), dataset.corpus._memmaps[1]))
+        np.testing.assert_array_equal(sample[0].numpy(), self.volumes[5])
+
+
+class TestCorpusGeneration(unittest.TestCase):
+
+    def test_write_generated_is_reproducible(self):
+        """Generated corpus samples can be regenerated from their stored seed."""
+        gen = MarkovGeostoryGenerator(model_bounds=BOUNDS, model_resolution=RESOLUTION)
+        with tempfile.TemporaryDirectory() as tmp:
+            with CorpusWriter(tmp, RESOLUTION, shard_size=2) as writer:
+                writer.write_generated(gen, n_samples=3, seed=1)
+            reader = CorpusReader(tmp)
+            model = gen.generate_model(seed=reader.get_metadata(2)["seed"])
+            model.fill_nans()
+            np.testing.assert_array_equal(reader[2], model.get_data_grid().astype(np.int8))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+import json
+import multiprocessing as mp
+import os
+import tempfile
+import threading
+import time
+import unittest
+import unittest.mock
+
+import numpy as np
+
+from geogen.filemanagement import CorpusJob, CorpusReader, CorpusWriter, FileManager
+from geogen.filemanagement.corpus_job import main
+from geogen.generation import MarkovGeostoryGenerator
+from geogen.model import GeoModel
+
+RESOLUTION = (8, 8, 8)
+
+
+def _run_worker(corpus_dir):
+    CorpusJob(corpus_dir).run()
+
+
+class TestCorpusJob(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = os.path.join(self.tmp.name, "job")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _reference(self, n_samples, seed):
+        """The corpus written by a single CorpusWriter from the same seed."""
+        path = os.path.join(self.tmp.name, "reference")
+        generator = MarkovGeostoryGenerator(model_resolution=RESOLUTION, label_dtype=np.int8)
+        with CorpusWriter(path, RESOLUTION) as writer:
+            writer.write_generated(generator, n_samples, seed=seed)
+        return CorpusReader(path)
+
+    def test_concurrent_workers(self):
+        """Workers in separate processes split the units and build the same corpus as one writer."""
+        CorpusJob(self.dir, n_samples=10, unit_size=3, seed=5, model_resolution=RESOLUTION)
+        ctx = mp.get_context("fork")
+        workers = [ctx.Process(target=_run_worker, args=(self.dir,)) for _ in range(3)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        corpus = CorpusReader(self.dir)
+        reference = self._reference(10, seed=5)
+        self.assertEqual(len(corpus), 10)
+        for i in range(10):
+            np.testing.assert_array_equal(corpus[i], reference[i])
+            self.assertEqual(corpus.get_metadata(i)["seed"], reference.get_metadata(i)["seed"])
+        self.assertEqual(os.listdir(os.path.join(self.dir, "leases")), [])
+
+    def test_resume_after_crash(self):
+        """A unit leased by a crashed worker is taken over once its lease is stale."""
+        crashed = CorpusJob(self.dir, n_samples=4, unit_size=2, model_resolution=RESOLUTION)
+        self.assertTrue(crashed.claim(0))
+
+        job = CorpusJob(self.dir, lease_timeout=60)
+        self.assertFalse(job.claim(0))  # The lease is live
+        self.assertEqual(job.run(), 1)
+        self.assertFalse(job.is_done(0))
+        self.assertFalse(job.status()["complete"])
+
+        old = time.time() - 120
+        os.utime(crashed._lease_path(0), (old, old))
+        self.assertEqual(job.status()["units_stale"], 1)
+        self.assertEqual(job.run(), 1)
+        status = job.status()
+        self.assertTrue(status["complete"])
+        self.assertEqual(status["samples_done"], 4)
+        self.assertEqual(len(CorpusReader(self.dir)), 4)
+
+        with open(os.path.join(self.dir, "progress.json")) as f:
+            self.assertEqual(json.load(f)["units_done"], 2)
+
+    def test_release_keeps_lease_taken_over(self):
+        """A stalled worker releasing its unit does not remove the lease of the worker that took over."""
+        stalled = CorpusJob(self.dir, n_samples=4, unit_size=2, model_resolution=RESOLUTION, lease_timeout=60)
+        self.assertTrue(stalled.claim(0))
+        old = time.time() - 120
+        os.utime(stalled._lease_path(0), (old, old))
+
+        job = CorpusJob(self.dir, lease_timeout=60)
+        self.assertTrue(job.claim(0))
+        stalled.release(0)
+        self.assertTrue(os.path.exists(job._lease_path(0)))
+        self.assertFalse(stalled.claim(0))  # The new lease is live
+        job.release(0)
+        self.assertEqual(os.listdir(os.path.join(self.dir, "leases")), [])
+
+    def test_specification_mismatch(self):
+        CorpusJob(self.dir, n_samples=4, model_resolution=RESOLUTION)
+        with self.assertRaises(ValueError):
+            CorpusJob(self.dir, n_samples=8)
+        with self.assertRaises(ValueError):
+            CorpusJob(os.path.join(self.tmp.name, "empty"))
+
+    def test_command(self):
+        main(["run", self.dir, "--n-samples", "2", "--resolution", "8", "8", "8", "--unit-size", "2"])
+        self.assertEqual(len(CorpusReader(self.dir)), 2)
+
+
+class TestFileManagerIndex(unittest.TestCase):
+
+    def test_concurrent_saves_get_distinct_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+
+            def save():
+                manager = FileManager(base_dir=tmp)
+                for _ in range(5):
+                    manager.save_geo_model(GeoModel(resolution=4), tmp)
+
+            threads = [threading.Thread(target=save) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            files = sorted(os.listdir(tmp))
+        self.assertEqual(len(files), 20)
+        self.assertTrue(all(f.startswith("model_") and f.endswith(".pkl") for f in files))
+
+    def test_no_empty_model_files_while_saving(self):
+        """Indices are reserved by hidden claims in the save directory, never by empty model files."""
+        with tempfile.TemporaryDirectory() as tmp:
+            save_dir = os.path.join(tmp, "saves")
+            os.makedirs(save_dir)
+            manager = FileManager(base_dir=tmp)
+            open(os.path.join(save_dir, ".model_0.pkl.claim"), "w").close()  # Being written elsewhere
+            seen = []
+            original = os.replace
+
+            def replace(src, dst):
+                seen.append(sorted(f for f in os.listdir(save_dir) if f.endswith(".pkl")))
+                original(src, dst)
+
+            with unittest.mock.patch("os.replace", replace):
+                manager.save_geo_model(GeoModel(resolution=4), save_dir)
+            self.assertEqual(seen, [[]])
+            self.assertEqual(sorted(os.listdir(save_dir)), [".model_0.pkl.claim", "model_1.pkl"])
+
+
+if __name__ == "__main__":
+    unittest.main()
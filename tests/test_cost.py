@@ -0,0 +1,100 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import geogen.model as geo
+from geogen.generation import MarkovGeostoryGenerator
+
+BOUNDS = ((-3840, 3840), (-3840, 3840), (-1920, 1920))
+
+
+def _history(n_balls=4):
+    balls = [geo.Ball((0, 0, 0), 100) for _ in range(n_balls)]
+    return [
+        geo.Bedrock(base=-1920, value=0),
+        geo.CompoundProcess(
+            [geo.Sedimentation([1, 2], [300, 300]), geo.Fold(strike=10, dip=90, period=3000, amplitude=200)]
+        ),
+        geo.DikePlane(strike=30, dip=80, width=100, origin=geo.BacktrackedPoint((0, 0, 0)), value=5),
+        geo.Tilt(strike=0, dip=10, origin=(0, 0, 0)),
+        geo.MetaBall(balls, threshold=1, value=6),
+    ]
+
+
+class TestCostModel(unittest.TestCase):
+
+    def test_features(self):
+        features = geo.history_cost_features(_history(n_balls=4))
+        self.assertEqual(features["units"]["MetaBall"], 4)
+        self.assertEqual(features["events"], 6)
+        self.assertEqual(features["deferred"], 1)  # The dike origin is backtracked through the tilt
+
+        model = geo.GeoModel(bounds=BOUNDS, resolution=8)
+        model.add_history(_history())
+        model.compute_model()
+        self.assertEqual(features["snapshots"], len(model.snapshot_indices))
+
+    def test_estimate_scaling(self):
+        """Costs grow with the resolution and the number of metaball blobs."""
+        cost_model = geo.CostModel()
+        small = cost_model.estimate(_history(), (32, 32, 32))
+        large = cost_model.estimate(_history(), (64, 64, 64))
+        self.assertGreater(large.seconds, 4 * small.seconds)
+        self.assertGreater(large.peak_bytes, 6 * small.peak_bytes)
+        self.assertGreater(cost_model.estimate(_history(40), (32, 32, 32)).seconds, small.seconds)
+        int8 = cost_model.estimate(_history(), (64, 64, 64), label_dtype=np.int8)
+        self.assertLess(int8.peak_bytes, large.peak_bytes)
+
+    def test_fit_recovers_costs(self):
+        """Fitting to computations timed by a known cost model recovers its predictions."""
+        truth = geo.CostModel(point_costs={"Fold": 300e-9, "MetaBall": 10e-9}, mesh_cost=20e-9)
+        cost_model = geo.CostModel()
+        for n_balls, resolution in [(2, 16), (8, 16), (4, 24), (16, 24), (1, 32), (8, 32)]:
+            model = geo.GeoModel(bounds=BOUNDS, resolution=resolution)
+            model.add_history(_history(n_balls))
+            model.compute_model()
+            cost_model.record(model, seconds=truth.estimate(model.history, model.resolution).seconds)
+        cost_model.fit(prior_weight=1e-6)
+
+        expected = truth.estimate(_history(12), (48, 48, 48)).seconds
+        self.assertAlmostEqual(cost_model.estimate(_history(12), (48, 48, 48)).seconds / expected, 1, delta=0.05)
+
+    def test_save_load(self):
+        cost_model = geo.CostModel(point_costs={"Fold": 1e-7}, memory_scale=1.2)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cost.json")
+            cost_model.save(path)
+            loaded = geo.CostModel.load(path)
+        self.assertEqual(loaded.to_dict(), cost_model.to_dict())
+
+    def test_model_estimate(self):
+        model = geo.GeoModel(bounds=BOUNDS, resolution=16)
+        model.add_history(_history())
+        estimate = model.estimate_cost(normalize=True)
+        self.assertIsInstance(estimate, geo.CostEstimate)
+        model.compute_model(normalize=True)
+        self.assertTrue(model.compute_stats["normalize"])
+        self.assertGreater(model.compute_stats["seconds"], 0)
+
+
+class TestCostBudget(unittest.TestCase):
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            geo.CostBudget(max_seconds=1, policy="skip")
+
+    def test_budgeted_generation(self):
+        """Generated histories are within budget and reproducible from their seed."""
+        for policy in geo.CostBudget.POLICIES:
+            budget = geo.CostBudget(max_seconds=0.02, policy=policy, max_attempts=3)
+            generator = MarkovGeostoryGenerator(model_resolution=(16, 16, 16), cost_budget=budget)
+            model = generator.generate_model(seed=4)
+            history = model.history[:-1]  # Without the normalization shift
+            self.assertTrue(budget.allows(generator.estimate_cost(history)) or len(history) == 1)
+            self.assertEqual(model.get_history_string(), generator.generate_model(seed=4).get_history_string())
+
+
+if __name__ == "__main__":
+    unittest.main()
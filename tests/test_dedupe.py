@@ -0,0 +1,80 @@
+import os
+import pickle
+import tempfile
+import unittest
+
+import numpy as np
+
+import geogen.generation.geowords as gw
+from geogen.filemanagement import CorpusReader, CorpusWriter, DuplicateIndex, deduplicate_corpus, label_sketch
+from geogen.filemanagement.dedupe import main
+from geogen.generation import MarkovGeostoryGenerator
+from geogen.model import GeoModel, history_fingerprint
+
+RESOLUTION = (16, 16, 16)
+
+
+class TestHistoryFingerprint(unittest.TestCase):
+
+    def test_stable(self):
+        model = MarkovGeostoryGenerator(model_resolution=RESOLUTION).generate_model(seed=1)
+        fingerprint = history_fingerprint(model.history)
+        lean = pickle.loads(pickle.dumps(model))
+        lean.clear_data()
+        self.assertEqual(history_fingerprint(lean.history), fingerprint)
+        self.assertNotEqual(history_fingerprint(model.history[:-1]), fingerprint)
+
+    def test_rounding(self):
+        """Histories differing by a tiny parameter share a rounded fingerprint only."""
+        base = gw.InfiniteSedimentUniform(seed=0).generate()
+        fold = gw.SimpleFold(seed=0).generate()
+        model = GeoModel(resolution=4)
+        model.add_history([base, fold])
+        nudged = pickle.loads(pickle.dumps(model))
+        nudged.history[1].history[0].amplitude *= 1 + 1e-9
+        self.assertNotEqual(history_fingerprint(nudged.history), history_fingerprint(model.history))
+        self.assertEqual(history_fingerprint(nudged.history, digits=6), history_fingerprint(model.history, digits=6))
+
+
+class TestDeduplication(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.a = rng.integers(0, 10, size=RESOLUTION, dtype=np.int8)
+        self.b = rng.integers(0, 10, size=RESOLUTION, dtype=np.int8)
+
+    def test_sketch(self):
+        index = DuplicateIndex()
+        sketch = label_sketch(self.a)
+        self.assertAlmostEqual(float(sketch.histogram.sum()), 1.0, places=5)
+        index.add(0, sketch)
+
+        nudged = self.a.copy()
+        nudged[0, 0, 0] = 11
+        self.assertEqual(index.find(label_sketch(nudged)), 0)
+        self.assertIsNone(index.find(label_sketch(self.b)))
+
+    def test_corpus(self):
+        nudged = self.a.copy()
+        nudged[3, 3, 3] = 12
+        basement = np.zeros(RESOLUTION, dtype=np.int8)
+        samples = [self.a, self.b, self.a, nudged, basement, basement]
+        with tempfile.TemporaryDirectory() as tmp:
+            source, output = os.path.join(tmp, "source"), os.path.join(tmp, "output")
+            with CorpusWriter(source, RESOLUTION, shard_size=4) as writer:
+                for i, labels in enumerate(samples):
+                    writer.add(labels, seed=i)
+
+            report = deduplicate_corpus(source, output)
+            self.assertEqual(report["kept"], 3)
+            self.assertEqual([r["duplicate_of"] for r in report["removed"]], [0, 0, 4])
+            corpus = CorpusReader(output)
+            self.assertEqual([corpus.get_metadata(i)["seed"] for i in range(len(corpus))], [0, 1, 4])
+            np.testing.assert_array_equal(corpus[1], self.b)
+
+            main([source, os.path.join(tmp, "clean"), "--max-class-fraction", "0.99"])
+            self.assertEqual(len(CorpusReader(os.path.join(tmp, "clean"))), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
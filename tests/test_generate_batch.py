@@ -0,0 +1,66 @@
+import unittest
+
+import numpy as np
+
+from geogen.generation import MarkovGeostoryGenerator, close_batch_pools, generate_batch
+from geogen.generation.batch import _get_generator
+from geogen.probability import derive_seed
+
+BOUNDS = ((-3840, 3840), (-3840, 3840), (-1920, 1920))
+RESOLUTION = (16, 16, 8)
+
+
+class TestGenerateBatch(unittest.TestCase):
+
+    def test_fills_array_in_place(self):
+        """The output array is filled in place with the models of the derived seeds."""
+        out = np.zeros((3, *RESOLUTION), dtype=np.int8)
+        result, metadata = generate_batch(3, BOUNDS, RESOLUTION, seed=9, out=out, return_metadata=True)
+        self.assertIs(result, out)
+        self.assertEqual(metadata["seeds"][1], derive_seed(9, 1))
+        self.assertEqual(len(metadata["histories"]), 3)
+        np.testing.assert_array_equal(metadata["class_counts"].sum(axis=1), np.prod(RESOLUTION))
+
+        generator = MarkovGeostoryGenerator(model_bounds=BOUNDS, model_resolution=RESOLUTION)
+        model = generator.generate_model(seed=derive_seed(9, 1))
+        model.fill_nans()
+        np.testing.assert_array_equal(out[1], model.get_data_grid().astype(np.int8))
+
+    def test_workers_match_sequential(self):
+        sequential = generate_batch(2, BOUNDS, RESOLUTION, seed=1)
+        pooled = generate_batch(2, BOUNDS, RESOLUTION, seed=1, workers=2)
+        np.testing.assert_array_equal(sequential, pooled)
+
+    def test_pool_is_reused(self):
+        """Batches with workers share one persistent pool until it is closed."""
+        out = np.empty((2, *RESOLUTION), dtype=np.int8)
+        try:
+            generate_batch(2, BOUNDS, RESOLUTION, seed=2, out=out, workers=2)
+            pool = _get_generator(BOUNDS, RESOLUTION, None)._pool
+            self.assertIsNotNone(pool)
+            generate_batch(2, BOUNDS, RESOLUTION, seed=3, out=out, workers=2)
+            self.assertIs(_get_generator(BOUNDS, RESOLUTION, None)._pool, pool)
+            np.testing.assert_array_equal(out, generate_batch(2, BOUNDS, RESOLUTION, seed=3))
+        finally:
+            close_batch_pools()
+        self.assertIsNone(_get_generator(BOUNDS, RESOLUTION, None)._pool)
+
+    def test_pool_is_closed_on_new_settings(self):
+        """Batches of other settings replace the pool of the previous settings instead of adding one."""
+        try:
+            generate_batch(1, BOUNDS, RESOLUTION, seed=2, workers=2)
+            previous = _get_generator(BOUNDS, RESOLUTION, None)
+            self.assertIsNotNone(previous._pool)
+            generate_batch(1, BOUNDS, (8, 8, 8), seed=2, workers=2)
+            self.assertIsNone(previous._pool)
+            self.assertIsNotNone(_get_generator(BOUNDS, (8, 8, 8), None)._pool)
+        finally:
+            close_batch_pools()
+
+    def test_rejects_bad_output(self):
+        with self.assertRaises(ValueError):
+            generate_batch(2, BOUNDS, RESOLUTION, out=np.zeros((2, *RESOLUTION), dtype=np.float32))
+
+
+if __name__ == "__main__":
+    unittest.main()
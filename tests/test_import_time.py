@@ -0,0 +1,50 @@
+import json
+import subprocess
+import sys
+import unittest
+
+HEAVY_MODULES = ("torch", "pydtmc", "pyvista", "matplotlib")
+
+# Imports a module in a fresh interpreter and reports its import time and the heavy modules it loaded
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure_import(module):
+    """Import time in seconds and heavy dependencies loaded by importing a module in a fresh process."""
+    code = _PROBE.format(module=module, heavy=HEAVY_MODULES)
+    output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    return result["seconds"], result["loaded"]
+
+
+class TestImportTime(unittest.TestCase):
+
+    def test_package_import_is_lazy(self):
+        _, loaded = measure_import("geogen")
+        self.assertEqual(loaded, [])
+
+    def test_model_loads_only_numpy_and_scipy(self):
+        _, loaded = measure_import("geogen.model")
+        self.assertEqual(loaded, [])
+
+    def test_generation_defers_pydtmc(self):
+        _, loaded = measure_import("geogen.generation")
+        self.assertEqual(loaded, [])
+
+    def test_submodules_load_on_access(self):
+        code = "import sys, geogen; geogen.dataset; print('torch' in sys.modules)"
+        output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+        self.assertEqual(output.strip(), "True")
+
+
+if __name__ == "__main__":
+    # Benchmark, print the import time of each subpackage
+    for name in ("geogen", "geogen.model", "geogen.generation", "geogen.dataset", "geogen.plot"):
+        seconds, loaded = measure_import(name)
+        print(f"{name:<20} {seconds:6.3f} s  heavy: {', '.join(loaded) or '-'}")
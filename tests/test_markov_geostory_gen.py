@@ -1,5 +1,8 @@
 import matplotlib.pyplot as plt
-import pydtmc as dtmc
+import pytest
+
+# PyDTMC is the optional "markov" extra
+dtmc = pytest.importorskip("pydtmc")
 
 import geogen.plot as geovis
 from geogen.generation.model_generators import (MarkovGeostoryGenerator,
@@ -0,0 +1,77 @@
+import subprocess
+import sys
+import unittest
+
+import numpy as np
+
+from geogen.generation import MarkovSequenceSampler
+from geogen.generation.model_generators import MarkovMatrixParser
+
+MATRIX = np.array(
+    [
+        [0.0, 0.7, 0.3],
+        [0.0, 0.5, 0.5],
+        [0.0, 0.0, 1.0],
+    ]
+)
+STATES = ["Start", "Middle", "End"]
+
+
+class TestMarkovSequenceSampler(unittest.TestCase):
+
+    def test_reproducible(self):
+        sampler = MarkovSequenceSampler(MATRIX, STATES)
+        first = sampler.sample(50, "Start", 10, "End", rng=np.random.default_rng(1))
+        second = sampler.sample(50, "Start", 10, "End", rng=np.random.default_rng(1))
+        self.assertEqual(first, second)
+
+    def test_termination(self):
+        """Sequences stop at the end state, or after the maximum number of steps."""
+        sampler = MarkovSequenceSampler(MATRIX, STATES)
+        sequences, lengths = sampler.sample_indices(1000, "Start", 4, "End", rng=np.random.default_rng(2))
+        self.assertEqual(sequences.shape, (1000, 5))
+        self.assertTrue(np.all(sequences[:, 0] == 0))
+        for sequence, length in zip(sequences, lengths):
+            self.assertTrue(np.all(sequence[length:] == MarkovSequenceSampler.PADDING))
+            self.assertTrue(length == 5 or sequence[length - 1] == 2)
+            self.assertNotIn(2, sequence[: length - 1])
+
+    def test_transition_frequencies(self):
+        """Empirical transitions of the default matrix match its probabilities."""
+        parser = MarkovMatrixParser()
+        matrix = parser.transition_matrix
+        sampler = parser.get_sampler()
+        sequences, lengths = sampler.sample_indices(20000, "BaseStrata", 20, "End", rng=np.random.default_rng(3))
+
+        counts = np.zeros_like(matrix)
+        for sequence, length in zip(sequences, lengths):
+            np.add.at(counts, (sequence[: length - 1], sequence[1:length]), 1)
+        visited = counts.sum(axis=1) > 5000
+        empirical = counts[visited] / counts[visited].sum(axis=1, keepdims=True)
+        np.testing.assert_allclose(empirical, matrix[visited], atol=0.02)
+
+    def test_trailing_zero_probability_states(self):
+        """Rows summing to slightly below 1 never select their trailing zero probability states."""
+        matrix = np.array([[0.1, 0.3, 0.6 - 1e-9, 0.0], [0.0, 1.0, 0.0, 0.0], [0, 0, 0, 1], [0, 0, 0, 1]])
+        sampler = MarkovSequenceSampler(matrix, ["A", "B", "C", "D"])
+
+        class HighDraws:  # Draws above the row sums
+            def random(self, shape):
+                return np.full(shape, 1 - 1e-12)
+
+        sequences, _ = sampler.sample_indices(4, "A", 1, rng=HighDraws())
+        np.testing.assert_array_equal(sequences[:, 1], 2)
+
+    def test_generator_does_not_import_pydtmc(self):
+        code = (
+            "import sys\n"
+            "from geogen.generation import MarkovGeostoryGenerator\n"
+            "MarkovGeostoryGenerator(model_resolution=(4, 4, 4)).build_geostory()\n"
+            "print('pydtmc' in sys.modules)"
+        )
+        output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+        self.assertEqual(output.strip().splitlines()[-1], "False")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -42,6 +42,35 @@ class TestGeoModel(unittest.TestCase):
         prod = np.prod(resolution)
         self.assertEqual(len(model.xyz), prod)  # Check if XYZ is correctly flattened
 
+    def test_invalid_label_dtype(self):
+        """Test that label mode only accepts signed integer types."""
+        with self.assertRaises(ValueError):
+            geo.GeoModel(bounds=(0, 10), resolution=10, label_dtype=np.uint8)
+
+    def test_label_mode_matches_float_mode(self):
+        """Test that integer label mode computes the same rocks as the float NaN mode."""
+        history = [
+            geo.Bedrock(base=-3, value=0),
+            geo.Sedimentation(value_list=[1, 2, 3], thickness_list=[1, 2]),
+            geo.Tilt(strike=30, dip=20),
+            geo.UnconformityDepth(depth=2),
+            geo.DikePlane(strike=10, dip=80, width=2, value=6),
+            geo.Sedimentation(value_list=[4, 5], thickness_list=[1]),
+        ]
+        float_model = geo.GeoModel(bounds=(-10, 10), resolution=16)
+        float_model.add_history(history)
+        float_model.compute_model()
+        float_model.fill_nans()
+
+        label_model = geo.GeoModel(bounds=(-10, 10), resolution=16, label_dtype=np.int8)
+        label_model.add_history(history)
+        label_model.compute_model()
+
+        self.assertEqual(label_model.data.dtype, np.int8)
+        self.assertEqual(label_model.data_snapshots.dtype, np.int8)
+        self.assertTrue(np.any(label_model.data == geo.GeoModel.EMPTY_VALUE))
+        np.testing.assert_array_equal(label_model.data, float_model.data.astype(np.int8))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,87 @@
+import pickle
+import tempfile
+import unittest
+
+import numpy as np
+
+import geogen.model as geo
+from geogen.generation import MarkovGeostoryGenerator
+from geogen.probability.wavegenerators import noisy_sine_wave
+
+RESOLUTION = (16, 16, 16)
+
+
+class TestModelCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = geo.ModelCache(self.tmp.name)
+        self.generator = MarkovGeostoryGenerator(model_resolution=RESOLUTION)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _lean_copy(self, model):
+        """A model as reloaded from a lean save."""
+        lean = pickle.loads(pickle.dumps(model))
+        lean.clear_data()
+        return lean
+
+    def test_hit(self):
+        model = self.generator.generate_model(seed=1)
+        first = self._lean_copy(model)
+        first.compute_model(cache=self.cache)
+        self.assertFalse(first.compute_stats["cached"])
+
+        second = self._lean_copy(model)
+        second.compute_model(cache=self.cache)
+        self.assertTrue(second.compute_stats["cached"])
+        np.testing.assert_array_equal(second.data, first.data)
+        np.testing.assert_array_equal(second.Z, first.Z)
+        self.assertEqual(second.mesh_snapshots.size, 0)
+        with self.assertRaises(ValueError):
+            geo.CostModel().record(second)
+
+    def test_key(self):
+        """Keys are stable across pickling and differ with the history and settings."""
+        model = self.generator.generate_model(seed=2)
+        key = self.cache.key(model)
+        self.assertEqual(self.cache.key(self._lean_copy(model)), key)
+        self.assertNotEqual(self.cache.key(self.generator.generate_model(seed=3)), key)
+
+        other = self._lean_copy(model)
+        other.resolution = (16, 16, 8)
+        self.assertNotEqual(self.cache.key(other), key)
+
+    def test_uncacheable(self):
+        """A fold with a random noisy wave is not deterministic and is computed without the cache."""
+        model = geo.GeoModel(resolution=8)
+        model.add_history([geo.Bedrock(base=0, value=1), geo.Fold(periodic_func=noisy_sine_wave())])
+        self.assertIsNone(self.cache.key(model))
+        model.compute_model(cache=self.cache)
+        self.assertFalse(model.compute_stats["cached"])
+        self.assertEqual(self.cache.size_bytes(), 0)
+
+    def test_snapshots(self):
+        cache = geo.ModelCache(self.tmp.name, snapshots=True)
+        model = self.generator.generate_model(seed=4)
+        reference = self._lean_copy(model)
+        reference.compute_model(cache=cache)
+
+        cached = self._lean_copy(model)
+        cached.compute_model(cache=cache)
+        self.assertTrue(cached.compute_stats["cached"])
+        np.testing.assert_array_equal(cached.mesh_snapshots, reference.mesh_snapshots)
+        self.assertEqual(cached.snapshot_indices, reference.snapshot_indices)
+
+    def test_renormalize_height(self):
+        model = self.generator.generate_model(seed=5)
+        model.renormalize_height(new_max=0, cache=self.cache)
+        copy = self._lean_copy(model)
+        copy.compute_model(cache=self.cache)
+        self.assertTrue(copy.compute_stats["cached"])
+        np.testing.assert_array_equal(copy.data, model.data)
+
+
+if __name__ == "__main__":
+    unittest.main()
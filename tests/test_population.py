@@ -0,0 +1,123 @@
+import unittest
+
+import numpy as np
+from scipy import stats
+
+import geogen.generation.geowords as gw
+import geogen.model as geo
+
+N = 400
+
+
+def _attribute(histories, process_cls, name, index=0):
+    """Collect an attribute of the index-th process of a type from each history snippet."""
+    values = []
+    for hist in histories:
+        processes = [p for p in hist.history if isinstance(p, process_cls)]
+        values.append(getattr(processes[index], name))
+    return np.array(values, dtype=float)
+
+
+# Reference draws of the scalar build_history implementations that predate the vectorized
+# samplers, kept here so the samplers are tested against a fixed reference and not themselves
+
+
+def _simple_fold_amplitude(rng):
+    period = 100 + (14000 - 100) * rng.beta(1.4, 2.1)
+    min_amp = period * 0.04
+    max_amp = period * (0.18 - 0.07 * period / 10000)
+    return rng.beta(a=2.1, b=1.4) * (max_amp - min_amp) + min_amp
+
+
+def _shaped_fold_amplitude(rng):
+    true_period = 1000 + (11000 - 1000) * rng.beta(2.1, 2.1)
+    shape = rng.normal(0.3, 0.1)
+    harmonic_weight = shape / np.sqrt(1 + shape**2)
+    period = (1 - (2 / 3) * harmonic_weight) * true_period
+    min_amp = period * 0.04
+    max_amp = period * (0.18 - 0.07 * period / 10000)
+    return rng.beta(a=1.2, b=2.1) * (max_amp - min_amp) + min_amp
+
+
+def _uniform_sediment_layer_count(rng):
+    depth = gw.Z_RANGE * (3 * geo.GeoModel.HEIGHT_BAR_EXT_FACTOR)
+    count = 0
+    while depth > 0:
+        rng.choice(gw.SEDIMENT_VALS)
+        depth -= rng.uniform(50, gw.Z_RANGE / 4)
+        count += 1
+    return count
+
+
+def _erosion_depth_cdf(x):
+    """The erosion depth, a log-normal factor of mean 1 and std 0.5 clipped to [0.25, 3], times MEAN_DEPTH."""
+    sigma = np.sqrt(np.log(1 + 0.5**2))
+    factor = np.asarray(x) / gw.FlatUnconformity.MEAN_DEPTH
+    cdf = stats.lognorm(s=sigma, scale=np.exp(-(sigma**2) / 2)).cdf(factor)
+    return np.where(factor < 0.25, 0.0, np.where(factor >= 3, 1.0, cdf))
+
+
+class TestPopulation(unittest.TestCase):
+
+    def assertMatchesReference(self, word, process_cls, name, cdf=None, draw=None, index=0, scale=1.0):
+        """KS test a population attribute against an analytic cdf, or against reference scalar draws."""
+        population = scale * _attribute(word.generate_population(N, seed=0), process_cls, name, index)
+        if cdf is not None:
+            result = stats.kstest(population, cdf)
+        else:
+            rng = np.random.default_rng(1)
+            result = stats.ks_2samp(population, [draw(rng) for _ in range(N)])
+        self.assertGreater(result.pvalue, 1e-3, f"{word.__name__}.{name} differs, KS p={result.pvalue:.2g}")
+
+    def test_population_is_histories(self):
+        population = gw.SimpleFold.generate_population(5, seed=1)
+        self.assertEqual(len(population), 5)
+        self.assertTrue(all(isinstance(p, geo.CompoundProcess) for p in population))
+        repeat = gw.SimpleFold.generate_population(5, seed=1)
+        self.assertEqual([str(p) for p in population], [str(p) for p in repeat])
+
+    def test_single_instance_matches_population(self):
+        """A word built on its own draws the same history as a population of one from the same seed."""
+        for word in (w for w in vars(gw).values() if isinstance(w, type) and issubclass(w, gw.GeoWord)):
+            if word is gw.GeoWord or "sample_population_parameters" not in word.__dict__:
+                continue
+            with self.subTest(word=word.__name__):
+                self.assertEqual(str(word(seed=7).generate()), str(word.generate_population(1, seed=7)[0]))
+
+    def test_inherited_words_fall_back(self):
+        """Subclasses without their own sampler are generated one by one with their own history."""
+        population = gw.SingleDikeWarped.generate_population(3, seed=0)
+        self.assertTrue(all(len(p.history) == 3 for p in population))
+
+    def test_fold_distributions(self):
+        period = stats.beta(1.4, 2.1, loc=100, scale=13900)
+        self.assertMatchesReference(gw.SimpleFold, geo.Fold, "period", cdf=period.cdf)
+        self.assertMatchesReference(gw.SimpleFold, geo.Fold, "amplitude", draw=_simple_fold_amplitude)
+        self.assertMatchesReference(gw.ShapedFold, geo.Fold, "amplitude", draw=_shaped_fold_amplitude)
+
+    def test_fault_distributions(self):
+        amplitude = stats.beta(1.8, 5.5, loc=60, scale=940)
+        self.assertMatchesReference(gw.FaultRandom, geo.Fault, "amplitude", cdf=amplitude.cdf)
+        # The dip is 90 - |N(0, 20)| degrees, stored in radians
+        dip_cdf = lambda x: stats.halfnorm(scale=20).sf(90 - x)  # noqa: E731
+        self.assertMatchesReference(gw.FaultNormal, geo.Fault, "dip", cdf=dip_cdf, scale=180 / np.pi)
+
+    def test_intrusion_distributions(self):
+        dike_width = stats.beta(2, 4, loc=50, scale=450)
+        self.assertMatchesReference(gw.DikePlaneWord, geo.DikePlane, "width", cdf=dike_width.cdf)
+        sill_width = stats.beta(2, 4, loc=50, scale=200)
+        self.assertMatchesReference(gw.SillWord, geo.DikePlane, "width", cdf=sill_width.cdf)
+
+    def test_unconformity_distribution(self):
+        self.assertMatchesReference(gw.FlatUnconformity, geo.UnconformityDepth, "depth", cdf=_erosion_depth_cdf)
+
+    def test_sediment_layer_counts(self):
+        population = gw.InfiniteSedimentUniform.generate_population(N, seed=0)
+        counts = [len(p.history[1].value_list) for p in population]
+        rng = np.random.default_rng(1)
+        reference = [_uniform_sediment_layer_count(rng) for _ in range(N)]
+        self.assertGreater(stats.ks_2samp(counts, reference).pvalue, 1e-3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import json
+import os
+import tempfile
+import unittest
+
+import geogen.generation.categorical_events as events
+import geogen.generation.geowords as gw
+from geogen.generation import default_profile_words, profile_geowords, profile_json, profile_table
+from geogen.generation.profiling import main
+
+
+class TestProfiling(unittest.TestCase):
+
+    def test_default_words(self):
+        """Every categorical event and the words of its cases are profiled once."""
+        words = default_profile_words()
+        self.assertEqual(len(words), len(set(words)))
+        for name in events.__all__:
+            self.assertIn(getattr(events, name), words)
+        self.assertIn(gw.FourierFold, words)
+
+    def test_profile(self):
+        profiles = profile_geowords([gw.SimpleFold, events.Dike], n_samples=3, resolution=(8, 8, 8))
+        self.assertEqual([p.name for p in profiles], ["SimpleFold", "Dike"])
+        for profile in profiles:
+            summary = profile.summary()
+            self.assertEqual(set(summary), set(profile.METRICS))
+            self.assertEqual(len(profile.samples["compute_seconds"]), 3)
+            self.assertGreater(summary["peak_bytes"]["median"], 0)
+            self.assertGreaterEqual(summary["snapshots"]["max"], 1)
+
+        table = profile_table(profiles)
+        self.assertIn("SimpleFold", table)
+        report = profile_json(profiles, resolution=(8, 8, 8))
+        self.assertEqual(json.loads(json.dumps(report))["metadata"]["resolution"], [8, 8, 8])
+
+    def test_main(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "profile.json")
+            main(["--words", "FlatUnconformity", "--samples", "2", "--resolution", "8", "8", "8", "--json", path])
+            with open(path) as f:
+                report = json.load(f)
+        self.assertEqual(list(report["words"]), ["FlatUnconformity"])
+        with self.assertRaises(SystemExit):
+            main(["--words", "NotAWord", "--samples", "1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+
+import numpy as np
+
+import geogen.model as geo
+from geogen.dataset import CompactCollate, GeoData3DStreamingDataset
+from geogen.model.util import label_pyramid, mode_pool
+
+BOUNDS = ((-3840, 3840), (-3840, 3840), (-1920, 1920))
+
+
+class TestModePool(unittest.TestCase):
+
+    def test_mode(self):
+        """Each block takes its most frequent label, ties go to the larger label."""
+        labels = np.zeros((2, 2, 4), dtype=np.int8)
+        labels[..., 2:] = 3
+        labels[0, 0, 0] = -1
+        labels[:, :, 2] = 5  # Tie between 3 and 5 in the second block
+        np.testing.assert_array_equal(mode_pool(labels).ravel(), [0, 5])
+
+    def test_priority_keeps_thin_features(self):
+        """A priority label wins every block it touches."""
+        labels = np.zeros((4, 4, 4), dtype=np.int8)
+        labels[1, :, 1] = 6  # A one voxel thin dike
+        self.assertFalse(np.any(mode_pool(labels) == 6))
+        pooled = mode_pool(labels, priority=[6])
+        self.assertTrue(np.all(pooled[0, :, 0] == 6))
+        self.assertEqual(np.count_nonzero(pooled == 6), 2)
+
+    def test_levels_are_consistent(self):
+        """Every level is exactly the pooling of the previous one."""
+        labels = np.random.default_rng(0).integers(-1, 14, size=(8, 8, 8)).astype(np.int8)
+        pyramid = label_pyramid(labels, levels=3, priority=[7])
+        self.assertEqual([level.shape for level in pyramid], [(8, 8, 8), (4, 4, 4), (2, 2, 2)])
+        np.testing.assert_array_equal(pyramid[2], mode_pool(pyramid[1], priority=[7]))
+        with self.assertRaises(ValueError):
+            label_pyramid(np.zeros((6, 6, 6), dtype=np.int8), levels=3)
+
+    def test_model_pyramid_from_float_data(self):
+        model = geo.GeoModel(bounds=(-10, 10), resolution=8)
+        model.add_history([geo.Bedrock(base=0, value=0)])
+        model.compute_model()
+        fine, coarse = model.get_label_pyramid(levels=2)
+        self.assertEqual(coarse.shape, (4, 4, 4))
+        np.testing.assert_array_equal(np.unique(coarse), [-1, 0])
+        # An explicit min_val overrides the default instead of clashing with it
+        _, coarse = model.get_label_pyramid(levels=2, min_val=-1, num_classes=2)
+        np.testing.assert_array_equal(np.unique(coarse), [-1, 0])
+
+
+class TestDatasetPyramid(unittest.TestCase):
+
+    def test_dataset_pyramid(self):
+        dataset = GeoData3DStreamingDataset(
+            model_bounds=BOUNDS, model_resolution=(16, 16, 8), dataset_size=2, seed=0, pyramid_levels=3
+        )
+        samples = [dataset[i] for i in range(2)]
+        self.assertEqual([level.shape for level in samples[0]], [(1, 16, 16, 8), (1, 8, 8, 4), (1, 4, 4, 2)])
+        batch = CompactCollate()(samples)
+        self.assertEqual([level.shape for level in batch], [(2, 1, 16, 16, 8), (2, 1, 8, 8, 4), (2, 1, 4, 4, 2)])
+
+
+if __name__ == "__main__":
+    unittest.main()
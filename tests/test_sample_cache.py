@@ -0,0 +1,122 @@
+import os
+import tempfile
+import time
+import unittest
+
+import numpy as np
+import torch
+
+from geogen.dataset import GeoData3DStreamingDataset, SampleCache
+
+BOUNDS = ((-3840, 3840), (-3840, 3840), (-1920, 1920))
+RESOLUTION = (16, 16, 8)
+
+
+class TestSampleCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_roundtrip(self):
+        """Stored volumes are returned unchanged, misses return None."""
+        cache = SampleCache(self.tmp.name)
+        labels = np.random.default_rng(0).integers(-1, 14, size=RESOLUTION).astype(np.int8)
+        self.assertIsNone(cache.get(0, 1))
+        cache.put(0, 1, labels)
+        self.assertIn((0, 1), cache)
+        np.testing.assert_array_equal(cache.get(0, 1), labels)
+        self.assertFalse([f for f in os.listdir(self.tmp.name) if f.endswith(".tmp")])
+
+    def test_lru_eviction(self):
+        """The least recently used entries are evicted once the budget is exceeded."""
+        rng = np.random.default_rng(0)
+        volumes = [rng.integers(-1, 14, size=RESOLUTION).astype(np.int8) for _ in range(3)]
+        probe = SampleCache(os.path.join(self.tmp.name, "probe"))
+        probe.put(0, 0, volumes[0])
+        entry_size = probe.size_bytes()
+
+        cache = SampleCache(self.tmp.name, max_bytes=int(2.5 * entry_size))
+        cache.put(0, 0, volumes[0])
+        cache.put(1, 0, volumes[1])
+        past = time.time() - 10
+        os.utime(cache._path(1, 0), (past, past))  # Entry 1 is now the oldest
+        cache.get(0, 0)
+        cache.put(2, 0, volumes[2])
+
+        self.assertIn((0, 0), cache)
+        self.assertNotIn((1, 0), cache)
+        self.assertIn((2, 0), cache)
+
+    def test_scans_only_when_over_budget(self):
+        """Writes within the budget do not scan the directory, and eviction goes below the budget."""
+        rng = np.random.default_rng(0)
+        volumes = [rng.integers(-1, 14, size=RESOLUTION).astype(np.int8) for _ in range(6)]
+        probe = SampleCache(os.path.join(self.tmp.name, "probe"))
+        probe.put(0, 0, volumes[0])
+        entry_size = probe.size_bytes()
+
+        cache = SampleCache(self.tmp.name, max_bytes=int(4.5 * entry_size), low_water=0.5)
+        scans = []
+        entries = cache._entries
+        cache._entries = lambda: scans.append(1) or entries()
+        for i in range(4):
+            cache.put(i, 0, volumes[i])
+        self.assertEqual(scans, [])
+        self.assertEqual(cache._total, cache.size_bytes())
+        cache.put(4, 0, volumes[4])  # Over budget, evicted down to half of it
+        self.assertLessEqual(cache.size_bytes(), 0.5 * cache.max_bytes)
+        self.assertEqual(cache._total, cache.size_bytes())
+
+
+class TestCachedDataset(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make_dataset(self, fresh_ratio):
+        return GeoData3DStreamingDataset(
+            model_bounds=BOUNDS,
+            model_resolution=RESOLUTION,
+            dataset_size=4,
+            seed=3,
+            cache_dir=self.tmp.name,
+            fresh_ratio=fresh_ratio,
+        )
+
+    def test_cached_samples_are_reused(self):
+        """A second access is served from the cache and matches the generated sample."""
+        dataset = self.make_dataset(fresh_ratio=0.0)
+        first = dataset[1]
+        self.assertIn((1, dataset.get_sample_seed(1)), dataset.cache)
+        dataset.set_epoch(5)
+        self.assertTrue(torch.equal(first, dataset[1]))
+
+    def test_fresh_ratio(self):
+        """All samples get new seeds each epoch with a fresh ratio of one."""
+        dataset = self.make_dataset(fresh_ratio=1.0)
+        seeds = [dataset.get_sample_seed(i) for i in range(4)]
+        dataset.set_epoch(1)
+        self.assertTrue(all(dataset.get_sample_seed(i) != s for i, s in enumerate(seeds)))
+
+    def test_partial_fresh_ratio(self):
+        """A model keeps its seed until refreshed, and the fraction refreshed per epoch is the ratio."""
+        dataset = GeoData3DStreamingDataset(model_bounds=BOUNDS, model_resolution=RESOLUTION, seed=3, fresh_ratio=0.25)
+        seeds = []
+        for epoch in range(9):
+            dataset.set_epoch(epoch)
+            seeds.append([dataset.get_sample_seed(i) for i in range(400)])
+        seeds = np.array(seeds, dtype=np.uint64)
+        refreshed = seeds[1:] != seeds[:-1]
+        np.testing.assert_allclose(refreshed.mean(axis=1), 0.25, atol=0.06)
+        # Seeds are never reused once a model is refreshed
+        self.assertTrue(all(len(set(column)) == refreshed[:, i].sum() + 1 for i, column in enumerate(seeds.T)))
+
+
+if __name__ == "__main__":
+    unittest.main()
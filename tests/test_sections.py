@@ -0,0 +1,99 @@
+import unittest
+
+import numpy as np
+
+import geogen.model as geo
+from geogen.dataset import GeoData2DSectionDataset, sample_section_plane, section_points
+from geogen.generation import MarkovGeostoryGenerator
+
+BOUNDS = ((-3840, 3840), (-3840, 3840), (-1920, 1920))
+
+
+class TestComputePoints(unittest.TestCase):
+
+    def _history(self):
+        return [
+            geo.Bedrock(base=-1920, value=0),
+            geo.Sedimentation([1, 2, 3, 4], [400, 300, 500, 200], base=-1000),
+            geo.Tilt(strike=30, dip=20, origin=(0, 0, 0)),
+            geo.Fault(strike=45, dip=70, rake=90, amplitude=300, origin=(500, 0, 0)),
+            geo.DikePlane(strike=100, dip=80, width=200, origin=(0, 0, 0), value=5),
+        ]
+
+    def test_points_match_volume(self):
+        """Points on the model grid get exactly the labels of the full volume."""
+        model = geo.GeoModel(bounds=BOUNDS, resolution=(16, 12, 10), label_dtype=np.int8)
+        model.add_history(self._history())
+        model.compute_model()
+        volume = model.get_data_grid().copy()
+
+        grid_points = np.column_stack([model.X[5].ravel(), model.Y[5].ravel(), model.Z[5].ravel()])
+        values = model.compute_points(grid_points)
+        np.testing.assert_array_equal(values.reshape(volume.shape[1:]), volume[5])
+        self.assertEqual(values.dtype, np.int8)
+        self.assertEqual(model.data.size, 0)
+
+    def test_sections_of_random_histories(self):
+        """
+        Sections match volume slices exactly with a full resolution context lattice, and within a
+        few percent of the pixels with the default one.
+        """
+        resolution = (24, 24, 24)
+        generator = MarkovGeostoryGenerator(model_bounds=BOUNDS, model_resolution=resolution, label_dtype=np.int8)
+        mismatch = []
+        for seed in range(8):
+            history = generator.build_geostory(np.random.default_rng(seed))
+            model = geo.GeoModel(bounds=BOUNDS, resolution=resolution, label_dtype=np.int8)
+            model.add_history(history)
+            model.compute_model()
+            volume_slice = model.get_data_grid()[12].copy()
+            grid_points = np.column_stack([model.X[12].ravel(), model.Y[12].ravel(), model.Z[12].ravel()])
+
+            exact = model.compute_points(grid_points, context_resolution=resolution)
+            np.testing.assert_array_equal(exact.reshape(volume_slice.shape), volume_slice)
+            approximate = model.compute_points(grid_points)
+            mismatch.append(np.mean(approximate.reshape(volume_slice.shape) != volume_slice))
+        self.assertLess(np.mean(mismatch), 0.05)
+        self.assertLess(np.max(mismatch), 0.15)
+
+    def test_section_points_layout(self):
+        """Section grids are (H, W) row-major with the top row first."""
+        points = section_points((0, 0, 0), (1, 0, 0), (0, 0, 1), (10, 4), (3, 5))
+        grid = points.reshape(3, 5, 3)
+        np.testing.assert_allclose(grid[0, :, 2], 2)
+        np.testing.assert_allclose(grid[-1, :, 2], -2)
+        np.testing.assert_allclose(grid[:, 0, 0], -5)
+
+    def test_fault_section_follows_strike(self):
+        """Fault sections are vertical planes along the fault strike through its origin."""
+        history = [geo.Bedrock(-1920, 0), geo.Fault(strike=90, dip=60, rake=0, amplitude=100, origin=(100, 200, 0))]
+        center, u, v, _ = sample_section_plane(BOUNDS, "fault", np.random.default_rng(0), history)
+        np.testing.assert_allclose(u, (1, 0, 0), atol=1e-9)
+        np.testing.assert_allclose(v, (0, 0, 1))
+        np.testing.assert_allclose(center[:2], (100, 200))
+
+
+class TestSectionDataset(unittest.TestCase):
+
+    def test_samples(self):
+        """Samples are reproducible (C, H, W) int8 label tensors of any orientation."""
+        dataset = GeoData2DSectionDataset(
+            model_bounds=BOUNDS,
+            section_resolution=(16, 24),
+            n_sections=3,
+            orientation=["axis", "vertical", "oblique", "fault"],
+            seed=3,
+        )
+        sample = dataset[0]
+        self.assertEqual(tuple(sample.shape), (3, 16, 24))
+        self.assertEqual(str(sample.dtype), "torch.int8")
+        self.assertTrue(sample.min() >= -1)
+        np.testing.assert_array_equal(sample.numpy(), dataset[0].numpy())
+
+    def test_unknown_orientation(self):
+        with self.assertRaises(ValueError):
+            GeoData2DSectionDataset(orientation="diagonal")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+import zipfile
+
+import numpy as np
+
+import geogen.model as geo
+from geogen.filemanagement import FileManager
+from geogen.generation import MarkovGeostoryGenerator
+from geogen.model.serialization import history_from_spec, history_to_spec
+from geogen.probability.wavegenerators import noisy_sine_wave
+
+RESOLUTION = (16, 16, 16)
+
+
+class TestSerialization(unittest.TestCase):
+
+    def setUp(self):
+        self.generator = MarkovGeostoryGenerator(model_resolution=RESOLUTION)
+
+    def test_round_trip(self):
+        """Generated histories, with shaping functions and Fourier partials, load back identically."""
+        for seed in range(20):
+            model = self.generator.generate_model(seed=seed)
+            buffer = io.BytesIO()
+            geo.save_model(model, buffer)
+            loaded = geo.load_model(io.BytesIO(buffer.getvalue()))
+            self.assertEqual(geo.history_fingerprint(loaded.history), geo.history_fingerprint(model.history))
+            np.testing.assert_array_equal(loaded.data, model.data)
+            np.testing.assert_array_equal(loaded.X, model.X)
+
+            recomputed = geo.load_model(io.BytesIO(buffer.getvalue()), data=False)
+            self.assertEqual(recomputed.data.size, 0)
+            recomputed.compute_model()
+            np.testing.assert_array_equal(recomputed.data, model.data)
+
+    def test_spec_is_json(self):
+        model = geo.GeoModel(bounds=(0, 10), resolution=4, label_dtype=np.int8)
+        model.add_history([geo.Bedrock(base=0, value=1), geo.Sedimentation([2, 3], [1, 1])])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "model.geoz")
+            geo.save_model(model, path)
+            spec = geo.load_model_spec(path)
+            with zipfile.ZipFile(path) as archive:
+                self.assertEqual(archive.namelist(), ["model.json"])  # Uncomputed, no data stored
+            loaded = geo.load_model(path)
+        self.assertEqual(spec["version"], 1)
+        self.assertEqual(json.loads(json.dumps(spec)), spec)
+        self.assertEqual(loaded.label_dtype, np.int8)
+        self.assertTrue(np.isnan(loaded.history[1].base))
+
+    def test_unsafe_content(self):
+        with self.assertRaises(geo.SerializationError):
+            history_to_spec([geo.Fold(periodic_func=noisy_sine_wave())])
+        with self.assertRaises(geo.SerializationError):
+            history_from_spec([{"$object": "os.system", "state": {}}])
+        with self.assertRaises(geo.SerializationError):
+            history_from_spec([{"$partial": "eval", "args": ["1"], "keywords": {"$dict": {}}}])
+
+
+class TestFileManagerFormat(unittest.TestCase):
+
+    def test_geoz_files(self):
+        model = MarkovGeostoryGenerator(model_resolution=RESOLUTION).generate_model(seed=1)
+        data = model.data.copy()  # A lean pickle save clears the model
+        with tempfile.TemporaryDirectory() as tmp:
+            manager = FileManager(base_dir=tmp, file_format="geoz")
+            manager.save_geo_model(model, tmp)
+            manager.save_geo_model(model, tmp, lean=False)
+            FileManager(base_dir=tmp).save_geo_model(model, tmp)
+            self.assertEqual(sorted(os.listdir(tmp)), ["model_0.geoz", "model_1.geoz", "model_2.pkl"])
+
+            lean = manager.load_geo_model(os.path.join(tmp, "model_0.geoz"))
+            full = manager.load_geo_model(os.path.join(tmp, "model_1.geoz"))
+            spec = manager.load_model_spec(os.path.join(tmp, "model_1.geoz"))
+            self.assertEqual(len(manager.load_all_models()), 3)
+        self.assertEqual(lean.data.size, 0)
+        self.assertEqual(spec["arrays"]["data"]["shape"], list(RESOLUTION))
+        np.testing.assert_array_equal(full.data, data)
+        with self.assertRaises(ValueError):
+            FileManager(file_format="json")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import json
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+from multiprocessing.connection import Client
+
+import numpy as np
+import torch
+
+from geogen.dataset import GeoDataServerDataset, SampleClient, SampleServer
+from geogen.dataset.server import key_path
+from geogen.generation.model_generators import MarkovMatrixParser
+
+RESOLUTION = (8, 8, 8)
+
+
+class TestSampleServer(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.address = os.path.join(self.tmp.name, "server.sock")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_batches(self):
+        with SampleServer(self.address, workers=2, capacity=4, seed=3, mp_context="fork") as server:
+            with SampleClient(self.address) as client:
+                labels, metadata = client.get_batch(5, RESOLUTION)
+                self.assertEqual(labels.shape, (5, *RESOLUTION))
+                self.assertEqual(labels.dtype, np.int8)
+                self.assertEqual(len({m["seed"] for m in metadata}), 5)
+
+                with self.assertRaises(RuntimeError):
+                    client.get_batch(1, RESOLUTION, generator_config="missing.yaml")
+                stats = client.stats()
+        self.assertEqual(stats["served"], 5)
+        self.assertEqual(stats["clients"], 1)
+        self.assertEqual(server.stats()["served"], 5)
+
+    def test_generated_authkey(self):
+        """A server without a key generates a private one, clients without it are refused."""
+        with SampleServer(self.address, workers=1, capacity=1, mp_context="fork") as server:
+            self.assertEqual(stat.S_IMODE(os.stat(key_path(self.address)).st_mode), 0o600)
+            with SampleClient(self.address) as client:
+                self.assertEqual(client.stats()["workers"], 1)
+            with self.assertRaises(Exception):
+                Client(self.address, authkey=b"wrong")
+            self.assertEqual(server.stats()["clients"], 1)
+        self.assertFalse(os.path.exists(key_path(self.address)))
+
+    def test_tcp_requires_authkey(self):
+        with self.assertRaises(ValueError):
+            SampleServer(("localhost", 0))
+        with self.assertRaises(ValueError):
+            SampleClient(("localhost", 0))
+
+    def test_pickled_requests_are_not_loaded(self):
+        """Requests are JSON, a pickled request is answered with an error and not unpickled."""
+        with SampleServer(self.address, workers=1, capacity=1, authkey="key", mp_context="fork"):
+            with Client(self.address, authkey=b"key") as conn:
+                conn.send(("stats",))
+                self.assertEqual(json.loads(conn.recv_bytes())["status"], "error")
+            with SampleClient(self.address, authkey="key") as client:
+                self.assertEqual(client.stats()["clients"], 2)
+
+    def test_recovers_from_failed_generation(self):
+        """A failed generation fails its request only, later requests of the configuration are served."""
+        config = os.path.join(self.tmp.name, "matrix.csv")
+        with SampleServer(self.address, workers=2, capacity=2, mp_context="fork"):
+            with SampleClient(self.address) as client:
+                with self.assertRaises(RuntimeError):
+                    client.get_batch(1, RESOLUTION, generator_config=config)
+                shutil.copy(MarkovMatrixParser(None).path, config)
+                labels, _ = client.get_batch(2, RESOLUTION, generator_config=config)
+        self.assertEqual(labels.shape, (2, *RESOLUTION))
+
+    def test_sharing(self):
+        """With reuse, the samples a client received are served to another client and never twice."""
+        with SampleServer(self.address, workers=2, capacity=4, reuse=2, mp_context="fork"):
+            with SampleClient(self.address) as first, SampleClient(self.address) as second:
+                first_seeds = [m["seed"] for m in first.get_batch(3, RESOLUTION)[1]]
+                second_seeds = [m["seed"] for m in second.get_batch(3, RESOLUTION)[1]]
+                self.assertEqual(second_seeds, first_seeds)
+                more_seeds = [m["seed"] for m in first.get_batch(3, RESOLUTION)[1]]
+                self.assertFalse(set(more_seeds) & set(first_seeds))
+                stats = first.stats()
+        self.assertEqual(stats["served"], 9)
+
+    def test_dataset(self):
+        with SampleServer(self.address, workers=2, capacity=4, mp_context="fork"):
+            dataset = GeoDataServerDataset(self.address, RESOLUTION, samples_per_epoch=5, request_size=2)
+            samples = list(dataset)
+        self.assertEqual(len(samples), 5)
+        self.assertEqual(samples[0].shape, (1, *RESOLUTION))
+        self.assertEqual(samples[0].dtype, torch.int8)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import unittest
+
+import numpy as np
+
+from geogen.dataset import GeoData3DStreamingDataset, GeometricAugmentation
+from geogen.generation import MarkovGeostoryGenerator
+from geogen.model.util import sample_crop_offsets
+
+BOUNDS = ((-3840, 3840), (-3840, 3840), (-1920, 1920))
+
+
+class TestGeometricAugmentation(unittest.TestCase):
+
+    def setUp(self):
+        self.volume = np.random.default_rng(0).integers(-1, 14, size=(6, 6, 4)).astype(np.int8)
+
+    def test_orientations_are_distinct_and_exact(self):
+        """The 8 xy orientations are distinct voxel permutations that keep every z column intact."""
+        aug = GeometricAugmentation()
+        params = aug.sample_params(8, self.volume.shape, np.random.default_rng(0))
+        samples = [aug.apply(self.volume, p) for p in params]
+        self.assertEqual(len({s.tobytes() for s in samples}), 8)
+
+        columns = {tuple(col) for col in self.volume.reshape(-1, 4)}
+        for sample in samples:
+            np.testing.assert_array_equal(np.sort(sample, axis=None), np.sort(self.volume, axis=None))
+            self.assertEqual({tuple(col) for col in sample.reshape(-1, 4)}, columns)
+
+    def test_flips_without_rotation(self):
+        """Without rotations, the x flip, the y flip and both flips are used."""
+        aug = GeometricAugmentation(rotate=False, flip=True)
+        params = aug.sample_params(4, self.volume.shape, np.random.default_rng(0))
+        samples = {aug.apply(self.volume, p).tobytes() for p in params}
+        flips = {self.volume[::-1].tobytes(), self.volume[:, ::-1].tobytes(), self.volume[::-1, ::-1].tobytes()}
+        self.assertEqual(samples, flips | {self.volume.tobytes()})
+
+    def test_non_square_only_half_turns(self):
+        """Quarter turns are skipped when they would change the xy shape."""
+        volume = np.zeros((6, 4, 3), dtype=np.int8)
+        aug = GeometricAugmentation()
+        params = aug.sample_params(16, volume.shape)
+        self.assertTrue(all(p["k"] % 2 == 0 for p in params))
+        self.assertTrue(all(aug.apply(volume, p).shape == (6, 4, 3) for p in params))
+
+    def test_crop(self):
+        """Crops are sub-volumes of the requested size within bounds."""
+        aug = GeometricAugmentation(rotate=False, flip=False, crop_size=(3, 3, 2))
+        for p in aug.sample_params(10, self.volume.shape):
+            x, y, z = p["offset"]
+            np.testing.assert_array_equal(aug.apply(self.volume, p), self.volume[x : x + 3, y : y + 3, z : z + 2])
+        with self.assertRaises(ValueError):
+            GeometricAugmentation(crop_size=(8, 3, 2)).sample_params(1, self.volume.shape)
+
+    def test_views_until_collation(self):
+        """Plain crops are views into the volume."""
+        aug = GeometricAugmentation(rotate=False, flip=False, crop_size=(3, 3, 2))
+        self.assertTrue(np.shares_memory(aug(self.volume), self.volume))
+
+
+class TestCropOffsets(unittest.TestCase):
+
+    def test_grid_layout_does_not_overlap(self):
+        offsets = sample_crop_offsets((8, 8, 4), (4, 4, 4), 4, layout="grid")
+        self.assertEqual(sorted(offsets), [(0, 0, 0), (0, 4, 0), (4, 0, 0), (4, 4, 0)])
+        with self.assertRaises(ValueError):
+            sample_crop_offsets((8, 8, 4), (4, 4, 4), 5, layout="grid")
+
+    def test_air_rejection(self):
+        """Crops with too much air are rejected in both layouts."""
+        empty = np.zeros((8, 8, 4), dtype=bool)
+        empty[:, 4:] = True  # Upper half in y is air
+        for layout in ("random", "grid"):
+            offsets = sample_crop_offsets(
+                (8, 8, 4), (4, 4, 4), 2, layout=layout, empty=empty, max_empty_fraction=0.0, max_attempts=100
+            )
+            self.assertTrue(all(y == 0 for _, y, _ in offsets))
+
+
+class TestModelCrops(unittest.TestCase):
+
+    def test_generate_crops(self):
+        """Crops of one seeded model are views with consistent labels across calls."""
+        gen = MarkovGeostoryGenerator(model_bounds=BOUNDS, model_resolution=(16, 16, 8))
+        crops, offsets = gen.generate_crops((8, 8, 8), 3, seed=4, max_air_fraction=0.9)
+        again, _ = gen.generate_crops((8, 8, 8), 3, seed=4, max_air_fraction=0.9)
+        self.assertEqual(len(crops), 3)
+        # Crops may be disjoint, but they are all views of the same model labels
+        self.assertIsNotNone(crops[0].base)
+        self.assertIs(crops[0].base, crops[1].base)
+        for crop, other in zip(crops, again):
+            self.assertEqual(crop.shape, (8, 8, 8))
+            np.testing.assert_array_equal(crop, other)
+
+
+class TestModelReuse(unittest.TestCase):
+
+    def test_reuse_factor(self):
+        """Consecutive samples share one computed model and are distinct augmentations of it."""
+        dataset = GeoData3DStreamingDataset(
+            model_bounds=BOUNDS,
+            model_resolution=(12, 12, 8),
+            dataset_size=8,
+            seed=0,
+            augmentation=GeometricAugmentation(crop_size=(8, 8, 8)),
+            reuse_factor=4,
+        )
+        calls = []
+        generate_model = dataset.model_generator.generate_model
+        dataset.model_generator.generate_model = lambda seed=None: calls.append(seed) or generate_model(seed=seed)
+
+        samples = [dataset[i] for i in range(8)]
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(samples[0].shape, (1, 8, 8, 8))
+        self.assertEqual(dataset.get_sample_seed(3), calls[0])
+        self.assertEqual(dataset.get_sample_seed(4), calls[1])
+
+
+if __name__ == "__main__":
+    unittest.main()